@@ -1,8 +1,8 @@
 from langchain.embeddings import HuggingFaceEmbeddings
 from langchain.vectorstores import Chroma
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.chat_models import ChatOpenAI
 from langchain.chains import RetrievalQA
+from app.services.llm_client import SharedChatModel
 from app.utils.text_processor import TextProcessor
 import os
 from dotenv import load_dotenv
@@ -28,10 +28,9 @@ class ResumeAnalyzer:
             chunk_size=1000,
             chunk_overlap=200
         )
-        self.llm = ChatOpenAI(
+        self.llm = SharedChatModel(
             temperature=0,
-            model_name="gpt-3.5-turbo",
-            openai_api_key=self.api_key
+            model_name="gpt-3.5-turbo"
         )
 
     def analyze(self, text: str) -> dict:
@@ -0,0 +1,252 @@
+import os
+import io
+import logging
+import zipfile
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+# Extraction backend per format: "auto", or e.g. "pdf=pypdf2,docx=python-docx"
+EXTRACTION_BACKENDS = os.getenv("EXTRACTION_BACKENDS", "auto")
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+Source = Union[bytes, str]
+
+class ExtractionResult:
+    """Text extracted from one document.
+
+    ``blocks`` holds one stripped entry per PDF page (empty for pages without
+    a text layer) or per non-empty DOCX paragraph/table row; ``text`` is the
+    non-empty blocks joined with newlines. ``page_count`` is None for formats
+    without pages.
+    """
+
+    def __init__(self, blocks: List[str], backend: str, extension: str, page_count: int = None):
+        self.blocks = blocks
+        self.backend = backend
+        self.extension = extension
+        self.page_count = page_count
+
+    @property
+    def text(self) -> str:
+        return "\n".join(block for block in self.blocks if block)
+
+class ExtractionBackend:
+    """One way to turn a document into text blocks. Subclasses set name and extensions."""
+
+    name = None
+    extensions = ()
+
+    def available(self) -> bool:
+        """Whether the libraries this backend needs are installed"""
+        return True
+
+    def extract(self, source: Source) -> ExtractionResult:
+        raise NotImplementedError
+
+    def _open(self, source: Source):
+        """Return a binary file object for in-memory bytes or a file path"""
+        if isinstance(source, bytes):
+            return io.BytesIO(source)
+        return open(source, 'rb')
+
+    def _result(self, blocks: List[str], extension: str, page_count: int = None) -> ExtractionResult:
+        blocks = [(block or "").strip() for block in blocks]
+        # Pages keep their position even when empty, other blocks are dropped
+        if page_count is None:
+            blocks = [block for block in blocks if block]
+        return ExtractionResult(blocks, self.name, extension, page_count)
+
+class PyPDF2Backend(ExtractionBackend):
+    name = "pypdf2"
+    extensions = ('.pdf',)
+
+    def extract(self, source: Source) -> ExtractionResult:
+        import PyPDF2
+
+        with self._open(source) as file:
+            reader = PyPDF2.PdfReader(file)
+            pages = [page.extract_text() or "" for page in reader.pages]
+        return self._result(pages, '.pdf', len(pages))
+
+class PyMuPDFBackend(ExtractionBackend):
+    """Native MuPDF text extraction, available when PyMuPDF is installed"""
+
+    name = "pymupdf"
+    extensions = ('.pdf',)
+
+    def available(self) -> bool:
+        try:
+            import fitz  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def extract(self, source: Source) -> ExtractionResult:
+        import fitz
+
+        if isinstance(source, bytes):
+            document = fitz.open(stream=source, filetype="pdf")
+        else:
+            document = fitz.open(source)
+        with document:
+            pages = [page.get_text() for page in document]
+        return self._result(pages, '.pdf', len(pages))
+
+class PythonDocxBackend(ExtractionBackend):
+    name = "python-docx"
+    extensions = ('.docx',)
+
+    def extract(self, source: Source) -> ExtractionResult:
+        import docx
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+
+        with self._open(source) as file:
+            document = docx.Document(file)
+
+        blocks = []
+        # Body order, so tables stay where they are in the document
+        for element in _body_elements(document.element.body):
+            if element.tag == WORD_NS + "p":
+                blocks.append(Paragraph(element, document).text)
+            else:
+                for row in Table(element, document).rows:
+                    cells = []
+                    seen = set()
+                    for cell in row.cells:
+                        # Merged cells are returned once per grid column
+                        if id(cell._tc) in seen:
+                            continue
+                        seen.add(id(cell._tc))
+                        cell_text = " ".join(p.text.strip() for p in cell.paragraphs if p.text.strip())
+                        if cell_text:
+                            cells.append(cell_text)
+                    blocks.append(" | ".join(cells))
+        return self._result(blocks, '.docx')
+
+class DocxXMLBackend(ExtractionBackend):
+    """Reads word/document.xml directly with the standard library; no object model is built"""
+
+    name = "docx-xml"
+    extensions = ('.docx',)
+
+    def extract(self, source: Source) -> ExtractionResult:
+        with self._open(source) as file, zipfile.ZipFile(file) as archive:
+            root = ET.fromstring(archive.read("word/document.xml"))
+
+        blocks = []
+        for element in _body_elements(root.find(WORD_NS + "body")):
+            if element.tag == WORD_NS + "p":
+                blocks.append(self._paragraph_text(element))
+            else:
+                for row in element.findall(WORD_NS + "tr"):
+                    cells = []
+                    for cell in row.findall(WORD_NS + "tc"):
+                        texts = [self._paragraph_text(p).strip() for p in cell.findall(WORD_NS + "p")]
+                        cell_text = " ".join(text for text in texts if text)
+                        if cell_text:
+                            cells.append(cell_text)
+                    blocks.append(" | ".join(cells))
+        return self._result(blocks, '.docx')
+
+    def _paragraph_text(self, paragraph) -> str:
+        # Only the paragraph's own runs and hyperlinks, as python-docx 1.x reads them: text boxes and
+        # drawings inside a run (and their mc:Fallback copies) are not descended into
+        parts = []
+        for child in paragraph:
+            if child.tag == WORD_NS + "r":
+                self._run_text(child, parts)
+            elif child.tag == WORD_NS + "hyperlink":
+                for run in child.findall(WORD_NS + "r"):
+                    self._run_text(run, parts)
+        return "".join(parts)
+
+    def _run_text(self, run, parts: List[str]):
+        for node in run:
+            if node.tag == WORD_NS + "t" and node.text:
+                parts.append(node.text)
+            elif node.tag == WORD_NS + "tab":
+                parts.append("\t")
+            elif node.tag in (WORD_NS + "br", WORD_NS + "cr"):
+                parts.append("\n")
+
+def _body_elements(body):
+    """Yield the paragraphs and tables of a document body in order, looking inside content controls"""
+    for element in body:
+        if element.tag in (WORD_NS + "p", WORD_NS + "tbl"):
+            yield element
+        elif element.tag == WORD_NS + "sdt":
+            content = element.find(WORD_NS + "sdtContent")
+            if content is not None:
+                yield from _body_elements(content)
+
+# Registered backends by name, in order of preference for auto-selection (fastest first)
+BACKENDS: Dict[str, ExtractionBackend] = {}
+
+def register_backend(backend: ExtractionBackend):
+    """Add a backend; backends registered earlier are preferred by auto-selection"""
+    BACKENDS[backend.name] = backend
+    get_engine.cache_clear()
+
+for _backend in (PyMuPDFBackend(), PyPDF2Backend(), DocxXMLBackend(), PythonDocxBackend()):
+    BACKENDS[_backend.name] = _backend
+
+class ExtractionEngine:
+    """Picks an extraction backend per file extension and runs it"""
+
+    def __init__(self, selection: str = EXTRACTION_BACKENDS):
+        self.selected = {}
+        if selection and selection.lower() != "auto":
+            for item in selection.split(","):
+                extension, _, name = item.partition("=")
+                extension = "." + extension.strip().lower().lstrip(".")
+                name = name.strip().lower()
+                if name not in BACKENDS:
+                    raise ValueError(f"Unknown extraction backend: {name}")
+                if extension not in BACKENDS[name].extensions:
+                    raise ValueError(f"Backend {name} cannot read {extension} files")
+                self.selected[extension] = BACKENDS[name]
+
+    def backends_for(self, extension: str) -> List[ExtractionBackend]:
+        """Available backends for an extension, most preferred first"""
+        return [backend for backend in BACKENDS.values()
+                if extension in backend.extensions and backend.available()]
+
+    def backend_for(self, extension: str) -> ExtractionBackend:
+        extension = extension.lower()
+        if extension in self.selected:
+            return self.selected[extension]
+        backends = self.backends_for(extension)
+        if not backends:
+            raise ValueError("Unsupported file format")
+        return backends[0]
+
+    def extract(self, source: Source, extension: str, backend: str = None) -> ExtractionResult:
+        """Extract text from document bytes or a file path"""
+        try:
+            chosen = BACKENDS[backend] if backend else self.backend_for(extension)
+            result = chosen.extract(source)
+            logger.debug(f"Extracted {len(result.text)} characters with {chosen.name}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error extracting {extension} text: {str(e)}")
+            raise
+
+@lru_cache(maxsize=None)
+def get_engine() -> ExtractionEngine:
+    """Shared engine configured from EXTRACTION_BACKENDS"""
+    return ExtractionEngine()
+
+def extract_document(source: Source, extension: str) -> ExtractionResult:
+    """Module-level entry point, picklable for the parsing process pool"""
+    return get_engine().extract(source, extension)
+
+def extract_file(file_path: str, backend: str = None) -> ExtractionResult:
+    """Extract text from a file on disk, choosing the backend by its extension"""
+    extension = os.path.splitext(file_path)[1].lower()
+    return get_engine().extract(file_path, extension, backend)
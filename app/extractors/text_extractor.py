@@ -1,74 +1,254 @@
 import os
+import asyncio
 import logging
+import hashlib
+import zipfile
+from typing import List, Union
 from fastapi import UploadFile
-import aiofiles
-import docx
-import PyPDF2
 import io
+from app.extractors.engine import extract_document
+from app.utils.executors import run_in_parsing_pool
+from app.utils.metrics import stage_timer
+from app.utils.scratch import get_scratch, ScratchQuotaExceeded
 
 logger = logging.getLogger(__name__)
 
+# Uploads larger than this are rejected
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+# Uploads stay in memory up to this size and spill to a temp file beyond it
+UPLOAD_SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_BYTES", str(4 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Maximum number of documents accepted in one batch request, including zip members
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "100"))
+# Maximum size of one batch request, and of the documents unpacked from its zip archives
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds UPLOAD_MAX_BYTES or a batch exceeds BATCH_MAX_BYTES"""
+
+class SpooledUpload:
+    """Uploaded document kept in memory, spilled to a scratch file past a threshold.
+
+    Uploads stay in memory when the scratch space quota is full.
+    """
+
+    def __init__(self, filename: str, spool_max_bytes: int = UPLOAD_SPOOL_MAX_BYTES):
+        self.filename = filename
+        self.size = 0
+        self.path = None
+        self._spool_max_bytes = spool_max_bytes
+        self._buffer = io.BytesIO()
+        self._file = None
+        self._hash = hashlib.sha256()
+
+    @classmethod
+    def from_bytes(cls, filename: str, content: bytes) -> "SpooledUpload":
+        """Wrap content that is already in memory"""
+        upload = cls(filename, spool_max_bytes=max(len(content), UPLOAD_SPOOL_MAX_BYTES))
+        upload.write(content)
+        return upload
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the content written so far"""
+        return self._hash.hexdigest()
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.filename or "")[1].lower()
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """Raw bytes while in memory, otherwise the path of the spill file"""
+        if self._file is not None:
+            self._file.flush()
+            return self.path
+        return self._buffer.getvalue()
+
+    def write(self, chunk: bytes):
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        if self._file is None and self.size > self._spool_max_bytes:
+            self._spill()
+        if self._file is not None:
+            try:
+                self._file.write(chunk)
+                return
+            except ScratchQuotaExceeded as e:
+                self._unspill(str(e))
+        self._buffer.write(chunk)
+
+    def read_bytes(self) -> bytes:
+        """Return the whole content"""
+        if self._file is not None:
+            self._file.flush()
+            with open(self.path, 'rb') as f:
+                return f.read()
+        return self._buffer.getvalue()
+
+    def close(self):
+        """Release the buffer and the spill file, if any"""
+        self._buffer = io.BytesIO()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _spill(self):
+        scratch_file = get_scratch().create_file(suffix=self.extension)
+        try:
+            scratch_file.write(self._buffer.getvalue())
+        except ScratchQuotaExceeded as e:
+            scratch_file.close()
+            # Keep buffering in memory; UPLOAD_MAX_BYTES still bounds the size
+            self._spool_max_bytes = UPLOAD_MAX_BYTES
+            logger.warning(f"Keeping upload {self.filename} in memory: {str(e)}")
+            return
+        self._file = scratch_file
+        self.path = scratch_file.path
+        self._buffer = io.BytesIO()
+        logger.info(f"Upload {self.filename} exceeded {self._spool_max_bytes} bytes, spilled to disk")
+
+    def _unspill(self, reason: str):
+        """Move a spilled upload back into memory when the scratch quota runs out mid-stream"""
+        self._buffer = io.BytesIO(self.read_bytes())
+        self._buffer.seek(0, io.SEEK_END)
+        self._file.close()
+        self._file = None
+        self.path = None
+        self._spool_max_bytes = UPLOAD_MAX_BYTES
+        logger.warning(f"Moved upload {self.filename} back into memory: {reason}")
+
 class TextExtractor:
+    def __init__(self):
+        self.max_upload_bytes = UPLOAD_MAX_BYTES
+
     async def extract_text(self, file: UploadFile) -> str:
         """Extract text from uploaded file"""
+        with await self.spool_upload(file) as upload:
+            return await self.extract_from_upload(upload)
+
+    async def spool_upload(self, file: UploadFile, max_bytes: int = None) -> SpooledUpload:
+        """Stream an upload into a spooled buffer, enforcing the size cap"""
+        max_bytes = max_bytes or self.max_upload_bytes
+        upload = SpooledUpload(file.filename)
         try:
-            # Save file temporarily
-            file_path = await self._save_temp_file(file)
-            
-            # Extract text based on file type
-            if file.filename.lower().endswith('.pdf'):
-                text = self._extract_from_pdf(file_path)
-            elif file.filename.lower().endswith('.docx'):
-                text = self._extract_from_docx(file_path)
-            else:
-                raise ValueError("Unsupported file format")
-            
-            # Cleanup
-            os.remove(file_path)
-            
-            return text
-            
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                if upload.size + len(chunk) > max_bytes:
+                    raise UploadTooLargeError(
+                        f"File exceeds the maximum upload size of {max_bytes} bytes"
+                    )
+                upload.write(chunk)
+            return upload
+
         except Exception as e:
-            logger.error(f"Error extracting text: {str(e)}")
+            upload.close()
+            logger.error(f"Error reading upload: {str(e)}")
             raise
 
-    async def _save_temp_file(self, file: UploadFile) -> str:
-        """Save uploaded file temporarily"""
+    async def spool_batch(self, files: List[UploadFile]) -> List[SpooledUpload]:
+        """Spool a batch of uploads, expanding zip archives into their PDF/DOCX members"""
+        uploads = []
+        # Bytes of the documents held for this batch
+        total_bytes = 0
         try:
-            os.makedirs("temp", exist_ok=True)
-            file_path = f"temp/{file.filename}"
-            
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+            for file in files:
+                # An archive may hold up to a whole batch worth of documents
+                is_zip = (file.filename or "").lower().endswith('.zip')
+                upload = await self.spool_upload(file, BATCH_MAX_BYTES - total_bytes if is_zip else None)
+                if upload.extension == '.zip':
+                    try:
+                        members = await asyncio.to_thread(
+                            self._expand_zip, upload, BATCH_MAX_FILES - len(uploads), BATCH_MAX_BYTES - total_bytes
+                        )
+                    finally:
+                        upload.close()
+                else:
+                    members = [upload]
+                uploads.extend(members)
+                total_bytes += sum(member.size for member in members)
+                
+                if len(uploads) > BATCH_MAX_FILES:
+                    raise ValueError(f"Batch exceeds the maximum of {BATCH_MAX_FILES} files")
+                if total_bytes > BATCH_MAX_BYTES:
+                    raise UploadTooLargeError(f"Batch exceeds the maximum size of {BATCH_MAX_BYTES} bytes")
+            return uploads
             
-            return file_path
-            
-        except Exception as e:
-            logger.error(f"Error saving file: {str(e)}")
+        except Exception:
+            for upload in uploads:
+                upload.close()
             raise
 
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
+    def _expand_zip(self, archive: SpooledUpload, max_files: int, max_bytes: int) -> List[SpooledUpload]:
+        """Read supported documents out of a zip archive, within the files and bytes left in the batch"""
+        members = []
+        total_bytes = 0
+        source = archive.source
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
-            
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {str(e)}")
+            with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source) as zf:
+                for info in zf.infolist():
+                    name = os.path.basename(info.filename)
+                    if info.is_dir() or name.startswith('.') or '__MACOSX' in info.filename:
+                        continue
+                    if not name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        continue
+                    # Check the limits before decompressing anything
+                    if len(members) >= max_files:
+                        raise ValueError(f"Batch exceeds the maximum of {BATCH_MAX_FILES} files")
+                    if info.file_size > self.max_upload_bytes:
+                        raise UploadTooLargeError(
+                            f"{name} exceeds the maximum upload size of {self.max_upload_bytes} bytes"
+                        )
+                    if total_bytes + info.file_size > max_bytes:
+                        raise UploadTooLargeError(f"Batch exceeds the maximum size of {BATCH_MAX_BYTES} bytes")
+                    
+                    # Stream the member so it spills to scratch like any other upload;
+                    # the declared size is not trusted while decompressing
+                    member = SpooledUpload(name)
+                    members.append(member)
+                    with zf.open(info) as f:
+                        while True:
+                            chunk = f.read(UPLOAD_CHUNK_BYTES)
+                            if not chunk:
+                                break
+                            if member.size + len(chunk) > self.max_upload_bytes:
+                                raise UploadTooLargeError(
+                                    f"{name} exceeds the maximum upload size of {self.max_upload_bytes} bytes"
+                                )
+                            if total_bytes + member.size + len(chunk) > max_bytes:
+                                raise UploadTooLargeError(
+                                    f"Batch exceeds the maximum size of {BATCH_MAX_BYTES} bytes"
+                                )
+                            member.write(chunk)
+                    total_bytes += member.size
+        except Exception:
+            for member in members:
+                member.close()
             raise
+        logger.info(f"Expanded {len(members)} documents from {archive.filename}")
+        return members
 
-    def _extract_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
+    async def extract_from_upload(self, upload: SpooledUpload) -> str:
+        """Extract text from a spooled upload"""
         try:
-            doc = docx.Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text.strip()
+            if upload.extension not in SUPPORTED_EXTENSIONS:
+                raise ValueError("Unsupported file format")
             
+            # The extraction engine picks the backend for the file type; parsing runs off the event loop
+            with stage_timer("extract"):
+                result = await run_in_parsing_pool(extract_document, upload.source, upload.extension)
+            logger.info(f"Extracted {upload.filename} with {result.backend}")
+            return result.text
+
         except Exception as e:
-            logger.error(f"Error extracting text from DOCX: {str(e)}")
-            raise 
\ No newline at end of file
+            logger.error(f"Error extracting text: {str(e)}")
+            raise
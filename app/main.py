@@ -1,19 +1,25 @@
 import os
 import logging
-import tensorflow as tf
+import asyncio
 import json
+import time
 
-# Suppress TensorFlow logging
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # 0=all, 1=info, 2=warning, 3=error
-tf.get_logger().setLevel('ERROR')  # Only show errors
+# Suppress TensorFlow logging if a dependency imports it later;
+# importing TensorFlow here just to silence it slows down startup
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')  # 0=all, 1=info, 2=warning, 3=error
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, Response
+from typing import List, Optional
 from app.services.resume_service import ResumeService
+from app.services.job_queue import JobManager, QueueFullError
+from app.extractors.text_extractor import UploadTooLargeError, UPLOAD_MAX_BYTES, BATCH_MAX_BYTES
 from app.utils.text_processor import TextProcessor
-from app.utils.cleanup import cleanup_temp_dbs
+from app.utils.executors import start_executors, shutdown_executors
+from app.utils.scratch import get_scratch
+from app.utils.metrics import track_request, record_request, set_request_labels, render_metrics
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -31,9 +37,61 @@ app.add_middleware(
 )
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Initialize service
+# Allowance for multipart boundaries and form fields on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject oversized uploads from Content-Length before the body is read"""
+    content_length = request.headers.get("content-length")
+    if request.method == "POST" and content_length and content_length.isdigit():
+        # Batches carry many files, single-file routes one
+        if request.url.path == "/parse-resumes/":
+            max_bytes, detail = BATCH_MAX_BYTES, f"Batch exceeds the maximum size of {BATCH_MAX_BYTES} bytes"
+        else:
+            max_bytes, detail = UPLOAD_MAX_BYTES, f"File exceeds the maximum upload size of {UPLOAD_MAX_BYTES} bytes"
+        if int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+            return JSONResponse(status_code=413, content={"detail": detail})
+    return await call_next(request)
+
+# Initialize service (heavy dependencies load lazily or during warm-up)
 resume_service = ResumeService()
 
+# Background job workers, created at startup
+job_manager = JobManager(resume_service)
+
+# Load models in the background at startup instead of on the first request
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+@app.on_event("startup")
+async def startup_event():
+    """Start the pools, job workers and scratch and result cache sweepers and schedule model warm-up"""
+    start_executors()
+    await job_manager.start()
+    app.state.scratch_sweeper = asyncio.create_task(get_scratch().run_sweeper())
+    app.state.result_cache_sweeper = asyncio.create_task(resume_service.result_cache.run_sweeper())
+    if WARMUP_ON_STARTUP:
+        app.state.warmup_task = asyncio.create_task(resume_service.warm_up())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the job workers, the sweepers, the pools and the LLM client connections"""
+    await job_manager.stop()
+    app.state.scratch_sweeper.cancel()
+    app.state.result_cache_sweeper.cancel()
+    shutdown_executors()
+    # The LLM client is only imported with the analyzer
+    if resume_service.analyzer_loaded:
+        from app.services.llm_client import close_llm_client
+        await close_llm_client()
+
+def _label_options(options: str):
+    """Selected options for metric labels, or None when the JSON is invalid"""
+    try:
+        return json.loads(options)
+    except ValueError:
+        return None
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root():
     """Serve the main HTML page"""
@@ -44,32 +102,218 @@ async def read_root():
         logger.error(f"Error serving index page: {str(e)}")
         raise HTTPException(status_code=500, detail="Error serving index page")
 
+@app.get("/health")
+async def health():
+    """Liveness probe: the process is up and serving"""
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: models are loaded and warmed up"""
+    if resume_service.ready:
+        return {"status": "ready"}
+    return JSONResponse(status_code=503, content={"status": "warming_up"})
+
+@app.post("/warmup")
+async def warmup():
+    """Load models now, e.g. when WARMUP_ON_STARTUP is disabled"""
+    if not resume_service.ready:
+        await resume_service.warm_up()
+    return {"status": "ready"}
+
 @app.post("/parse-resume/")
 async def parse_resume(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    options: str = Form(...),
+    document_id: Optional[str] = Form(None)
+):
+    """Parse and analyze a resume file; document_id marks it as a new version of an earlier upload"""
+    with track_request("parse-resume", file.filename, _label_options(options)):
+        try:
+            # Parse options
+            selected_options = json.loads(options)
+            
+            # Validate file extension
+            if not file.filename.lower().endswith(('.pdf', '.docx')):
+                raise HTTPException(status_code=400, detail="Unsupported file format")
+
+            # Process the resume with selected options
+            return await resume_service.process_resume(file, selected_options, document_id)
+
+        except HTTPException:
+            raise
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error processing resume: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/parse-resume/stream")
+async def parse_resume_stream(
+    file: UploadFile = File(...),
+    options: str = Form(...),
+    document_id: Optional[str] = Form(None)
+):
+    """Parse a resume, pushing each section as a Server-Sent Event as soon as it is done"""
+    start = time.perf_counter()
+    try:
+        try:
+            selected_options = json.loads(options)
+        
+            if not file.filename.lower().endswith(('.pdf', '.docx')):
+                raise HTTPException(status_code=400, detail="Unsupported file format")
+        
+            upload = await resume_service.text_extractor.spool_upload(file)
+        
+        except HTTPException:
+            raise
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error reading resume: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException as e:
+        # Requests that fail before streaming starts
+        record_request("parse-resume/stream", file.filename, _label_options(options),
+                       "rejected" if e.status_code < 500 else "error", time.perf_counter() - start)
+        raise
+    
+    async def events():
+        # The response streams in its own task, label its metrics there
+        set_request_labels(file.filename, selected_options)
+        outcome = "error"
+        try:
+            async for section, value in resume_service.stream_upload(upload, selected_options, document_id):
+                yield f"event: section\ndata: {json.dumps({'section': section, 'data': value})}\n\n"
+            yield "event: done\ndata: {}\n\n"
+            outcome = "ok"
+        except Exception as e:
+            logger.error(f"Error streaming resume: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            upload.close()
+            record_request("parse-resume/stream", file.filename, selected_options, outcome,
+                           time.perf_counter() - start)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/parse-resumes/")
+async def parse_resumes(
+    files: List[UploadFile] = File(...),
     options: str = Form(...)
 ):
-    """Parse and analyze a resume file"""
+    """Parse many resumes (PDF/DOCX files or zip archives), streaming NDJSON results as they finish"""
+    start = time.perf_counter()
     try:
-        # Parse options
-        selected_options = json.loads(options)
+        try:
+            selected_options = json.loads(options)
         
-        # Validate file extension
-        if not file.filename.lower().endswith(('.pdf', '.docx')):
-            raise HTTPException(status_code=400, detail="Unsupported file format")
+            for file in files:
+                if not file.filename.lower().endswith(('.pdf', '.docx', '.zip')):
+                    raise HTTPException(status_code=400, detail=f"Unsupported file format: {file.filename}")
+        
+            uploads = await resume_service.text_extractor.spool_batch(files)
+        
+        except HTTPException:
+            raise
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error reading batch: {str(e)}")
+            raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException as e:
+        record_request("parse-resumes", "batch", _label_options(options),
+                       "rejected" if e.status_code < 500 else "error", time.perf_counter() - start)
+        raise
+    
+    async def stream_results():
+        async for result in resume_service.process_batch(uploads, selected_options):
+            # One outcome per document, timed from the start of the batch
+            record_request("parse-resumes", result["filename"], selected_options,
+                           "ok" if result["status"] == "ok" else "error", time.perf_counter() - start)
+            yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
 
-        # Process the resume with selected options
-        result = await resume_service.process_resume(file, selected_options)
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    file: UploadFile = File(...),
+    options: str = Form(...)
+):
+    """Queue a resume for background processing and return its job id right away"""
+    with track_request("jobs", file.filename, _label_options(options)):
+        try:
+            selected_options = json.loads(options)
+        
+            if not file.filename.lower().endswith(('.pdf', '.docx')):
+                raise HTTPException(status_code=400, detail="Unsupported file format")
         
-        # Schedule cleanup in background
-        background_tasks.add_task(cleanup_temp_dbs)
+            upload = await resume_service.text_extractor.spool_upload(file)
+            try:
+                content = upload.read_bytes()
+            finally:
+                upload.close()
         
-        return result
+            return await job_manager.submit(file.filename, content, selected_options)
+        
+        except HTTPException:
+            raise
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except QueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error submitting job: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
 
-    except Exception as e:
-        logger.error(f"Error processing resume: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/jobs")
+async def job_stats():
+    """Queue depth and worker configuration"""
+    return await job_manager.stats()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status, plus the result once it has succeeded"""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Counters for the result cache, shared in-flight requests, revisions, near duplicates, embedding batches and scratch space"""
+    stats = {
+        "results": resume_service.result_cache.stats(),
+        "in_flight": resume_service.single_flight.stats(),
+        "revisions": resume_service.revision_store.stats(),
+        "scratch": get_scratch().stats(),
+    }
+    if resume_service.near_duplicate_mode != "off":
+        stats["near_duplicates"] = resume_service.near_duplicates.stats()
+    # Do not load the analyzer or the model just to report stats
+    if resume_service.analyzer_loaded and resume_service.resume_analyzer.embeddings_loaded:
+        # Already imported by the loaded analyzer
+        from app.services.embedding_cache import CachedEmbeddings
+        from app.services.embedding_batcher import EmbeddingBatcher
+        
+        embeddings = resume_service.resume_analyzer.embeddings
+        if isinstance(embeddings, CachedEmbeddings):
+            stats["embeddings"] = embeddings.stats()
+            # The batcher sits behind the cache
+            embeddings = embeddings.embeddings
+        if isinstance(embeddings, EmbeddingBatcher):
+            stats["embedding_batches"] = embeddings.stats()
+    return stats
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: stage and LLM latency histograms, token, cost and request counters"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 @app.get("/test-parser")
 async def test_parser():
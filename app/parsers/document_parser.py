@@ -1,17 +1,56 @@
-from docx import Document
-from PyPDF2 import PdfReader
 import pytesseract
 from pdf2image import convert_from_path
+import io
 import logging
 import os
-import tempfile
+import subprocess
+from app.extractors.engine import extract_file
+from app.utils.executors import get_ocr_executor
 
 logger = logging.getLogger(__name__)
 
+# Tesseract binary; leave unset to use the one on PATH
+TESSERACT_CMD = os.getenv("TESSERACT_CMD")
+# Pages whose text layer has fewer characters than this are OCRed
+OCR_MIN_PAGE_CHARS = int(os.getenv("OCR_MIN_PAGE_CHARS", "100"))
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+
+def _configure_tesseract():
+    if TESSERACT_CMD:
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+def _tesseract(image) -> str:
+    """OCR an image by piping it to tesseract's stdin as uncompressed PPM.
+
+    pytesseract.image_to_string saves every image to a temporary file for
+    tesseract to read back; this keeps the page in memory end to end.
+    """
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, format="PPM")
+    completed = subprocess.run(
+        [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout"],
+        input=buffer.getvalue(), capture_output=True
+    )
+    if completed.returncode != 0:
+        raise pytesseract.TesseractError(completed.returncode, completed.stderr.decode("utf-8", "replace"))
+    return completed.stdout.decode("utf-8")
+
+def _ocr_page(file_path: str, page_number: int, dpi: int = OCR_DPI) -> str:
+    """Rasterize a single PDF page and OCR it; runs in an OCR worker process"""
+    _configure_tesseract()
+    # Only this page is rendered, so memory per worker is bounded by one image
+    images = convert_from_path(file_path, dpi=dpi, first_page=page_number, last_page=page_number)
+    try:
+        # pdf2image reads the rendered page from pdftoppm's stdout and it goes to tesseract's stdin
+        return "\n".join(_tesseract(image) for image in images)
+    finally:
+        for image in images:
+            image.close()
+
 class DocumentParser:
     def __init__(self):
-        # Configure tesseract path
-        pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+        _configure_tesseract()
+        self.ocr_min_page_chars = OCR_MIN_PAGE_CHARS
 
     def parse_document(self, file_path: str) -> str:
         """Parse document based on file extension"""
@@ -28,27 +67,29 @@ class DocumentParser:
             raise
 
     def _parse_pdf_with_ocr(self, file_path: str) -> str:
-        """Extract text from PDF using both PDF text extraction and OCR"""
+        """Extract text from PDF, OCRing only pages without a usable text layer"""
         try:
-            text_parts = []
+            # First try normal PDF text extraction, one entry per page
+            text_parts = extract_file(file_path).blocks
             
-            # First try normal PDF text extraction
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                text_parts.append(page.extract_text())
-            
-            # Then use OCR for image content
-            images = convert_from_path(file_path)
-            
-            with tempfile.TemporaryDirectory() as temp_dir:
-                for i, image in enumerate(images):
-                    # Save image temporarily
-                    image_path = os.path.join(temp_dir, f'page_{i}.png')
-                    image.save(image_path, 'PNG')
-                    
-                    # Extract text using OCR
-                    ocr_text = pytesseract.image_to_string(image_path)
-                    text_parts.append(ocr_text)
+            # Then use OCR for pages that are mostly images
+            sparse_pages = [
+                index for index, text in enumerate(text_parts)
+                if len(text.strip()) < self.ocr_min_page_chars
+            ]
+            if sparse_pages:
+                logger.info(f"OCR for {len(sparse_pages)} of {len(text_parts)} pages")
+                executor = get_ocr_executor()
+                # pdf2image page numbers start at 1
+                futures = {
+                    index: executor.submit(_ocr_page, file_path, index + 1)
+                    for index in sparse_pages
+                }
+                for index, future in futures.items():
+                    ocr_text = future.result()
+                    # Keep whichever version of the page has more text
+                    if len(ocr_text.strip()) > len(text_parts[index].strip()):
+                        text_parts[index] = ocr_text
             
             # Combine all text
             full_text = '\n'.join(text_parts)
@@ -64,26 +105,8 @@ class DocumentParser:
     def _parse_docx(self, file_path: str) -> str:
         """Extract text from DOCX"""
         try:
-            doc = Document(file_path)
-            text = []
-            
-            # Extract from paragraphs
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    text.append(para.text.strip())
-            
-            # Extract from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text.strip())
-                    if row_text:
-                        text.append(' | '.join(row_text))
-            
-            return '\n'.join(text)
+            return extract_file(file_path).text
             
         except Exception as e:
             logger.error(f"Error parsing DOCX: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
\ No newline at end of file
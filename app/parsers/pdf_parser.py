@@ -1,5 +1,5 @@
-from PyPDF2 import PdfReader
 import logging
+from app.extractors.engine import extract_file
 
 logger = logging.getLogger(__name__)
 
@@ -7,14 +7,7 @@ class PDFParser:
     def extract_text(self, file_path: str) -> str:
         """Extract text from PDF file"""
         try:
-            reader = PdfReader(file_path)
-            text = []
-            
-            # Process all pages at once
-            for page in reader.pages:
-                text.append(page.extract_text())
-            
-            return "\n".join(text)
+            return extract_file(file_path).text
             
         except Exception as e:
             logger.error(f"Error parsing PDF: {str(e)}")
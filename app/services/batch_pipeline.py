@@ -0,0 +1,172 @@
+import os
+import asyncio
+import logging
+from typing import AsyncIterator, List
+
+from app.extractors.text_extractor import SpooledUpload
+from app.utils.executors import run_in_embedding_pool
+from app.utils.metrics import set_request_labels, stage_timer
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of chunks embedded together in one model call
+BATCH_EMBED_MAX_CHUNKS = int(os.getenv("BATCH_EMBED_MAX_CHUNKS", "128"))
+# Documents analyzed by the LLM at the same time within one batch
+BATCH_ANALYSIS_CONCURRENCY = int(os.getenv("BATCH_ANALYSIS_CONCURRENCY", "4"))
+
+class BatchPipeline:
+    """Process many resumes as a pipeline: extraction, embedding and LLM stages overlap.
+
+    Each document is extracted as soon as a parsing worker is free. Documents
+    waiting for embedding are embedded together in one batch, and the LLM
+    stage starts for each document as soon as its vectors are ready. Results
+    are yielded in completion order.
+    """
+
+    def __init__(self, service, analyzer, options: list):
+        self.service = service
+        self.analyzer = analyzer
+        self.options = options
+        self.needs_embeddings = bool(set(options) - {'contact_info'})
+
+        self._embed_queue = asyncio.Queue()
+        self._results = asyncio.Queue()
+        self._analysis_limit = asyncio.Semaphore(BATCH_ANALYSIS_CONCURRENCY)
+        self._tasks = []
+
+    async def run(self, uploads: List[SpooledUpload]) -> AsyncIterator[dict]:
+        """Yield one result per upload as soon as it is finished"""
+        if not uploads:
+            return
+
+        embedder = asyncio.create_task(self._embed_stage()) if self.needs_embeddings else None
+        extractors = [asyncio.create_task(self._extract_stage(upload)) for upload in uploads]
+        self._tasks.extend(extractors)
+
+        try:
+            for _ in uploads:
+                yield await self._results.get()
+        finally:
+            # Also reached when the client disconnects mid-stream
+            for task in self._tasks:
+                task.cancel()
+            if embedder is not None:
+                embedder.cancel()
+            for upload in uploads:
+                upload.close()
+
+    async def _extract_stage(self, upload: SpooledUpload):
+        # Each stage runs in its own task, so the labels only apply to this document
+        set_request_labels(upload.filename, self.options)
+        try:
+            cache_key = self.service.result_cache.make_key_from_digest(
+                upload.digest, self.options, self.analyzer.cache_settings()
+            )
+            cached = await self.service.result_cache.aget(cache_key)
+            if cached is not None:
+                self._emit(upload, result=cached, cached=True)
+                return
+
+            text = await self.service.text_extractor.extract_from_upload(upload)
+            upload.close()
+
+            # Near duplicates of earlier intake are flagged, and in "reuse" mode skip non-personal sections
+            signature, duplicate = await self.service._find_near_duplicate(upload.digest, text)
+            document = {
+                "signature": signature,
+                "duplicate": duplicate,
+                "reused": await self.service._near_duplicate_sections(duplicate, self.options),
+            }
+            options = [option for option in self.options if option not in document["reused"]]
+
+            # Segmentation, token counting and splitting are CPU work, keep them off the event loop
+            token_count, chunks = await asyncio.to_thread(self._plan_embedding, text, options)
+            document["token_count"] = token_count
+            if chunks is not None:
+                await self._embed_queue.put((upload, cache_key, text, chunks, document))
+            else:
+                self._start_analysis(upload, cache_key, text, None, None, document)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error extracting {upload.filename}: {str(e)}")
+            self._emit(upload, error=str(e))
+
+    def _plan_embedding(self, text: str, options: list) -> tuple:
+        """Token count of a document and the chunks to embed, or None when it skips the embedding stage"""
+        cleaned_text = self.analyzer.text_processor.clean_text(text)
+        token_count = self.analyzer.count_tokens(cleaned_text)
+        # Documents the segmenter fully covers, or small enough to send whole, skip the embedding stage
+        if (self.needs_embeddings and self.analyzer.llm_sections_needed(text, options)
+                and not self.analyzer.fits_context(cleaned_text, token_count)):
+            return token_count, self.analyzer.split_text(text)
+        return token_count, None
+
+    async def _embed_stage(self):
+        """Embed chunks of every document waiting in the queue with one model call"""
+        while True:
+            batch = [await self._embed_queue.get()]
+            total_chunks = len(batch[0][3])
+            while not self._embed_queue.empty() and total_chunks < BATCH_EMBED_MAX_CHUNKS:
+                item = self._embed_queue.get_nowait()
+                batch.append(item)
+                total_chunks += len(item[3])
+
+            all_chunks = [chunk for _, _, _, chunks, _ in batch for chunk in chunks]
+            try:
+                # Resolve the model inside the pool, it may still need to be loaded
+                with stage_timer("embed"):
+                    vectors = await run_in_embedding_pool(
+                        lambda: self.analyzer.embeddings.embed_documents(all_chunks)
+                    )
+                logger.info(f"Embedded {len(all_chunks)} chunks from {len(batch)} documents in one batch")
+            except Exception as e:
+                logger.error(f"Error embedding batch: {str(e)}")
+                for upload, _, _, _, _ in batch:
+                    self._emit(upload, error=str(e))
+                continue
+
+            offset = 0
+            for upload, cache_key, text, chunks, document in batch:
+                doc_vectors = vectors[offset:offset + len(chunks)]
+                offset += len(chunks)
+                self._start_analysis(upload, cache_key, text, chunks, doc_vectors, document)
+
+    def _start_analysis(self, upload, cache_key, text, chunks, chunk_vectors, document):
+        self._tasks.append(asyncio.create_task(
+            self._analysis_stage(upload, cache_key, text, chunks, chunk_vectors, document)
+        ))
+
+    async def _analysis_stage(self, upload, cache_key, text, chunks, chunk_vectors, document):
+        set_request_labels(upload.filename, self.options)
+        try:
+            analysis = dict(document["reused"])
+            options = [option for option in self.options if option not in analysis]
+            if options:
+                async with self._analysis_limit:
+                    analysis.update(await self.analyzer.aanalyze(
+                        text, options, chunks=chunks, chunk_vectors=chunk_vectors,
+                        token_count=document["token_count"]
+                    ))
+            analysis = self.analyzer.order_sections(analysis)
+            if self.service._is_cacheable(analysis):
+                await self.service.result_cache.aset(cache_key, analysis)
+                if document["signature"] is not None:
+                    await self.service._index_near_duplicate(upload.digest, document["signature"])
+            if document["duplicate"] is not None:
+                # Flag only the response, the cached result is the document's own
+                analysis = {**analysis, "near_duplicate": document["duplicate"]}
+            self._emit(upload, result=analysis)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error analyzing {upload.filename}: {str(e)}")
+            self._emit(upload, error=str(e))
+
+    def _emit(self, upload: SpooledUpload, result: dict = None, error: str = None, cached: bool = False):
+        if error is not None:
+            self._results.put_nowait({"filename": upload.filename, "status": "error", "error": error})
+        else:
+            self._results.put_nowait({"filename": upload.filename, "status": "ok", "cached": cached, "result": result})
@@ -0,0 +1,121 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import List
+
+from langchain.schema.embeddings import Embeddings
+
+from app.utils.metrics import EMBEDDING_BATCH_TEXTS
+
+logger = logging.getLogger(__name__)
+
+# A batch runs once this many texts are waiting or the oldest request has waited this long
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64"))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "10"))
+
+class EmbeddingBatcher(Embeddings):
+    """Embeddings wrapper that merges concurrent embed_documents calls into one model call.
+
+    Callers block while a single worker thread collects pending requests and
+    embeds them together once max_batch_size texts are waiting or the oldest
+    request has waited max_wait_ms; each caller then gets its own vectors.
+    Queries are short and sequential within a request, so they go straight
+    to the model.
+    """
+
+    def __init__(self, embeddings: Embeddings, max_batch_size: int = None, max_wait_ms: float = None):
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size or EMBEDDING_BATCH_MAX_SIZE
+        self.max_wait = (EMBEDDING_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+
+        self._pending = deque()
+        self._pending_texts = 0
+        self._condition = threading.Condition()
+        self._worker = None
+
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts as part of the next batch"""
+        texts = list(texts)
+        if not texts:
+            return []
+        return self._submit(texts).result()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    def stats(self) -> dict:
+        """Return request and batch counters"""
+        with self._condition:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "texts": self.texts,
+                "mean_batch_texts": round(self.texts / self.batches, 2) if self.batches else 0.0,
+                "pending_texts": self._pending_texts,
+            }
+
+    def _submit(self, texts: List[str]) -> Future:
+        future = Future()
+        with self._condition:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+            self._pending.append((texts, future, time.monotonic()))
+            self._pending_texts += len(texts)
+            self.requests += 1
+            self._condition.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                # Wait for more requests until the batch is full or the oldest one is due
+                deadline = self._pending[0][2] + self.max_wait
+                while self._pending_texts < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._take_batch()
+            self._embed(batch)
+
+    def _take_batch(self) -> list:
+        # Caller holds the lock; a request larger than the batch size runs on its own
+        batch = [self._pending.popleft()]
+        size = len(batch[0][0])
+        while self._pending and size + len(self._pending[0][0]) <= self.max_batch_size:
+            request = self._pending.popleft()
+            batch.append(request)
+            size += len(request[0])
+        self._pending_texts -= size
+        return batch
+
+    def _embed(self, batch: list):
+        texts = [text for request_texts, _, _ in batch for text in request_texts]
+        try:
+            vectors = self.embeddings.embed_documents(texts)
+        except Exception as e:
+            logger.error(f"Error embedding batch of {len(texts)} texts: {str(e)}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        with self._condition:
+            self.batches += 1
+            self.texts += len(texts)
+        EMBEDDING_BATCH_TEXTS.observe(len(texts))
+        logger.debug(f"Embedded {len(texts)} texts from {len(batch)} requests in one batch")
+
+        offset = 0
+        for request_texts, future, _ in batch:
+            future.set_result(vectors[offset:offset + len(request_texts)])
+            offset += len(request_texts)
@@ -0,0 +1,164 @@
+import os
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+import numpy as np
+from langchain.schema.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends uncached texts to the model.
+
+    Vectors are keyed by a hash of the model name and the text. A memory-bounded
+    LRU sits in front of a SQLite store that keeps vectors as float16 blobs.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str,
+                 max_memory_mb: int = None, db_path: str = None):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.max_memory_bytes = (max_memory_mb or int(os.getenv("EMBEDDING_CACHE_MAX_MB", "64"))) * 1024 * 1024
+        self.db_path = db_path or os.getenv("EMBEDDING_CACHE_PATH", "cache/embeddings.sqlite3")
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db = self._open_db()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, computing only the ones not found in the cache"""
+        keys = [self._key(text) for text in texts]
+        found = self._lookup(set(keys))
+
+        # Deduplicate identical chunks within the batch before calling the model
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = {
+                key: np.asarray(vector, dtype=np.float32)
+                for key, vector in zip(missing.keys(), vectors)
+            }
+            self._store(computed)
+            found.update(computed)
+
+        with self._lock:
+            self.misses += len(missing)
+        return [found[key].tolist() for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reusing a cached vector when available"""
+        key = self._key(text)
+        found = self._lookup({key})
+        if key not in found:
+            vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+            self._store({key: vector})
+            found[key] = vector
+            with self._lock:
+                self.misses += 1
+        return found[key].tolist()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters"""
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: set) -> Dict[str, np.ndarray]:
+        """Find vectors in memory first, then on disk"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            self.memory_hits += len(found)
+
+        remaining = [key for key in keys if key not in found]
+        if remaining and self._db is not None:
+            from_disk = self._read_disk(remaining)
+            with self._lock:
+                for key, vector in from_disk.items():
+                    self._remember(key, vector)
+                self.disk_hits += len(from_disk)
+            found.update(from_disk)
+        return found
+
+    def _store(self, vectors: Dict[str, np.ndarray]):
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+        if self._db is not None:
+            self._write_disk(vectors)
+
+    def _remember(self, key: str, vector: np.ndarray):
+        # Caller holds the lock
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = vector
+        self._memory_bytes += vector.nbytes
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _open_db(self):
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            db.commit()
+            return db
+        except Exception as e:
+            logger.error(f"Error opening embedding cache, using memory only: {str(e)}")
+            return None
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        try:
+            with self._lock:
+                # Stay well below SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    batch = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+        except Exception as e:
+            logger.error(f"Error reading embedding cache: {str(e)}")
+        return found
+
+    def _write_disk(self, vectors: Dict[str, np.ndarray]):
+        try:
+            rows = [(key, vector.astype(np.float16).tobytes()) for key, vector in vectors.items()]
+            with self._lock:
+                self._db.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+                self._db.commit()
+        except Exception as e:
+            logger.error(f"Error writing embedding cache: {str(e)}")
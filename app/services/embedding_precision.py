@@ -0,0 +1,107 @@
+import os
+import logging
+from typing import List
+
+import numpy as np
+from langchain.schema.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# "fp32" (default) or "int8" dynamic quantization of the embedding model's linear layers
+EMBEDDING_PRECISION = os.getenv("EMBEDDING_PRECISION", "fp32").lower()
+# Reduced precision is only kept when its retrieval rankings agree this well with fp32
+EMBEDDING_MIN_RANKING_AGREEMENT = float(os.getenv("EMBEDDING_MIN_RANKING_AGREEMENT", "0.9"))
+
+PRECISIONS = ("fp32", "int8")
+
+# Resume-like chunks and the retrieval queries run against them, for the accuracy check
+SAMPLE_CHUNKS = [
+    "Jane Doe | jane.doe@example.com | +91 98765 43210 | Bengaluru, Karnataka",
+    "Senior Software Engineer, Example Corp, Jan 2020 - Present. Led a team of five engineers "
+    "through a migration to Kubernetes and reduced API latency by 40%.",
+    "Backend Developer, Acme Systems, 2017 - 2019. Built data pipelines that feed reporting "
+    "for the finance team using Python, Kafka and PostgreSQL.",
+    "B.Tech in Computer Science, Example University, 2016, CGPA 8.7",
+    "M.S. Data Science, State University, 2018. Thesis on graph neural networks.",
+    "Technical Skills: Python, FastAPI, SQL, Docker, Kubernetes, AWS, Terraform",
+    "Soft Skills: communication, mentoring, stakeholder management. Languages: English, Hindi",
+    "Certifications: AWS Certified Solutions Architect, Certified Kubernetes Administrator",
+    "Software engineer with eight years of experience building backend services and "
+    "distributed systems for high-traffic products.",
+    "Projects: open-source contributor to a Python web framework; built a resume parser "
+    "with LangChain and sentence transformers.",
+    "Awards: Employee of the Year 2021 for delivering the payments platform rewrite.",
+    "Interests: long-distance running, chess, teaching programming to students.",
+]
+SAMPLE_QUERIES = [
+    "What is the person's full name?",
+    "What is the person's current location?",
+    "Extract all education information including degree, institution and graduation year",
+    "Extract all work experiences with company, position and dates",
+    "Group the skills into technical skills, soft skills, languages and certifications",
+    "Write a professional summary covering years of experience and key expertise",
+]
+
+def quantize_embeddings(embeddings, precision: str = EMBEDDING_PRECISION):
+    """Return embeddings whose sentence-transformers model runs at the given precision.
+
+    int8 applies PyTorch dynamic quantization to the linear layers, which
+    hold most of MiniLM's weights and compute; activations stay fp32.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown embedding precision: {precision}")
+    if precision == "fp32":
+        return embeddings
+
+    import torch
+
+    # quantize_dynamic copies the model, so the fp32 one stays usable for comparison
+    model = torch.quantization.quantize_dynamic(embeddings.client, {torch.nn.Linear}, dtype=torch.qint8)
+    return embeddings.copy(update={"client": model})
+
+def ranking_agreement(reference: Embeddings, candidate: Embeddings, queries: List[str] = None,
+                      documents: List[str] = None, k: int = 3) -> float:
+    """Mean overlap of the top-k documents each model retrieves per query, from 0 to 1"""
+    queries = queries or SAMPLE_QUERIES
+    documents = documents or SAMPLE_CHUNKS
+    k = min(k, len(documents))
+
+    def top_k(embeddings: Embeddings) -> List[set]:
+        matrix = _normalize(np.asarray(embeddings.embed_documents(documents), dtype=np.float32))
+        rankings = []
+        for query in queries:
+            scores = matrix @ _normalize(np.asarray([embeddings.embed_query(query)], dtype=np.float32))[0]
+            rankings.append(set(np.argsort(-scores)[:k].tolist()))
+        return rankings
+
+    overlaps = [len(expected & found) / k for expected, found in zip(top_k(reference), top_k(candidate))]
+    return float(np.mean(overlaps))
+
+def load_precision(embeddings, precision: str = EMBEDDING_PRECISION,
+                   min_agreement: float = EMBEDDING_MIN_RANKING_AGREEMENT):
+    """Apply the configured precision, keeping fp32 when rankings drift too far from it.
+
+    Returns (embeddings, precision actually used).
+    """
+    if precision == "fp32":
+        return embeddings, "fp32"
+
+    try:
+        candidate = quantize_embeddings(embeddings, precision)
+        agreement = ranking_agreement(embeddings, candidate)
+    except Exception as e:
+        logger.error(f"Error preparing {precision} embeddings, using fp32: {str(e)}")
+        return embeddings, "fp32"
+
+    if agreement < min_agreement:
+        logger.error(f"{precision} embedding rankings agree {agreement:.1%} with fp32 "
+                     f"(minimum {min_agreement:.1%}), using fp32")
+        return embeddings, "fp32"
+
+    logger.info(f"Using {precision} embeddings, ranking agreement with fp32: {agreement:.1%}")
+    return candidate, precision
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -0,0 +1,402 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.extractors.text_extractor import SpooledUpload
+from app.utils.metrics import record_request, reset_request_labels, set_request_labels
+
+logger = logging.getLogger(__name__)
+
+# Fields returned to API clients (the uploaded bytes are never returned)
+PUBLIC_FIELDS = ("id", "filename", "options", "status", "attempts", "result", "error", "created_at", "updated_at")
+# How often the workers delete finished jobs past their retention
+PURGE_INTERVAL_SECONDS = 60
+# Pause after a storage error (e.g. a locked database) before a worker tries again
+WORKER_ERROR_BACKOFF_SECONDS = 1
+# Attempts at recording a job's outcome before leaving it for recover()
+UPDATE_ATTEMPTS = 3
+
+class QueueFullError(Exception):
+    """Raised when the job queue has reached JOB_QUEUE_MAX_DEPTH"""
+
+class JobBackend:
+    """Storage for queued jobs. Subclasses must be safe to call from several worker tasks."""
+
+    def enqueue(self, job: dict, content: bytes, max_depth: int = None):
+        """Add a job; raises QueueFullError if max_depth jobs are already queued or running"""
+        raise NotImplementedError
+
+    def claim(self) -> Optional[dict]:
+        """Atomically take the oldest runnable queued job and mark it running"""
+        raise NotImplementedError
+
+    def content(self, job_id: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def update(self, job_id: str, **fields):
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def depth(self) -> int:
+        """Number of jobs that are queued or running"""
+        raise NotImplementedError
+
+    def recover(self):
+        """Requeue jobs left running by a previous process"""
+
+    def purge(self, finished_before: float) -> int:
+        """Delete succeeded and failed jobs last updated before the given time; returns the count"""
+        raise NotImplementedError
+
+class InMemoryJobBackend(JobBackend):
+    """Process-local backend; jobs are lost on restart"""
+
+    def __init__(self):
+        self._jobs = OrderedDict()
+        self._contents = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, job: dict, content: bytes, max_depth: int = None):
+        with self._lock:
+            if max_depth is not None and self._depth() >= max_depth:
+                raise QueueFullError(f"Job queue is full ({max_depth} jobs)")
+            self._jobs[job["id"]] = dict(job)
+            self._contents[job["id"]] = content
+
+    def claim(self) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            for job in self._jobs.values():
+                if job["status"] == "queued" and job["available_at"] <= now:
+                    job["status"] = "running"
+                    job["attempts"] += 1
+                    job["updated_at"] = now
+                    return dict(job)
+        return None
+
+    def content(self, job_id: str) -> Optional[bytes]:
+        with self._lock:
+            return self._contents.get(job_id)
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields, updated_at=time.time())
+            # Finished jobs no longer need their upload
+            if job["status"] in ("succeeded", "failed"):
+                self._contents.pop(job_id, None)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._depth()
+
+    def _depth(self) -> int:
+        return sum(1 for job in self._jobs.values() if job["status"] in ("queued", "running"))
+
+    def purge(self, finished_before: float) -> int:
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["status"] in ("succeeded", "failed") and job["updated_at"] < finished_before
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+                self._contents.pop(job_id, None)
+        return len(expired)
+
+class SQLiteJobBackend(JobBackend):
+    """SQLite-backed queue that survives restarts without any external service"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or os.getenv("JOB_DB_PATH", "data/jobs.sqlite3")
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    options TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    content BLOB,
+                    available_at REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)")
+
+    def enqueue(self, job: dict, content: bytes, max_depth: int = None):
+        with self._lock:
+            # The depth check and the insert share a write transaction, also across processes
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                if max_depth is not None:
+                    depth = self._db.execute(
+                        "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+                    ).fetchone()[0]
+                    if depth >= max_depth:
+                        raise QueueFullError(f"Job queue is full ({max_depth} jobs)")
+                self._db.execute(
+                    "INSERT INTO jobs (id, filename, options, status, attempts, content, available_at, created_at, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job["id"], job["filename"], json.dumps(job["options"]), job["status"], job["attempts"],
+                     content, job["available_at"], job["created_at"], job["updated_at"])
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def claim(self) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' AND available_at <= ?"
+                    " ORDER BY created_at LIMIT 1", (now,)
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+                self._db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (now, row["id"])
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def content(self, job_id: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._db.execute("SELECT content FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row["content"] if row else None
+
+    def update(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        if fields.get("status") in ("succeeded", "failed"):
+            # Finished jobs no longer need their upload
+            fields["content"] = None
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, filename, options, status, attempts, result, error, available_at, created_at, updated_at"
+                " FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["options"] = json.loads(job["options"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def depth(self) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()
+        return row[0]
+
+    def recover(self):
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = 'queued', updated_at = ? WHERE status = 'running'", (time.time(),)
+            )
+        if cursor.rowcount:
+            logger.info(f"Requeued {cursor.rowcount} jobs interrupted by a restart")
+
+    def purge(self, finished_before: float) -> int:
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND updated_at < ?", (finished_before,)
+            )
+        return cursor.rowcount
+
+def create_job_backend(name: str = None) -> JobBackend:
+    """Build the backend selected by JOB_BACKEND ("sqlite" or "memory")"""
+    name = (name or os.getenv("JOB_BACKEND", "sqlite")).lower()
+    if name == "memory":
+        return InMemoryJobBackend()
+    if name == "sqlite":
+        return SQLiteJobBackend()
+    raise ValueError(f"Unknown job backend: {name}")
+
+class JobManager:
+    """Runs submitted resumes through ResumeService on a pool of background worker tasks"""
+
+    def __init__(self, service, backend: JobBackend = None, workers: int = None,
+                 max_depth: int = None, max_retries: int = None, retry_delay: float = None):
+        self.service = service
+        # Created on start() so importing the app does not open the database
+        self.backend = backend
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.max_depth = max_depth or int(os.getenv("JOB_QUEUE_MAX_DEPTH", "100"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("JOB_MAX_RETRIES", "2"))
+        self.retry_delay = retry_delay if retry_delay is not None else float(os.getenv("JOB_RETRY_DELAY_SECONDS", "5"))
+        # How often idle workers look for jobs that became runnable after a retry delay
+        self.poll_interval = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+        # Finished jobs and their results are deleted after this long (0 keeps them)
+        self.retention_seconds = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+        self._next_purge = 0.0
+        self._wakeup = None
+        self._tasks = []
+
+    async def start(self):
+        """Start the worker tasks"""
+        self._wakeup = asyncio.Event()
+        # Backend calls touch the database, keep them off the event loop
+        if self.backend is None:
+            self.backend = await asyncio.to_thread(create_job_backend)
+        await asyncio.to_thread(self.backend.recover)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Started {self.workers} job workers")
+
+    async def stop(self):
+        """Cancel the worker tasks; running jobs are requeued on the next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, filename: str, content: bytes, options: list) -> dict:
+        """Queue a resume for processing and return the new job; raises QueueFullError at max_depth"""
+        now = time.time()
+        job = {
+            "id": str(uuid.uuid4()),
+            "filename": filename,
+            "options": options,
+            "status": "queued",
+            "attempts": 0,
+            "result": None,
+            "error": None,
+            "available_at": now,
+            "created_at": now,
+            "updated_at": now,
+        }
+        await asyncio.to_thread(self.backend.enqueue, job, content, self.max_depth)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return self._public(job)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = await asyncio.to_thread(self.backend.get, job_id)
+        return self._public(job) if job else None
+
+    async def stats(self) -> dict:
+        return {
+            "depth": await asyncio.to_thread(self.backend.depth),
+            "max_depth": self.max_depth,
+            "workers": self.workers,
+            "backend": type(self.backend).__name__,
+            "retention_seconds": self.retention_seconds,
+        }
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                await self._purge_finished()
+                job = await asyncio.to_thread(self.backend.claim)
+                if job is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._run(job)
+            except Exception as e:
+                # A storage error must not end the worker, or queued jobs would never run
+                logger.error(f"Error in job worker {index}: {str(e)}")
+                await asyncio.sleep(WORKER_ERROR_BACKOFF_SECONDS)
+
+    async def _purge_finished(self):
+        """Delete expired finished jobs, at most once per PURGE_INTERVAL_SECONDS across all workers"""
+        now = time.time()
+        if self.retention_seconds <= 0 or now < self._next_purge:
+            return
+        self._next_purge = now + PURGE_INTERVAL_SECONDS
+        try:
+            purged = await asyncio.to_thread(self.backend.purge, now - self.retention_seconds)
+        except Exception as e:
+            logger.error(f"Error purging finished jobs: {str(e)}")
+            return
+        if purged:
+            logger.info(f"Purged {purged} finished jobs older than {self.retention_seconds:.0f}s")
+
+    async def _run(self, job: dict):
+        logger.info(f"Running job {job['id']} ({job['filename']}), attempt {job['attempts']}")
+        content = await asyncio.to_thread(self.backend.content, job["id"])
+        upload = SpooledUpload.from_bytes(job["filename"], content or b"")
+        labels = set_request_labels(job["filename"], job["options"])
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await self.service.process_upload(upload, job["options"])
+            fields = {"status": "succeeded", "result": result, "error": None}
+            outcome = "ok"
+
+        except asyncio.CancelledError:
+            # Shutting down: leave the job for recover() on the next start
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Job {job['id']} failed: {str(e)}")
+            if job["attempts"] <= self.max_retries:
+                # Exponential backoff between attempts
+                delay = self.retry_delay * (2 ** (job["attempts"] - 1))
+                fields = {"status": "queued", "error": str(e), "available_at": time.time() + delay}
+            else:
+                fields = {"status": "failed", "error": str(e)}
+        finally:
+            upload.close()
+            record_request("jobs/worker", job["filename"], job["options"], outcome, time.perf_counter() - start)
+            reset_request_labels(labels)
+        await self._update(job["id"], **fields)
+
+    async def _update(self, job_id: str, **fields):
+        """Record a job's outcome, retrying transient storage errors such as a locked database"""
+        for attempt in range(1, UPDATE_ATTEMPTS + 1):
+            try:
+                await asyncio.to_thread(self.backend.update, job_id, **fields)
+                return
+            except Exception as e:
+                if attempt == UPDATE_ATTEMPTS:
+                    # The job stays running until recover() requeues it on the next start
+                    raise
+                logger.error(f"Error updating job {job_id} (attempt {attempt}): {str(e)}")
+                await asyncio.sleep(WORKER_ERROR_BACKOFF_SECONDS * attempt)
+
+    def _public(self, job: dict) -> dict:
+        return {field: job.get(field) for field in PUBLIC_FIELDS}
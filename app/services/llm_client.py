@@ -0,0 +1,334 @@
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+import email.utils
+import weakref
+from typing import Any, List, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from langchain.adapters.openai import convert_dict_to_message, convert_message_to_dict
+from langchain.chat_models.base import BaseChatModel
+from langchain.schema import ChatGeneration, ChatResult
+from langchain.schema.messages import BaseMessage
+
+from app.utils.metrics import LLM_RETRIES, LLM_THROTTLE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# OpenAI-compatible API root; point it at a mock server to test rate limiting locally
+LLM_API_BASE = os.getenv("LLM_API_BASE", "https://api.openai.com/v1")
+# Client-side limits shared by every request in the process (0 disables a limit)
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "3500"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "90000"))
+# Capacity that may be used at once, in seconds of the per-minute rate
+LLM_BURST_SECONDS = float(os.getenv("LLM_BURST_SECONDS", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+# Also the longest Retry-After honored; longer waits fail the call instead
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+# Pooled HTTP connections to the API, for each of the sync and async sessions
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "16"))
+
+# Completion tokens reserved per call when max_tokens is not set, corrected from the usage afterwards
+EXPECTED_COMPLETION_TOKENS = 500
+CHARS_PER_TOKEN = 4
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+class LLMError(Exception):
+    """LLM API call that failed, after retries when the failure was retryable"""
+
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        # Not named status_code: a failed upstream call is not a client error of the request
+        self.status = status
+
+class TokenBucket:
+    """Capacity of burst_seconds worth of a per-minute rate, refilled continuously.
+
+    The level may go below zero: each reservation queues behind the ones
+    already made, and the caller waits until the level is back to zero.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = LLM_BURST_SECONDS):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self, amount: float, now: float) -> float:
+        """Remove amount and return the seconds until the bucket covers it"""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def give(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets shared by all threads and event loops"""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float,
+                 burst_seconds: float = LLM_BURST_SECONDS):
+        self._lock = threading.Lock()
+        self.requests = TokenBucket(requests_per_minute, burst_seconds) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute, burst_seconds) if tokens_per_minute > 0 else None
+        self._paused_until = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and an estimated number of tokens; return how long to wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._paused_until - now
+            if self.requests is not None:
+                wait = max(wait, self.requests.take(1, now))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.take(tokens, now))
+            return max(0.0, wait)
+
+    def settle(self, reserved: int, used: int):
+        """Correct a token reservation once the real usage is known; used=0 refunds it"""
+        if self.tokens is not None:
+            with self._lock:
+                self.tokens.give(reserved - used)
+
+    def pause(self, seconds: float):
+        """Hold back every caller, e.g. after the API answered 429 with Retry-After"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+class LLMClient:
+    """Process-wide client for the chat completions API.
+
+    Every call goes through one rate limiter and reuses pooled connections:
+    a requests session for synchronous calls and one aiohttp session per
+    event loop for async calls. Failed calls are retried with jittered
+    exponential backoff, or after the delay the server asks for in
+    Retry-After; a 429 pauses all callers, not just the one that got it.
+    """
+
+    def __init__(self, api_key: str = None, api_base: str = LLM_API_BASE,
+                 requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+                 burst_seconds: float = LLM_BURST_SECONDS, max_retries: int = LLM_MAX_RETRIES, backoff_base: float = LLM_BACKOFF_BASE_SECONDS,
+                 backoff_max: float = LLM_BACKOFF_MAX_SECONDS, timeout: float = LLM_TIMEOUT_SECONDS,
+                 pool_size: int = LLM_POOL_SIZE):
+        self.url = api_base.rstrip("/") + "/chat/completions"
+        self.headers = {
+            "Authorization": f"Bearer {api_key or os.getenv('OPENAI_API_KEY', '')}",
+            "Content-Type": "application/json",
+        }
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute, burst_seconds)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.pool_size = pool_size
+
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_maxsize=pool_size))
+        self._session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+        # aiohttp sessions are bound to the loop they were created on
+        self._async_sessions = weakref.WeakKeyDictionary()
+
+    def complete(self, payload: dict) -> dict:
+        """Send a chat completion request and return the response JSON"""
+        tokens = self._estimate_tokens(payload)
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve(payload, tokens)
+            if wait:
+                time.sleep(wait)
+            try:
+                response = self._session.post(self.url, json=payload, headers=self.headers, timeout=self.timeout)
+                status, headers, body = response.status_code, response.headers, response.text
+            except requests.RequestException as e:
+                status, headers, body = None, {}, str(e)
+
+            data, delay = self._handle_response(attempt, payload, tokens, status, headers, body)
+            if data is not None:
+                return data
+            time.sleep(delay)
+
+    async def acomplete(self, payload: dict) -> dict:
+        """Async variant of complete()"""
+        tokens = self._estimate_tokens(payload)
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve(payload, tokens)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                async with self._async_session().post(self.url, json=payload, headers=self.headers) as response:
+                    status, headers, body = response.status, response.headers, await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status, headers, body = None, {}, str(e) or type(e).__name__
+
+            data, delay = self._handle_response(attempt, payload, tokens, status, headers, body)
+            if data is not None:
+                return data
+            await asyncio.sleep(delay)
+
+    def _async_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._async_sessions[loop] = session
+        return session
+
+    async def aclose(self):
+        """Close the pooled connections; async sessions of other loops are dropped with their loop"""
+        self._session.close()
+        try:
+            session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        except RuntimeError:
+            session = None
+        if session is not None:
+            await session.close()
+
+    def _estimate_tokens(self, payload: dict) -> int:
+        prompt_chars = sum(len(message.get("content") or "") for message in payload["messages"])
+        return prompt_chars // CHARS_PER_TOKEN + (payload.get("max_tokens") or EXPECTED_COMPLETION_TOKENS)
+
+    def _reserve(self, payload: dict, tokens: int) -> float:
+        """Take capacity from the rate limiter and return how long to wait for it"""
+        wait = self.limiter.reserve(tokens)
+        if wait:
+            LLM_THROTTLE_SECONDS.labels(payload["model"]).inc(wait)
+            logger.debug(f"Rate limiter delays LLM call by {wait:.2f}s")
+        return wait
+
+    def _handle_response(self, attempt: int, payload: dict, tokens: int, status: Optional[int],
+                         headers, body: str):
+        """Return (response JSON, None) on success or (None, delay before the next attempt); raise when giving up"""
+        if status == 200:
+            data = json.loads(body)
+            self.limiter.settle(tokens, (data.get("usage") or {}).get("total_tokens", tokens))
+            return data, None
+
+        # Failed calls are charged as requests, not tokens
+        self.limiter.settle(tokens, 0)
+        error = LLMError(f"LLM API returned {status}: {body[:200]}" if status else f"LLM API unreachable: {body}", status)
+        retry_after = _retry_after(headers)
+        if attempt >= self.max_retries or (status is not None and status not in RETRY_STATUSES):
+            raise error
+        if retry_after is not None and retry_after > self.backoff_max:
+            raise LLMError(f"{error} (asked to retry after {retry_after:.0f}s)", status)
+
+        if retry_after is not None:
+            # Honor the server, with a little spread so waiting callers do not return together
+            delay = retry_after + random.uniform(0, self.backoff_base)
+        else:
+            # Full jitter
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if status == 429:
+            self.limiter.pause(delay)
+
+        LLM_RETRIES.labels(payload["model"], str(status) if status else "connection").inc()
+        logger.warning(f"{error}; retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+        return None, delay
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds to wait from a retry-after-ms or Retry-After header (seconds or an HTTP date)"""
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_llm_client() -> LLMClient:
+    """Return the shared client, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
+
+async def close_llm_client():
+    """Close the shared client's connections, at shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+class SharedChatModel(BaseChatModel):
+    """LangChain chat model that sends every call through the shared LLMClient"""
+
+    model_name: str = "gpt-3.5-turbo"
+    temperature: float = 0.0
+    max_tokens: Optional[int] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "shared-openai-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "temperature": self.temperature, "max_tokens": self.max_tokens}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        return self._chat_result(get_llm_client().complete(self._payload(messages, stop)))
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        return self._chat_result(await get_llm_client().acomplete(self._payload(messages, stop)))
+
+    def _payload(self, messages: List[BaseMessage], stop: Optional[List[str]]) -> dict:
+        payload = {
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "messages": [convert_message_to_dict(message) for message in messages],
+        }
+        if stop:
+            payload["stop"] = stop
+        if self.max_tokens:
+            payload["max_tokens"] = self.max_tokens
+        return payload
+
+    def _chat_result(self, data: dict) -> ChatResult:
+        generations = [
+            ChatGeneration(
+                message=convert_dict_to_message(choice["message"]),
+                generation_info={"finish_reason": choice.get("finish_reason")},
+            )
+            for choice in data["choices"]
+        ]
+        return ChatResult(
+            generations=generations,
+            llm_output={"token_usage": data.get("usage") or {}, "model_name": self.model_name},
+        )
+
+    def _combine_llm_outputs(self, llm_outputs: List[Optional[dict]]) -> dict:
+        # Summed so the metrics callback sees the usage of every generation
+        token_usage = {}
+        for output in llm_outputs:
+            for key, value in ((output or {}).get("token_usage") or {}).items():
+                token_usage[key] = token_usage.get(key, 0) + value
+        return {"token_usage": token_usage, "model_name": self.model_name}
@@ -0,0 +1,173 @@
+import os
+import re
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Documents whose estimated Jaccard similarity reaches this are near duplicates
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.9"))
+# Consecutive words per shingle
+SHINGLE_WORDS = 5
+# Texts with fewer words (image-only scans, empty files) get no signature: they
+# would all share a handful of shingles and match each other
+NEAR_DUP_MIN_WORDS = int(os.getenv("NEAR_DUP_MIN_WORDS", "50"))
+# 16 bands of 8 rows: pairs at 0.9 similarity share a bucket with probability > 0.999,
+# at 0.75 about 0.8, at 0.5 about 0.06. Changing these invalidates a persisted index.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Fixed seed: signatures stored on disk must stay comparable across restarts
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, _MAX_HASH, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, _MAX_HASH, size=NUM_PERM, dtype=np.uint64)
+
+def shingles(cleaned_text: str) -> set:
+    """Word n-grams of the lowercased text; short texts are a single shingle"""
+    words = _WORD_PATTERN.findall(cleaned_text.lower())
+    if len(words) <= SHINGLE_WORDS:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+def minhash(cleaned_text: str, min_words: int = None) -> Optional[np.ndarray]:
+    """MinHash signature of the text's shingles, NUM_PERM 32-bit values; None for texts under min_words words"""
+    min_words = NEAR_DUP_MIN_WORDS if min_words is None else min_words
+    if len(_WORD_PATTERN.findall(cleaned_text)) < max(min_words, 1):
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(cleaned_text)), dtype=np.uint64
+    )
+    # a * x + b stays below 2**64 because a, b and x are 32-bit
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+def band_buckets(signature: np.ndarray) -> list:
+    """One signed 64-bit bucket id per band, so the buckets fit an SQLite INTEGER column"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+class NearDuplicateIndex:
+    """Persistent MinHash/LSH index of analyzed resumes, keyed by upload content hash.
+
+    Each document is stored once with its signature and once per band under
+    that band's bucket. A lookup reads the documents sharing any bucket
+    through the bucket primary key, so it touches a handful of rows however
+    large the index grows, and ranks them by estimated Jaccard similarity.
+    Documents are added one at a time as they are analyzed.
+    """
+
+    def __init__(self, db_path: str = None, threshold: float = None):
+        self.db_path = db_path or os.getenv("NEAR_DUP_DB_PATH", "data/near_duplicates.sqlite3")
+        self.threshold = NEAR_DUP_THRESHOLD if threshold is None else threshold
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY,
+                    digest TEXT NOT NULL UNIQUE,
+                    signature BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    bucket INTEGER NOT NULL,
+                    document INTEGER NOT NULL,
+                    PRIMARY KEY (bucket, document)
+                ) WITHOUT ROWID
+            """)
+            self.documents = self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+        self.lookups = 0
+        self.matches = 0
+        self.lookup_seconds = 0.0
+
+    def find(self, signature: np.ndarray, exclude_digest: str = None) -> Optional[dict]:
+        """Most similar indexed document at or above the threshold, as {"digest", "similarity"}"""
+        start = time.perf_counter()
+        buckets = band_buckets(signature)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT d.digest, d.signature FROM buckets b JOIN documents d ON d.id = b.document"
+                f" WHERE b.bucket IN ({', '.join('?' * len(buckets))})", buckets
+            ).fetchall()
+
+        best = None
+        for digest, blob in rows:
+            if digest == exclude_digest:
+                continue
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == signature))
+            if similarity >= self.threshold and (best is None or similarity > best["similarity"]):
+                best = {"digest": digest, "similarity": round(similarity, 4)}
+
+        with self._lock:
+            self.lookups += 1
+            if best is not None:
+                self.matches += 1
+            self.lookup_seconds += time.perf_counter() - start
+        return best
+
+    def add(self, digest: str, signature: np.ndarray):
+        """Index a document; adding the same content again is a no-op"""
+        self.add_many([(digest, signature)])
+
+    def add_many(self, documents: list):
+        """Index (digest, signature) pairs in one transaction"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                for digest, signature in documents:
+                    cursor = self._db.execute(
+                        "INSERT OR IGNORE INTO documents (digest, signature, created_at) VALUES (?, ?, ?)",
+                        (digest, signature.astype(np.uint32).tobytes(), now)
+                    )
+                    if not cursor.rowcount:
+                        continue
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO buckets (bucket, document) VALUES (?, ?)",
+                        [(bucket, cursor.lastrowid) for bucket in band_buckets(signature)]
+                    )
+                    added += 1
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self.documents += added
+
+    def stats(self) -> dict:
+        """Return index size and lookup counters"""
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "threshold": self.threshold,
+                "lookups": self.lookups,
+                "matches": self.matches,
+                "mean_lookup_ms": round(self.lookup_seconds / self.lookups * 1000, 3) if self.lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """Content-addressed cache of analysis results.
+
+    A bounded in-memory LRU sits in front of a JSON-file tier on disk. Both
+    tiers expire entries after a TTL, so old results are eventually recomputed.
+    A periodic sweep deletes expired files and keeps the disk tier under
+    max_disk_entries.
+    """
+
+    def __init__(self, max_entries: int = None, ttl_seconds: int = None, cache_dir: str = None,
+                 max_disk_entries: int = None):
+        self.enabled = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv("RESULT_CACHE_TTL_SECONDS", "86400"))
+        self.cache_dir = cache_dir or os.getenv("RESULT_CACHE_DIR", "cache/results")
+        self.max_disk_entries = (max_disk_entries if max_disk_entries is not None
+                                 else int(os.getenv("RESULT_CACHE_MAX_DISK_ENTRIES", "10000")))
+        self.sweep_interval_seconds = int(os.getenv("RESULT_CACHE_SWEEP_INTERVAL_SECONDS", "600"))
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.swept = 0
+
+    @staticmethod
+    def make_key(content: bytes, options: list, settings: dict) -> str:
+        """Hash the file bytes together with the normalized options and model settings"""
+        digest = hashlib.sha256(content).hexdigest()
+        return ResultCache.make_key_from_digest(digest, options, settings)
+
+    @staticmethod
+    def make_key_from_digest(digest: str, options: list, settings: dict) -> str:
+        """Build a cache key when the content hash is already known"""
+        normalized = {
+            "content": digest,
+            "options": sorted(set(options)),
+            "settings": settings,
+        }
+        payload = json.dumps(normalized, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a cached result, or None on a miss"""
+        if not self.enabled:
+            return None
+        result = self._get_memory(key)
+        return result if result is not None else self._get_disk(key)
+
+    async def aget(self, key: str) -> Optional[dict]:
+        """get() for the event loop: memory hits return inline, the disk tier is read in a thread"""
+        if not self.enabled:
+            return None
+        result = self._get_memory(key)
+        return result if result is not None else await asyncio.to_thread(self._get_disk, key)
+
+    def set(self, key: str, result: dict):
+        """Store a result in both tiers"""
+        if not self.enabled:
+            return
+        self._write_disk(key, self._set_memory(key, result))
+
+    async def aset(self, key: str, result: dict):
+        """set() for the event loop: the disk tier is written in a thread"""
+        if not self.enabled:
+            return
+        await asyncio.to_thread(self._write_disk, key, self._set_memory(key, result))
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._memory.clear()
+        if os.path.isdir(self.cache_dir):
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith(".json"):
+                        os.remove(os.path.join(root, name))
+
+    def sweep_disk(self) -> int:
+        """Delete expired entry files, then the oldest ones beyond max_disk_entries; returns the count"""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        
+        now = time.time()
+        entries = []
+        removed = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    modified = os.path.getmtime(path)
+                except FileNotFoundError:
+                    continue
+                # Entries are written once, so they expire ttl_seconds after their mtime;
+                # temporary files left by an interrupted write go after the same time
+                if name.endswith(".json") and modified + self.ttl_seconds > now:
+                    entries.append((modified, path))
+                elif modified + self.ttl_seconds <= now:
+                    removed += self._remove_file(path)
+        
+        if len(entries) > self.max_disk_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_disk_entries]:
+                removed += self._remove_file(path)
+        
+        with self._lock:
+            self.swept += removed
+        if removed:
+            logger.info(f"Result cache sweep removed {removed} files")
+        return removed
+
+    async def run_sweeper(self):
+        """Sweep the disk tier periodically until cancelled"""
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep_disk)
+            except Exception as e:
+                logger.error(f"Error sweeping result cache: {str(e)}")
+            await asyncio.sleep(self.sweep_interval_seconds)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "disk_swept": self.swept,
+            }
+
+    def _get_memory(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at > time.time():
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return result
+            del self._memory[key]
+            return None
+
+    def _get_disk(self, key: str) -> Optional[dict]:
+        entry = self._read_disk(key)
+        if entry is not None and entry["expires_at"] > time.time():
+            with self._lock:
+                self._store_memory(key, entry["expires_at"], entry["result"])
+                self.disk_hits += 1
+            return entry["result"]
+        if entry is not None:
+            self._delete_disk(key)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _set_memory(self, key: str, result: dict) -> dict:
+        """Store a result in memory and return its disk entry"""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store_memory(key, expires_at, result)
+        return {"expires_at": expires_at, "result": result}
+
+    def _store_memory(self, key: str, expires_at: float, result: dict):
+        # Caller holds the lock
+        self._memory[key] = (expires_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading cached result: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, entry: dict):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Error writing cached result: {str(e)}")
+
+    def _remove_file(self, path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logger.error(f"Error removing cached result: {str(e)}")
+            return 0
+
+    def _delete_disk(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
@@ -1,16 +1,25 @@
-from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import Chroma
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.chat_models import ChatOpenAI
 from langchain.chains import RetrievalQA
+from app.services.vector_store import InMemoryVectorStore, WholeDocumentRetriever
+from app.services.embedding_cache import CachedEmbeddings
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_precision import EMBEDDING_PRECISION, load_precision
+from app.services.llm_client import SharedChatModel
 from app.utils.text_processor import TextProcessor
+from app.utils.section_segmenter import SectionSegmenter
+from app.utils.executors import run_in_embedding_pool
+from app.utils.metrics import stage_timer
+from app.utils.llm_metrics import LLMMetricsHandler
 import os
 from dotenv import load_dotenv
-import openai
+import asyncio
 import logging
+import json
 import re
+import hashlib
 import uuid
-import shutil
+import threading
+from typing import AsyncIterator
 
 # Force reload of environment variables
 load_dotenv(override=True)
@@ -20,12 +29,87 @@ api_key = os.getenv("OPENAI_API_KEY")
 if not api_key:
     raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-# Configure OpenAI
-openai.api_key = api_key
-
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Queries for the per-section extraction path
+NAME_QUERY = """
+What is the person's full name from this resume? 
+Look for:
+1. Name at the top/header of the resume
+2. Name after 'Name:' or similar labels
+3. Name in contact/personal information section
+Return ONLY the name, nothing else. If no name is found, return 'Not found'.
+"""
+
+LOCATION_QUERY = """
+What is the person's current location/address from this resume?
+Look for:
+1. Address in contact information
+2. City and state/country
+3. Location mentioned with current position
+Return ONLY the location, nothing else. If no location is found, return 'Not found'.
+"""
+
+SECTION_QUERIES = {
+    'education': """Extract all education information including:
+        - Degree/Certificate name
+        - Institution name
+        - Graduation year
+        - GPA (if mentioned)
+        - Major/Specialization
+        Please format as a list of educational experiences.""",
+    'experience': """Extract all work experiences including:
+        - Company name
+        - Position/Title
+        - Duration (start and end dates)
+        - Key responsibilities and achievements
+        Please format as a chronological list, starting with the most recent.""",
+    'skills': """Categorize the skills mentioned in the resume into:
+        - Technical Skills
+        - Soft Skills
+        - Languages
+        - Tools/Software
+        - Certifications
+        Please provide them as separate categories.""",
+    'summary': """Generate a concise professional summary that includes:
+        - Years of experience
+        - Key expertise areas
+        - Major achievements
+        - Career highlights
+        Limit to 3-4 sentences.""",
+}
+
+# Rough characters per token, used when tiktoken is not installed; low so estimates err high
+CHARS_PER_TOKEN = 3
+
+# Marks the end of one producer in ResumeAnalyzer.astream
+_STREAM_DONE = object()
+
+# Sections answered by the LLM, in extraction order
+LLM_SECTIONS = ['personal_info', 'education', 'experience', 'skills', 'summary']
+# Order of sections in an analysis result
+SECTION_ORDER = ['contact_info'] + LLM_SECTIONS
+# Sections extracted from the lines under their own heading, when the resume has one
+HEADED_SECTIONS = ['education', 'experience', 'skills']
+
+# What each key of the combined JSON response should contain
+COMBINED_SECTION_INSTRUCTIONS = {
+    'personal_info': 'an object with "name" (the person\'s full name, usually at the top of the resume) '
+                     'and "location" (current city and state/country). Use "Not found" for missing values.',
+    'education': 'a string listing every degree/certificate with institution, graduation year, '
+                 'GPA (if mentioned) and major/specialization, one per line.',
+    'experience': 'a string listing every work experience, most recent first, with company, position, '
+                  'start and end dates and key responsibilities and achievements.',
+    'skills': 'a string grouping the skills into Technical Skills, Soft Skills, Languages, '
+              'Tools/Software and Certifications.',
+    'summary': 'a string with a 3-4 sentence professional summary covering years of experience, '
+               'key expertise areas, major achievements and career highlights.',
+}
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
 class ResumeAnalyzer:
     def __init__(self):
         load_dotenv(override=True)
@@ -34,137 +118,564 @@ class ResumeAnalyzer:
         if not self.api_key:
             raise ValueError("OpenAI API key not found")
             
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={'device': 'cpu'}
-        )
+        # The embedding model (and torch with it) is loaded on first use or by warm_up()
+        self.embedding_model_name = "sentence-transformers/all-MiniLM-L6-v2"
+        self.embedding_precision = EMBEDDING_PRECISION
+        # Precision the loaded model actually runs at: load_precision() falls back to fp32
+        # when a reduced one fails its accuracy check, so it is unknown until then
+        self.effective_embedding_precision = "fp32" if self.embedding_precision == "fp32" else None
+        self._embeddings = None
+        self._embeddings_lock = threading.Lock()
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200,
             length_function=len
         )
-        self.llm = ChatOpenAI(
+        self.llm_model_name = "gpt-3.5-turbo"
+        self._token_encoding = None
+        # Calls share one process-wide client: pooled connections, rate limits and retries
+        self.llm = SharedChatModel(
             temperature=0,
-            model_name="gpt-3.5-turbo",
-            openai_api_key=self.api_key
+            model_name=self.llm_model_name,
+            callbacks=[LLMMetricsHandler(self.llm_model_name)]
         )
         self.text_processor = TextProcessor()
         
-        # Create a directory for temporary Chroma DBs
-        os.makedirs("temp_dbs", exist_ok=True)
+        # Rule-based fast path: sections it extracts with enough confidence skip the LLM
+        self.segmenter = SectionSegmenter(self.text_processor)
+        self.segmenter_enabled = os.getenv("SEGMENTER_ENABLED", "true").lower() == "true"
+        self.segmenter_min_confidence = float(os.getenv("SEGMENTER_MIN_CONFIDENCE", "0.75"))
+        
+        # Resumes up to this many tokens go to the LLM whole, without embedding or retrieval (0 disables)
+        self.context_token_budget = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2500"))
+        
+        # "combined" asks for all sections in one LLM call, "per_section" runs one call per field
+        self.extraction_mode = os.getenv("EXTRACTION_MODE", "combined").lower()
+        
+        # Bounds on concurrent LLM calls, per request and across the whole process
+        self.request_llm_concurrency = int(os.getenv("LLM_REQUEST_CONCURRENCY", "3"))
+        self.llm_semaphore = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+
+    @property
+    def embeddings(self):
+        """Embedding model, loaded on first access"""
+        if self._embeddings is None:
+            with self._embeddings_lock:
+                if self._embeddings is None:
+                    self._embeddings = self._load_embeddings()
+        return self._embeddings
+
+    @property
+    def embeddings_loaded(self) -> bool:
+        return self._embeddings is not None
+
+    def _load_embeddings(self):
+        """Load the sentence-transformers model behind the optional batcher and embedding cache"""
+        from langchain.embeddings import HuggingFaceEmbeddings
+        
+        logger.info(f"Loading embedding model: {self.embedding_model_name}")
+        embeddings = HuggingFaceEmbeddings(
+            model_name=self.embedding_model_name,
+            model_kwargs={'device': 'cpu'}
+        )
+        # Optional int8 model, kept only if its rankings match fp32 on a sample set
+        embeddings, precision = load_precision(embeddings, self.embedding_precision)
+        self.effective_embedding_precision = precision
+        # Concurrent analyses share batched model calls
+        if os.getenv("EMBEDDING_BATCHING", "true").lower() == "true":
+            embeddings = EmbeddingBatcher(embeddings)
+        # Only chunks that were never embedded before reach the model
+        if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true":
+            # Reduced-precision vectors are cached apart from fp32 ones
+            cache_name = self.embedding_model_name if precision == "fp32" else f"{self.embedding_model_name}@{precision}"
+            embeddings = CachedEmbeddings(embeddings, cache_name)
+        return embeddings
+
+    def warm_up(self):
+        """Load the embedding model and token encoding and run one encode so the first request is fast"""
+        self.load_token_encoding()
+        embeddings = self.embeddings
+        # Bypass the cache so the model itself runs once
+        base = getattr(embeddings, "embeddings", embeddings)
+        base.embed_query("warm up")
+        logger.info("Embedding model warmed up")
+
+    def cache_settings(self) -> dict:
+        """Settings that change the analysis output, used in result cache keys"""
+        return {
+            "llm_model": self.llm_model_name,
+            "embedding_model": self.embedding_model_name,
+            # Results from before the precision check never share keys with later ones
+            "embedding_precision": self.effective_embedding_precision,
+            "extraction_mode": self.extraction_mode,
+            "segmenter_min_confidence": self.segmenter_min_confidence if self.segmenter_enabled else None,
+            "context_token_budget": self.context_token_budget,
+        }
+
+    def load_token_encoding(self):
+        """Load the tiktoken encoding, which may download its BPE file; called from warm_up() off the event loop"""
+        if self._token_encoding is None:
+            try:
+                import tiktoken
+                self._token_encoding = tiktoken.encoding_for_model(self.llm_model_name)
+            except Exception as e:
+                logger.warning(f"Token encoding unavailable, estimating token counts from length: {str(e)}")
+                self._token_encoding = False
+
+    def count_tokens(self, text: str) -> int:
+        """Number of chat model tokens in text, estimated from its length until warm_up() loaded tiktoken"""
+        if self._token_encoding:
+            return len(self._token_encoding.encode(text))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def fits_context(self, cleaned_text: str, token_count: int = None) -> bool:
+        """Whether the whole resume fits in CONTEXT_TOKEN_BUDGET, so retrieval can be skipped"""
+        if self.context_token_budget <= 0:
+            return False
+        if token_count is None:
+            token_count = self.count_tokens(cleaned_text)
+        return token_count <= self.context_token_budget
+
+    def order_sections(self, analysis: dict) -> dict:
+        """Put the sections of an analysis in the usual order"""
+        return {section: analysis[section] for section in SECTION_ORDER if section in analysis}
+
+    def section_fingerprints(self, cleaned_text: str) -> dict:
+        """Hash of the text each section is extracted from, to tell which sections a new version changed.
+
+        Education, experience and skills depend on the lines under their
+        heading and personal info on the lines before the first heading;
+        contact info, the summary and sections without a heading can draw on
+        the whole resume.
+        """
+        header, bodies = self.segmenter.split_sections(cleaned_text)
+        whole = _digest(cleaned_text)
+        fingerprints = {section: whole for section in SECTION_ORDER}
+        if header:
+            fingerprints['personal_info'] = _digest("\n".join(header))
+        for section in HEADED_SECTIONS:
+            if bodies.get(section):
+                fingerprints[section] = _digest("\n".join(bodies[section]))
+        return fingerprints
+
+    def segment_sections(self, cleaned_text: str, sections: list) -> dict:
+        """Sections the rule-based segmenter extracted with at least SEGMENTER_MIN_CONFIDENCE"""
+        if not self.segmenter_enabled or not sections:
+            return {}
+        
+        try:
+            with stage_timer("segment"):
+                segments = self.segmenter.segment(cleaned_text, sections)
+        except Exception as e:
+            # The LLM path still covers every section
+            logger.error(f"Error in rule-based segmentation: {str(e)}")
+            return {}
+        
+        resolved = {
+            section: segment["value"] for section, segment in segments.items()
+            if segment["value"] and segment["confidence"] >= self.segmenter_min_confidence
+        }
+        logger.info(f"Segmenter resolved {len(resolved)} of {len(sections)} sections without the LLM: {list(resolved)}")
+        return resolved
+
+    def llm_sections_needed(self, text: str, options: list) -> list:
+        """Selected LLM sections the segmenter cannot answer on its own"""
+        sections = [section for section in LLM_SECTIONS if section in options]
+        resolved = self.segment_sections(self.text_processor.clean_text(text), sections)
+        return [section for section in sections if section not in resolved]
 
     def analyze(self, text: str, options: list) -> dict:
         """Analyze resume text based on selected options"""
         try:
             session_id = str(uuid.uuid4())
-            persist_directory = f"temp_dbs/{session_id}"
             
             logger.info(f"Starting new analysis session: {session_id}")
             logger.info(f"Selected options: {options}")
             
-            cleaned_text = self.text_processor.clean_text(text)
+            with stage_timer("clean"):
+                cleaned_text = self.text_processor.clean_text(text)
             analysis = {}
             
             # Always extract contact info if selected
             if 'contact_info' in options:
                 analysis['contact_info'] = self._extract_contact_info(cleaned_text)
             
+            # Sections with clear headings are extracted by rules
+            llm_sections = [section for section in LLM_SECTIONS if section in options]
+            resolved = self.segment_sections(cleaned_text, llm_sections)
+            analysis.update(resolved)
+            llm_sections = [section for section in llm_sections if section not in resolved]
+            
             # Only create vector store if needed
-            if set(options) - {'contact_info'}:
-                try:
-                    vectorstore = Chroma(
-                        collection_name=f"resume_{session_id}",
-                        embedding_function=self.embeddings,
-                        persist_directory=persist_directory
-                    )
-                    
-                    chunks = self.text_splitter.split_text(cleaned_text)
-                    vectorstore.add_texts(chunks)
-                    
-                    qa_chain = RetrievalQA.from_chain_type(
-                        llm=self.llm,
-                        chain_type="stuff",
-                        retriever=vectorstore.as_retriever(
-                            search_kwargs={"k": 3}
-                        )
-                    )
-                    
-                    # Extract only selected information
-                    if 'personal_info' in options:
-                        analysis['personal_info'] = self._extract_personal_info(qa_chain, cleaned_text)
-                    if 'education' in options:
-                        analysis['education'] = self._extract_education(qa_chain)
-                    if 'experience' in options:
-                        analysis['experience'] = self._extract_experience(qa_chain)
-                    if 'skills' in options:
-                        analysis['skills'] = self._extract_skills(qa_chain)
-                    if 'summary' in options:
-                        analysis['summary'] = self._generate_summary(qa_chain)
-                    
-                finally:
-                    try:
-                        vectorstore.delete_collection()
-                        if os.path.exists(persist_directory):
-                            shutil.rmtree(persist_directory)
-                    except Exception as cleanup_error:
-                        logger.error(f"Error during cleanup: {cleanup_error}")
+            if llm_sections:
+                qa_chain = self._build_qa_chain(cleaned_text)
+                
+                # Extract only selected information
+                if self.extraction_mode == 'combined':
+                    analysis.update(self._extract_combined(qa_chain, llm_sections, cleaned_text))
+                else:
+                    for section in llm_sections:
+                        analysis[section] = self._extract_section(section, qa_chain, cleaned_text)
+            
+            # Keep the usual section order
+            return self.order_sections(analysis)
+            
+        except Exception as e:
+            logger.error(f"Error analyzing resume: {str(e)}")
+            raise
+    
+    def split_text(self, text: str) -> list:
+        """Clean the text and split it into the chunks that get embedded"""
+        return self.text_splitter.split_text(self.text_processor.clean_text(text))
+
+    async def aanalyze(self, text: str, options: list, max_concurrency: int = None,
+                       chunks: list = None, chunk_vectors: list = None, token_count: int = None) -> dict:
+        """Analyze resume text without blocking the event loop, running LLM sections concurrently.
+
+        Callers that embed chunks themselves (e.g. the batch pipeline) pass
+        chunks from split_text() together with their vectors; callers that
+        already counted the cleaned text's tokens pass token_count.
+        """
+        try:
+            analysis = {}
+            async for section, value in self.astream(text, options, max_concurrency, chunks, chunk_vectors,
+                                                     token_count):
+                analysis[section] = value
             
-            return analysis
+            # Keep the usual section order regardless of completion order
+            return self.order_sections(analysis)
             
         except Exception as e:
             logger.error(f"Error analyzing resume: {str(e)}")
             raise
     
+    async def astream(self, text: str, options: list, max_concurrency: int = None,
+                      chunks: list = None, chunk_vectors: list = None,
+                      token_count: int = None) -> AsyncIterator[tuple]:
+        """Yield (section, result) pairs as soon as each selected section is done"""
+        session_id = str(uuid.uuid4())
+        
+        logger.info(f"Starting new async analysis session: {session_id}")
+        logger.info(f"Selected options: {options}")
+        
+        with stage_timer("clean"):
+            cleaned_text = self.text_processor.clean_text(text)
+        limit = asyncio.Semaphore(max_concurrency or self.request_llm_concurrency)
+        queue = asyncio.Queue()
+        
+        def emit(section, value):
+            queue.put_nowait((section, value))
+        
+        producers = []
+        if 'contact_info' in options:
+            producers.append(self._produce(queue, self._astream_contact_info(cleaned_text, emit)))
+        
+        # Sections with clear headings are extracted by rules, the rest go to the LLM
+        llm_sections = [section for section in LLM_SECTIONS if section in options]
+        resolved = self.segment_sections(cleaned_text, llm_sections)
+        llm_sections = [section for section in llm_sections if section not in resolved]
+        
+        # Only create vector store if needed
+        if llm_sections:
+            # Tokens are counted once per document; callers that embedded chunks already keep retrieval
+            whole_document = chunks is None and self.fits_context(cleaned_text, token_count)
+            producers.append(self._produce(queue, self._astream_llm_sections(
+                cleaned_text, llm_sections, limit, emit, whole_document, chunks, chunk_vectors
+            )))
+        
+        tasks = [asyncio.create_task(producer) for producer in producers]
+        try:
+            # Rule-based sections are ready immediately
+            for item in resolved.items():
+                yield item
+            
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if item is _STREAM_DONE:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            # Stop outstanding work if the consumer goes away or a producer failed
+            for task in tasks:
+                task.cancel()
+    
+    async def _produce(self, queue: asyncio.Queue, coro):
+        """Run a section producer, forwarding its failure and completion to the stream"""
+        try:
+            await coro
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(_STREAM_DONE)
+    
+    async def _astream_contact_info(self, cleaned_text: str, emit):
+        emit('contact_info', await asyncio.to_thread(self._extract_contact_info, cleaned_text))
+    
+    async def _astream_llm_sections(self, cleaned_text: str, llm_sections: list, limit: asyncio.Semaphore,
+                                    emit, whole_document: bool, chunks: list = None, chunk_vectors: list = None):
+        if whole_document:
+            # Nothing to embed, the whole text goes into the prompt
+            qa_chain = self._build_qa_chain(cleaned_text, whole_document=True)
+        else:
+            # Embedding is CPU-bound, run it in the dedicated embedding pool
+            qa_chain = await run_in_embedding_pool(
+                self._build_qa_chain, cleaned_text, chunks, chunk_vectors, False
+            )
+        
+        if self.extraction_mode == 'combined':
+            await self._aextract_combined(qa_chain, llm_sections, limit, emit)
+        else:
+            async def run(section):
+                emit(section, await self._aextract_section(section, qa_chain, limit))
+            await asyncio.gather(*(run(section) for section in llm_sections))
+    
+    def _build_qa_chain(self, cleaned_text: str, chunks: list = None, chunk_vectors: list = None,
+                        whole_document: bool = None):
+        """Index the resume chunks and build the retrieval QA chain"""
+        # Small resumes are sent whole; callers that embedded chunks already keep retrieval
+        if whole_document is None:
+            whole_document = chunks is None and self.fits_context(cleaned_text)
+        if whole_document:
+            logger.info("Resume fits the context token budget, skipping embedding and retrieval")
+            return RetrievalQA.from_chain_type(
+                llm=self.llm,
+                chain_type="stuff",
+                retriever=WholeDocumentRetriever(text=cleaned_text)
+            )
+        
+        # Per-request in-memory index, released with the request
+        vectorstore = InMemoryVectorStore(self.embeddings)
+        
+        if chunks is None:
+            with stage_timer("split"):
+                chunks = self.text_splitter.split_text(cleaned_text)
+        if chunk_vectors is None:
+            with stage_timer("embed"):
+                chunk_vectors = self.embeddings.embed_documents(chunks)
+        with stage_timer("index"):
+            vectorstore.add_embeddings(chunks, chunk_vectors)
+        
+        return RetrievalQA.from_chain_type(
+            llm=self.llm,
+            chain_type="stuff",
+            retriever=vectorstore.as_retriever(
+                search_kwargs={"k": 3}
+            )
+        )
+    
+    async def _arun_query(self, qa_chain, query: str, limit: asyncio.Semaphore) -> str:
+        """Run one QA query within the per-request and per-process limits"""
+        async with limit, self.llm_semaphore:
+            return await qa_chain.arun(query)
+    
+    async def _aextract_section(self, section: str, qa_chain, limit: asyncio.Semaphore):
+        """Extract a single section with its dedicated query"""
+        if section == 'personal_info':
+            return await self._aextract_personal_info(qa_chain, limit)
+        return await self._arun_query(qa_chain, SECTION_QUERIES[section], limit)
+    
+    async def _aextract_combined(self, qa_chain, sections: list, limit: asyncio.Semaphore, emit=None) -> dict:
+        """Async variant of the single structured LLM call; emit(section, value) is called as sections finish"""
+        results = {}
+        if not sections:
+            return results
+        
+        try:
+            if isinstance(qa_chain.retriever, WholeDocumentRetriever):
+                prompt = self._build_combined_prompt(qa_chain.retriever, sections)
+            else:
+                # Retrieval embeds the section queries
+                prompt = await run_in_embedding_pool(self._build_combined_prompt, qa_chain.retriever, sections)
+            async with limit, self.llm_semaphore:
+                response = await self.llm.apredict(prompt)
+            parsed = self._parse_json_response(response)
+            
+            for section in sections:
+                value = self._coerce_section(section, parsed.get(section))
+                if value is not None:
+                    results[section] = value
+                    if emit:
+                        emit(section, value)
+                    
+        except Exception as e:
+            logger.error(f"Error in combined extraction: {str(e)}")
+        
+        # Retry sections that were missing or malformed, concurrently
+        async def retry(section):
+            logger.warning(f"Combined extraction missed '{section}', retrying individually")
+            results[section] = await self._aextract_section(section, qa_chain, limit)
+            if emit:
+                emit(section, results[section])
+        
+        await asyncio.gather(*(retry(section) for section in sections if section not in results))
+        
+        return {section: results[section] for section in sections}
+    
+    def _extract_section(self, section: str, qa_chain, text: str):
+        """Extract a single section with its dedicated query"""
+        if section == 'personal_info':
+            return self._extract_personal_info(qa_chain, text)
+        
+        extractors = {
+            'education': self._extract_education,
+            'experience': self._extract_experience,
+            'skills': self._extract_skills,
+            'summary': self._generate_summary,
+        }
+        return extractors[section](qa_chain)
+    
+    def _extract_combined(self, qa_chain, sections: list, text: str) -> dict:
+        """Extract all selected sections with a single structured LLM call"""
+        results = {}
+        if not sections:
+            return results
+        
+        try:
+            prompt = self._build_combined_prompt(qa_chain.retriever, sections)
+            response = self.llm.predict(prompt)
+            parsed = self._parse_json_response(response)
+            
+            for section in sections:
+                value = self._coerce_section(section, parsed.get(section))
+                if value is not None:
+                    results[section] = value
+                    
+        except Exception as e:
+            logger.error(f"Error in combined extraction: {str(e)}")
+        
+        # Retry sections that were missing or malformed one at a time
+        for section in sections:
+            if section not in results:
+                logger.warning(f"Combined extraction missed '{section}', retrying individually")
+                results[section] = self._extract_section(section, qa_chain, text)
+        
+        return {section: results[section] for section in sections}
+    
+    def _build_combined_prompt(self, retriever, sections: list) -> str:
+        """Build one prompt asking for every selected section as JSON"""
+        # Union of the chunks retrieved for each section, in retrieval order
+        context_chunks = []
+        for section in sections:
+            for doc in retriever.get_relevant_documents(COMBINED_SECTION_INSTRUCTIONS[section]):
+                if doc.page_content not in context_chunks:
+                    context_chunks.append(doc.page_content)
+        
+        keys = "\n".join(
+            f'- "{section}": {COMBINED_SECTION_INSTRUCTIONS[section]}' for section in sections
+        )
+        context = "\n\n".join(context_chunks)
+        
+        return f"""Use the following resume excerpts to extract information about the candidate.
+If a value cannot be found in the excerpts, use "Not found".
+
+Resume excerpts:
+{context}
+
+Return ONLY a valid JSON object with exactly these keys:
+{keys}"""
+    
+    def _parse_json_response(self, response: str) -> dict:
+        """Parse the combined response, repairing common formatting mistakes"""
+        cleaned = response.strip()
+        # Strip Markdown code fences the model sometimes adds
+        cleaned = re.sub(r'^```(?:json)?\s*|\s*```$', '', cleaned)
+        
+        candidates = [cleaned]
+        match = re.search(r'\{.*\}', cleaned, re.DOTALL)
+        if match:
+            candidates.append(match.group(0))
+        
+        for candidate in candidates:
+            # Also try without trailing commas before closing brackets
+            for attempt in (candidate, re.sub(r',\s*([}\]])', r'\1', candidate)):
+                try:
+                    parsed = json.loads(attempt)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(parsed, dict):
+                    return parsed
+        
+        logger.warning("Could not parse combined extraction response as JSON")
+        return {}
+    
+    def _coerce_section(self, section: str, value):
+        """Normalize a section from the combined response, or return None if unusable"""
+        if section == 'personal_info':
+            if not isinstance(value, dict):
+                return None
+            name = str(value.get('name') or '').strip()
+            location = str(value.get('location') or '').strip()
+            # Same rule as the per-section path: a missing name is worth a retry
+            if not name or name.lower() == 'not found':
+                return None
+            return {
+                "name": name,
+                "location": location if location and location.lower() != 'not found' else "Not found"
+            }
+        
+        if isinstance(value, str):
+            return value.strip() or None
+        if isinstance(value, list):
+            lines = [self._format_item(item) for item in value]
+            return "\n".join(f"- {line}" for line in lines if line) or None
+        if isinstance(value, dict):
+            lines = [f"{key}: {self._format_item(item)}" for key, item in value.items()]
+            return "\n".join(lines) or None
+        return None
+    
+    def _format_item(self, item) -> str:
+        """Render a JSON value from the combined response as plain text"""
+        if isinstance(item, dict):
+            return ", ".join(f"{key}: {self._format_item(val)}" for key, val in item.items() if val)
+        if isinstance(item, list):
+            return ", ".join(self._format_item(val) for val in item if val)
+        return str(item).strip()
+    
     def _extract_personal_info(self, qa_chain, text: str) -> dict:
         """Extract personal information"""
         try:
             logger.info("Starting personal info extraction")
             
-            # More specific prompts for name extraction
-            name_query = """
-            What is the person's full name from this resume? 
-            Look for:
-            1. Name at the top/header of the resume
-            2. Name after 'Name:' or similar labels
-            3. Name in contact/personal information section
-            Return ONLY the name, nothing else. If no name is found, return 'Not found'.
-            """
+            # Transient API failures are retried by the shared LLM client
+            name_response = qa_chain.run(NAME_QUERY).strip()
+            location_response = qa_chain.run(LOCATION_QUERY).strip()
             
-            location_query = """
-            What is the person's current location/address from this resume?
-            Look for:
-            1. Address in contact information
-            2. City and state/country
-            3. Location mentioned with current position
-            Return ONLY the location, nothing else. If no location is found, return 'Not found'.
-            """
+            logger.info(f"Name extraction response: {name_response}")
+            logger.info(f"Location extraction response: {location_response}")
             
-            # Get responses with retries
-            max_retries = 2
-            for attempt in range(max_retries):
-                try:
-                    name_response = qa_chain.run(name_query).strip()
-                    location_response = qa_chain.run(location_query).strip()
-                    
-                    logger.info(f"Name extraction response (attempt {attempt + 1}): {name_response}")
-                    logger.info(f"Location extraction response (attempt {attempt + 1}): {location_response}")
-                    
-                    # Validate responses
-                    if name_response and name_response.lower() != "not found":
-                        break
-                except Exception as retry_error:
-                    logger.warning(f"Retry {attempt + 1} failed: {retry_error}")
-                    if attempt == max_retries - 1:
-                        raise
+            result = self._build_personal_info(name_response, location_response)
             
-            # Clean up responses
-            name = name_response if name_response and name_response.lower() != "not found" else "Not found"
-            location = location_response if location_response and location_response.lower() != "not found" else "Not found"
+            logger.info(f"Final personal info: {result}")
+            return result
             
-            result = {
-                "name": name,
-                "location": location
+        except Exception as e:
+            logger.error(f"Error extracting personal info: {str(e)}")
+            return {
+                "name": "Error extracting name",
+                "location": "Error extracting location"
             }
+    
+    async def _aextract_personal_info(self, qa_chain, limit: asyncio.Semaphore) -> dict:
+        """Extract personal information, asking for name and location concurrently"""
+        try:
+            logger.info("Starting personal info extraction")
+            
+            # Transient API failures are retried by the shared LLM client
+            name_response, location_response = await asyncio.gather(
+                self._arun_query(qa_chain, NAME_QUERY, limit),
+                self._arun_query(qa_chain, LOCATION_QUERY, limit)
+            )
+            name_response = name_response.strip()
+            location_response = location_response.strip()
+            
+            logger.info(f"Name extraction response: {name_response}")
+            logger.info(f"Location extraction response: {location_response}")
+            
+            result = self._build_personal_info(name_response, location_response)
             
             logger.info(f"Final personal info: {result}")
             return result
@@ -176,37 +687,32 @@ class ResumeAnalyzer:
                 "location": "Error extracting location"
             }
     
+    def _build_personal_info(self, name_response: str, location_response: str) -> dict:
+        """Clean up name and location responses"""
+        name = name_response if name_response and name_response.lower() != "not found" else "Not found"
+        location = location_response if location_response and location_response.lower() != "not found" else "Not found"
+        
+        return {
+            "name": name,
+            "location": location
+        }
+    
     def _extract_contact_info(self, text: str) -> dict:
         """Extract contact information using multiple methods"""
-        try:
-            logger.debug(f"Extracting contact info from text: {text[:200]}...")
+        with stage_timer("contact"):
+            try:
+                logger.debug(f"Extracting contact info from text: {text[:200]}...")
             
-            # First try regex through TextProcessor
-            contact_info = self.text_processor.extract_contact_info(text)
-            logger.info(f"Initial contact info from regex: {contact_info}")
+                # First try regex through TextProcessor
+                contact_info = self.text_processor.extract_contact_info(text)
+                logger.info(f"Initial contact info from regex: {contact_info}")
             
-            # If email is missing, try additional methods
-            if not contact_info.get('email'):
-                # Try direct pattern matching
-                email_patterns = [
-                    r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}',
-                    r'[A-Za-z0-9._]+@outlook\.com',
-                    r'[A-Za-z]+[0-9]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}'
-                ]
-                
-                for pattern in email_patterns:
-                    matches = re.findall(pattern, text, re.IGNORECASE)
-                    if matches:
-                        contact_info['email'] = matches[0]
-                        logger.info(f"Found email with additional pattern: {matches[0]}")
-                        break
-                
-                # If still not found, try LLM
-                if not contact_info.get('email'):
+                # The scanner already tried every email pattern, fall back to the LLM
+                if contact_info.get('email') in (None, "Not found"):
                     email_query = """What is the email address in this text? 
                     Look for patterns like xxx@xxx.xxx or anything containing @ symbol.
                     Return only the email address without any additional text."""
-                    
+                
                     email_response = self.llm.predict(email_query + "\n\nText: " + text)
                     if email_response and '@' in email_response:
                         email = email_response.strip()
@@ -215,61 +721,38 @@ class ResumeAnalyzer:
                         if email:
                             contact_info['email'] = email.group(0)
                             logger.info(f"Found email with LLM: {email.group(0)}")
+        
+                # Ensure we have all fields even if empty
+                result = {
+                    "email": contact_info.get('email', "Not found"),
+                    "phone": contact_info.get('phone', "Not found"),
+                    "linkedin": contact_info.get('linkedin', "Not found")
+                }
             
-            # Ensure we have all fields even if empty
-            result = {
-                "email": contact_info.get('email', "Not found"),
-                "phone": contact_info.get('phone', "Not found"),
-                "linkedin": contact_info.get('linkedin', "Not found")
-            }
-            
-            logger.info(f"Final contact info: {result}")
-            return result
+                logger.info(f"Final contact info: {result}")
+                return result
             
-        except Exception as e:
-            logger.error(f"Error extracting contact info: {str(e)}")
-            return {
-                "email": "Error extracting email",
-                "phone": "Error extracting phone",
-                "linkedin": "Error extracting LinkedIn"
-            }
+            except Exception as e:
+                logger.error(f"Error extracting contact info: {str(e)}")
+                return {
+                    "email": "Error extracting email",
+                    "phone": "Error extracting phone",
+                    "linkedin": "Error extracting LinkedIn"
+                }
     
     def _extract_education(self, qa_chain) -> list:
         """Extract education information"""
-        query = """Extract all education information including:
-        - Degree/Certificate name
-        - Institution name
-        - Graduation year
-        - GPA (if mentioned)
-        - Major/Specialization
-        Please format as a list of educational experiences."""
-        
-        response = qa_chain.run(query)
+        response = qa_chain.run(SECTION_QUERIES['education'])
         return response
     
     def _extract_experience(self, qa_chain) -> list:
         """Extract work experience"""
-        query = """Extract all work experiences including:
-        - Company name
-        - Position/Title
-        - Duration (start and end dates)
-        - Key responsibilities and achievements
-        Please format as a chronological list, starting with the most recent."""
-        
-        response = qa_chain.run(query)
+        response = qa_chain.run(SECTION_QUERIES['experience'])
         return response
     
     def _extract_skills(self, qa_chain) -> dict:
         """Extract skills categorized"""
-        query = """Categorize the skills mentioned in the resume into:
-        - Technical Skills
-        - Soft Skills
-        - Languages
-        - Tools/Software
-        - Certifications
-        Please provide them as separate categories."""
-        
-        response = qa_chain.run(query)
+        response = qa_chain.run(SECTION_QUERIES['skills'])
         return response
     
     def _extract_keywords(self, qa_chain) -> list:
@@ -285,12 +768,5 @@ class ResumeAnalyzer:
     
     def _generate_summary(self, qa_chain) -> str:
         """Generate a professional summary"""
-        query = """Generate a concise professional summary that includes:
-        - Years of experience
-        - Key expertise areas
-        - Major achievements
-        - Career highlights
-        Limit to 3-4 sentences."""
-        
-        response = qa_chain.run(query)
+        response = qa_chain.run(SECTION_QUERIES['summary'])
         return response
\ No newline at end of file
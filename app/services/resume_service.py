@@ -1,48 +1,305 @@
+import os
 import logging
 from fastapi import UploadFile
-import os
-import aiofiles
-from app.services.resume_analyzer import ResumeAnalyzer
-from app.extractors.text_extractor import TextExtractor
+import asyncio
+import threading
+from typing import AsyncIterator, List, Optional
+from app.services.result_cache import ResultCache
+from app.services.single_flight import SingleFlight
+from app.services.revision_store import RevisionStore
+from app.extractors.text_extractor import TextExtractor, SpooledUpload
 
 logger = logging.getLogger(__name__)
 
+# Sections about the candidate themselves; a near duplicate may be another
+# person's copy of the same resume body, so these are never taken from it
+PERSONAL_SECTIONS = ('contact_info', 'personal_info', 'summary')
+
 class ResumeService:
     def __init__(self):
-        self.resume_analyzer = ResumeAnalyzer()
+        # The analyzer pulls in LangChain, the OpenAI client and the embedding
+        # model, so it is created on first use or by warm_up()
+        self._resume_analyzer = None
+        self._analyzer_lock = threading.Lock()
+        self.ready = False
         self.text_extractor = TextExtractor()
+        self.result_cache = ResultCache()
+        # Identical requests that arrive while one is being processed share its result
+        self.single_flight = SingleFlight()
+        # New versions of a known resume only re-run the sections whose text changed
+        self.revision_store = RevisionStore()
+        # "flag" marks near-identical resumes (agency copies, reformatted files),
+        # "reuse" also answers them with the stored result; the index is opened on first use
+        self.near_duplicate_mode = os.getenv("NEAR_DUP_MODE", "off").lower()
+        self._near_duplicates = None
+        self._near_duplicates_lock = threading.Lock()
+
+    @property
+    def resume_analyzer(self):
+        """Resume analyzer, created on first access"""
+        if self._resume_analyzer is None:
+            with self._analyzer_lock:
+                if self._resume_analyzer is None:
+                    from app.services.resume_analyzer import ResumeAnalyzer
+                    self._resume_analyzer = ResumeAnalyzer()
+        return self._resume_analyzer
 
-    async def process_resume(self, file: UploadFile, selected_options: list) -> dict:
+    async def load_analyzer(self):
+        """Resume analyzer, created in a thread so a cold start or a running warm-up never blocks the event loop"""
+        if self._resume_analyzer is not None:
+            return self._resume_analyzer
+        return await asyncio.to_thread(lambda: self.resume_analyzer)
+
+    @property
+    def analyzer_loaded(self) -> bool:
+        return self._resume_analyzer is not None
+
+    @property
+    def near_duplicates(self):
+        """Near-duplicate index, opened on first access"""
+        if self._near_duplicates is None:
+            with self._near_duplicates_lock:
+                if self._near_duplicates is None:
+                    from app.services.near_duplicate import NearDuplicateIndex
+                    self._near_duplicates = NearDuplicateIndex()
+        return self._near_duplicates
+
+    async def warm_up(self):
+        """Load heavy dependencies and models off the event loop"""
+        try:
+            analyzer = await self.load_analyzer()
+            await asyncio.to_thread(analyzer.warm_up)
+            self.ready = True
+            logger.info("Resume service is ready")
+        except Exception as e:
+            logger.error(f"Error warming up resume service: {str(e)}")
+            raise
+
+    async def process_resume(self, file: UploadFile, selected_options: list,
+                             document_id: Optional[str] = None) -> dict:
         """Process resume file and extract information"""
+        logger.info(f"Processing resume: {file.filename}")
+        
+        # Stream the upload into memory (spilling to disk only past the threshold)
+        with await self.text_extractor.spool_upload(file) as upload:
+            return await self.process_upload(upload, selected_options, document_id)
+
+    async def process_upload(self, upload: SpooledUpload, selected_options: list,
+                             document_id: Optional[str] = None) -> dict:
+        """Process an already spooled resume and extract information.
+
+        document_id names the document a revised upload replaces; without it
+        earlier versions are matched by email address or phone number.
+        """
         try:
-            logger.info(f"Processing resume: {file.filename}")
             logger.info(f"Selected options: {selected_options}")
             
-            # Extract text from file
-            text = await self.text_extractor.extract_text(file)
-            logger.info(f"Extracted text length: {len(text)}")
-            
-            # Analyze text with selected options
-            analysis = self.resume_analyzer.analyze(text, selected_options)
+            # Look up the result by content hash before doing any work
+            analyzer = await self.load_analyzer()
+            cache_key = self.result_cache.make_key_from_digest(
+                upload.digest, selected_options, analyzer.cache_settings()
+            )
+            cached = await self.result_cache.aget(cache_key)
+            if cached is not None:
+                logger.info(f"Result cache hit for {upload.filename}")
+                return cached
             
-            return analysis
+            # Same content, options and settings: share the computation already running
+            return await self.single_flight.do(
+                cache_key, lambda: self._analyze_upload(upload, selected_options, cache_key, document_id)
+            )
             
         except Exception as e:
             logger.error(f"Error processing resume: {str(e)}")
             raise
 
-    async def _save_temp_file(self, file: UploadFile) -> str:
-        """Save uploaded file temporarily"""
+    async def _analyze_upload(self, upload: SpooledUpload, selected_options: list, cache_key: str,
+                              document_id: Optional[str] = None) -> dict:
+        # Extract text from file
+        text = await self.text_extractor.extract_from_upload(upload)
+        logger.info(f"Extracted text length: {len(text)}")
+        
+        # Resumes that differ only slightly from one analyzed before
+        signature, duplicate = await self._find_near_duplicate(upload.digest, text)
+        
+        # Sections unchanged since the previous version of this resume are reused
+        revision_key, fingerprints, reused = await asyncio.to_thread(
+            self._plan_revision, text, selected_options, document_id
+        )
+        analysis = {**await self._near_duplicate_sections(duplicate, selected_options), **reused}
+        remaining = [option for option in selected_options if option not in analysis]
+        if remaining:
+            # Analyze text with selected options without blocking the event loop
+            analysis.update(await self.resume_analyzer.aanalyze(text, remaining))
+        analysis = self.resume_analyzer.order_sections(analysis)
+        
+        if self._is_cacheable(analysis):
+            await self.result_cache.aset(cache_key, analysis)
+            await asyncio.to_thread(self._record_revision, revision_key, fingerprints, analysis)
+            if signature is not None:
+                await self._index_near_duplicate(upload.digest, signature)
+        
+        if duplicate is not None:
+            # Flag only the response, the cached result is the document's own
+            return {**analysis, "near_duplicate": duplicate}
+        return analysis
+
+    async def stream_upload(self, upload: SpooledUpload, selected_options: list,
+                            document_id: Optional[str] = None) -> AsyncIterator[tuple]:
+        """Yield (section, result) pairs as each section of a spooled resume is done"""
+        analyzer = await self.load_analyzer()
+        cache_key = self.result_cache.make_key_from_digest(
+            upload.digest, selected_options, analyzer.cache_settings()
+        )
+        cached = await self.result_cache.aget(cache_key)
+        if cached is not None:
+            logger.info(f"Result cache hit for {upload.filename}")
+            for section, value in cached.items():
+                yield section, value
+            return
+        
+        # Shares the computation with identical uploads in flight, streamed or not. Sections
+        # arrive as events when this call leads; otherwise the shared result is replayed.
+        events = asyncio.Queue()
+        finished = object()
+        flight = asyncio.ensure_future(self.single_flight.do(
+            cache_key, lambda: self._stream_analysis(upload, selected_options, cache_key, document_id,
+                                                     events.put_nowait)
+        ))
+        flight.add_done_callback(lambda _: events.put_nowait(finished))
         try:
-            os.makedirs("temp", exist_ok=True)
-            file_path = f"temp/{file.filename}"
-            
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
-            
-            return file_path
-            
+            yielded = set()
+            while (event := await events.get()) is not finished:
+                yielded.add(event[0])
+                yield event
+            result = flight.result()
+            if "near_duplicate" in result and "near_duplicate" not in yielded:
+                yield "near_duplicate", result["near_duplicate"]
+                yielded.add("near_duplicate")
+            for section, value in result.items():
+                if section not in yielded:
+                    yield section, value
+        finally:
+            # Also reached when the client disconnects mid-stream
+            flight.cancel()
+
+    async def _stream_analysis(self, upload: SpooledUpload, selected_options: list, cache_key: str,
+                               document_id: Optional[str], emit) -> dict:
+        """Same result as _analyze_upload, passing each section to emit as soon as it is done"""
+        text = await self.text_extractor.extract_from_upload(upload)
+        logger.info(f"Extracted text length: {len(text)}")
+        
+        signature, duplicate = await self._find_near_duplicate(upload.digest, text)
+        if duplicate is not None:
+            emit(("near_duplicate", duplicate))
+        
+        revision_key, fingerprints, reused = await asyncio.to_thread(
+            self._plan_revision, text, selected_options, document_id
+        )
+        analysis = {**await self._near_duplicate_sections(duplicate, selected_options), **reused}
+        for section, value in analysis.items():
+            emit((section, value))
+        
+        remaining = [option for option in selected_options if option not in analysis]
+        if remaining:
+            async for section, value in self.resume_analyzer.astream(text, remaining):
+                analysis[section] = value
+                emit((section, value))
+        analysis = self.resume_analyzer.order_sections(analysis)
+        
+        if self._is_cacheable(analysis):
+            await self.result_cache.aset(cache_key, analysis)
+            await asyncio.to_thread(self._record_revision, revision_key, fingerprints, analysis)
+            if signature is not None:
+                await self._index_near_duplicate(upload.digest, signature)
+        
+        if duplicate is not None:
+            return {**analysis, "near_duplicate": duplicate}
+        return analysis
+
+    async def process_batch(self, uploads: List[SpooledUpload], selected_options: list) -> AsyncIterator[dict]:
+        """Process many spooled resumes as a pipeline, yielding per-file results as they finish"""
+        from app.services.batch_pipeline import BatchPipeline
+        
+        logger.info(f"Processing batch of {len(uploads)} resumes")
+        pipeline = BatchPipeline(self, await self.load_analyzer(), selected_options)
+        async for result in pipeline.run(uploads):
+            yield result
+
+    async def _find_near_duplicate(self, digest: str, text: str) -> tuple:
+        """MinHash signature of the text and its closest indexed near duplicate, if any"""
+        if self.near_duplicate_mode not in ("flag", "reuse"):
+            return None, None
+        
+        def find():
+            from app.services.near_duplicate import minhash
+            signature = minhash(self.resume_analyzer.text_processor.clean_text(text))
+            if signature is None:
+                # Too little text to compare; neither looked up nor indexed
+                return None, None
+            return signature, self.near_duplicates.find(signature, exclude_digest=digest)
+        
+        try:
+            signature, duplicate = await asyncio.to_thread(find)
         except Exception as e:
-            logger.error(f"Error saving file: {str(e)}")
-            raise 
\ No newline at end of file
+            # Duplicate detection is an optimization, analyze the resume anyway
+            logger.error(f"Error checking for near duplicates: {str(e)}")
+            return None, None
+        if duplicate is not None:
+            logger.info(f"Near duplicate of {duplicate['digest'][:12]} (similarity {duplicate['similarity']})")
+        return signature, duplicate
+
+    async def _index_near_duplicate(self, digest: str, signature):
+        try:
+            await asyncio.to_thread(self.near_duplicates.add, digest, signature)
+        except Exception as e:
+            logger.error(f"Error indexing resume for near-duplicate detection: {str(e)}")
+
+    async def _near_duplicate_sections(self, duplicate: Optional[dict], selected_options: list) -> dict:
+        """Cached sections of a near duplicate that can stand in for this document's, in "reuse" mode"""
+        if duplicate is None or self.near_duplicate_mode != "reuse":
+            return {}
+        duplicate_key = self.result_cache.make_key_from_digest(
+            duplicate["digest"], selected_options, self.resume_analyzer.cache_settings()
+        )
+        cached = await self.result_cache.aget(duplicate_key)
+        if cached is None:
+            return {}
+        sections = {section: value for section, value in cached.items() if section not in PERSONAL_SECTIONS}
+        logger.info(f"Reusing {list(sections)} from near duplicate {duplicate['digest'][:12]}")
+        return sections
+
+    def _plan_revision(self, text: str, selected_options: list, document_id: Optional[str]) -> tuple:
+        """Identify the document and the sections an earlier version already answered.
+
+        Cleaning, the contact scan and the segmenter pass are CPU work, so
+        callers run this in a thread. Returns (document key, section
+        fingerprints, reusable section results).
+        """
+        if not self.revision_store.enabled:
+            return None, {}, {}
+        
+        analyzer = self.resume_analyzer
+        cleaned_text = analyzer.text_processor.clean_text(text)
+        revision_key = self.revision_store.document_key(
+            document_id, analyzer.text_processor.extract_contact_info(cleaned_text)
+        )
+        if revision_key is None:
+            return None, {}, {}
+        
+        fingerprints = analyzer.section_fingerprints(cleaned_text)
+        reused = self.revision_store.reusable_sections(
+            revision_key, analyzer.cache_settings(), fingerprints, selected_options
+        )
+        return revision_key, fingerprints, reused
+
+    def _record_revision(self, revision_key: Optional[str], fingerprints: dict, analysis: dict):
+        self.revision_store.record(revision_key, self.resume_analyzer.cache_settings(), fingerprints, analysis)
+
+    def _is_cacheable(self, analysis: dict) -> bool:
+        """Do not cache results that contain extraction errors"""
+        for value in analysis.values():
+            values = value.values() if isinstance(value, dict) else [value]
+            if any(isinstance(v, str) and v.startswith("Error extracting") for v in values):
+                return False
+        return True
@@ -0,0 +1,117 @@
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class RevisionStore:
+    """Latest analysis of each known document, used to re-analyze only what a new version changed.
+
+    A document is identified by the caller's document_id, or else by the
+    email address or phone number found in it. Each entry keeps the section
+    results of the last version together with a fingerprint of the text each
+    section was extracted from; sections whose fingerprint is unchanged in
+    the next version are reused as they are. Entries hold personal data, so
+    they live in a bounded in-memory LRU only and expire after a TTL.
+    """
+
+    def __init__(self, max_documents: int = None, ttl_seconds: int = None):
+        self.enabled = os.getenv("INCREMENTAL_ANALYSIS_ENABLED", "true").lower() == "true"
+        self.max_documents = max_documents if max_documents is not None else int(os.getenv("REVISION_STORE_MAX_DOCUMENTS", "1024"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv("REVISION_STORE_TTL_SECONDS", "86400"))
+
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.revisions = 0
+        self.sections_reused = 0
+        self.sections_rerun = 0
+
+    @staticmethod
+    def document_key(document_id: Optional[str], contact_info: dict) -> Optional[str]:
+        """Identity of a document: the explicit id, else its email, else its phone number"""
+        if document_id:
+            return f"id:{document_id.strip()}"
+        email = contact_info.get("email")
+        if email and "@" in email:
+            return f"email:{email.strip().lower()}"
+        phone = re.sub(r"\D", "", contact_info.get("phone") or "")
+        # The last ten digits, so "+91 98765 43210" and "9876543210" match
+        if len(phone) >= 7:
+            return f"phone:{phone[-10:]}"
+        return None
+
+    def reusable_sections(self, key: Optional[str], settings: dict, fingerprints: dict, options: list) -> dict:
+        """Results from the previous version for selected sections whose source text is unchanged"""
+        if not self.enabled or key is None:
+            return {}
+
+        now = time.time()
+        with self._lock:
+            self.lookups += 1
+            entry = self._documents.get(key)
+            if entry is None:
+                return {}
+            if entry["expires_at"] <= now:
+                del self._documents[key]
+                return {}
+            self._documents.move_to_end(key)
+            # Results from other models or extraction settings are not comparable
+            if entry["settings"] != settings:
+                return {}
+
+            reused = {
+                section: entry["results"][section] for section in options
+                if section in entry["results"]
+                and fingerprints.get(section) is not None
+                and entry["fingerprints"].get(section) == fingerprints[section]
+            }
+            self.revisions += 1
+            self.sections_reused += len(reused)
+            self.sections_rerun += len([section for section in options if section not in reused])
+
+        logger.info(f"Known document, reusing {len(reused)} unchanged sections: {list(reused)}")
+        return reused
+
+    def record(self, key: Optional[str], settings: dict, fingerprints: dict, results: dict):
+        """Store the latest version of a document"""
+        if not self.enabled or key is None:
+            return
+
+        with self._lock:
+            previous = self._documents.get(key)
+            merged = {}
+            # Sections not selected this time stay reusable while their text is unchanged
+            if previous is not None and previous["settings"] == settings:
+                merged = {
+                    section: value for section, value in previous["results"].items()
+                    if previous["fingerprints"].get(section) == fingerprints.get(section)
+                }
+            merged.update(results)
+            self._documents[key] = {
+                "settings": settings,
+                "fingerprints": fingerprints,
+                "results": merged,
+                "expires_at": time.time() + self.ttl_seconds,
+            }
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return revision and section reuse counters"""
+        with self._lock:
+            sections = self.sections_reused + self.sections_rerun
+            return {
+                "enabled": self.enabled,
+                "documents": len(self._documents),
+                "lookups": self.lookups,
+                "revisions": self.revisions,
+                "sections_reused": self.sections_reused,
+                "sections_rerun": self.sections_rerun,
+                "reuse_ratio": round(self.sections_reused / sections, 4) if sections else 0.0,
+            }
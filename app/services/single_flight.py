@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import threading
+from typing import Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight computation.
+
+    The first caller for a key (the leader) runs the work in a task; callers
+    arriving while it runs (followers) wait for that task and receive the same
+    result or exception. Nothing is kept once the task finishes, so errors
+    are not remembered and the next call starts fresh.
+
+    A follower that is cancelled only stops waiting. The work uses the
+    leader's input, so when the leader is cancelled the task is cancelled
+    with it and the remaining followers start over, one of them as the new
+    leader.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.restarted = 0
+        self.errors = 0
+
+    async def do(self, key: str, work: Callable[[], Awaitable]):
+        """Return the result of work(), shared with concurrent calls for the same key"""
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                return await self._lead(key, work)
+
+            logger.info(f"Joining in-flight computation for {key[:12]}")
+            try:
+                await asyncio.shield(call)
+            except asyncio.CancelledError:
+                # Restart only when the leader went away, not when this caller is cancelled
+                if not call.cancelled() or _cancel_requested():
+                    raise
+                with self._lock:
+                    self.restarted += 1
+                logger.info(f"In-flight computation for {key[:12]} was cancelled, restarting")
+                continue
+            except Exception:
+                pass
+            # Counted once the shared outcome is delivered, so restarts are not counted twice
+            with self._lock:
+                self.coalesced += 1
+            return call.result()
+
+    async def _lead(self, key: str, work: Callable[[], Awaitable]):
+        call = asyncio.ensure_future(work())
+        self._calls[key] = call
+        call.add_done_callback(lambda done: self._finish(key, done))
+        with self._lock:
+            self.leaders += 1
+        # Awaiting the task directly cancels it when the leader is cancelled
+        return await call
+
+    def _finish(self, key: str, call: asyncio.Task):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled() and call.exception() is not None:
+            with self._lock:
+                self.errors += 1
+
+    def stats(self) -> dict:
+        """Return counters of computations run and calls that shared one"""
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "restarted": self.restarted,
+                "errors": self.errors,
+                "saved_ratio": round(self.coalesced / calls, 4) if calls else 0.0,
+            }
+
+def _cancel_requested() -> bool:
+    """Whether the current task itself has a pending cancellation (Python 3.11+)"""
+    task = asyncio.current_task()
+    return bool(task is not None and hasattr(task, "cancelling") and task.cancelling())
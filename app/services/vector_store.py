@@ -0,0 +1,166 @@
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+import logging
+import uuid
+
+import numpy as np
+from langchain.callbacks.manager import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain.schema import BaseRetriever, Document
+from langchain.schema.embeddings import Embeddings
+from langchain.schema.vectorstore import VectorStore
+
+logger = logging.getLogger(__name__)
+
+class InMemoryVectorStore(VectorStore):
+    """Vector store backed by NumPy arrays that lives only in process memory.
+
+    One instance is created per analysis, so nothing is written to disk and
+    the whole index is released with the object once the request finishes.
+    """
+
+    def __init__(self, embedding: Embeddings):
+        self._embedding = embedding
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[dict] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed texts and add them to the index"""
+        texts = list(texts)
+        if not texts:
+            return []
+        vectors = self._embedding.embed_documents(texts)
+        return self.add_embeddings(texts, vectors, metadatas)
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        vectors: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        """Add texts whose embeddings have already been computed"""
+        if len(texts) != len(vectors):
+            raise ValueError("Number of texts and embeddings must match")
+        if not texts:
+            return []
+
+        matrix = self._normalize(np.asarray(vectors, dtype=np.float32))
+        if self._matrix is None:
+            self._matrix = matrix
+        else:
+            self._matrix = np.vstack([self._matrix, matrix])
+
+        ids = [str(uuid.uuid4()) for _ in texts]
+        self._ids.extend(ids)
+        self._texts.extend(texts)
+        self._metadatas.extend(metadatas or [{} for _ in texts])
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete the given ids, or everything when no ids are passed"""
+        if ids is None:
+            self._ids, self._texts, self._metadatas = [], [], []
+            self._matrix = None
+            return True
+
+        drop = set(ids)
+        keep = [i for i, doc_id in enumerate(self._ids) if doc_id not in drop]
+        self._ids = [self._ids[i] for i in keep]
+        self._texts = [self._texts[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._matrix = self._matrix[keep] if keep and self._matrix is not None else None
+        return True
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Return the k most similar documents with their cosine similarity"""
+        if self._matrix is None or k <= 0:
+            return []
+
+        query = self._normalize(np.asarray(embedding, dtype=np.float32).reshape(1, -1))[0]
+        scores = self._matrix @ query
+        k = min(k, len(scores))
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+
+        return [
+            (
+                Document(page_content=self._texts[i], metadata=dict(self._metadatas[i])),
+                float(scores[i]),
+            )
+            for i in top
+        ]
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        embedding = self._embedding.embed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Map cosine similarity from [-1, 1] onto [0, 1]
+        return lambda score: (score + 1.0) / 2.0
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> "InMemoryVectorStore":
+        store = cls(embedding)
+        store.add_texts(texts, metadatas)
+        return store
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+class WholeDocumentRetriever(BaseRetriever):
+    """Retriever that returns the whole text as one document for every query.
+
+    Used for resumes that fit in the model context, where retrieval would
+    select nearly every chunk anyway; nothing is embedded or indexed.
+    """
+
+    text: str
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return [Document(page_content=self.text)]
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return [Document(page_content=self.text)]
@@ -0,0 +1,161 @@
+import os
+import re
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = r'(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}'
+
+# Profile URL patterns by field name; each must start with a literal character
+PROFILE_PATTERNS = {
+    'linkedin': r'linkedin\.com/(?:in|profile)/[\w-]+/?',
+    'github': r'github\.com/[\w-]+/?',
+}
+
+def _format_in(match: str) -> Optional[str]:
+    digits = ''.join(c for c in match if c.isdigit() or c == '+')
+    if digits.startswith('+91'):
+        return f"+91-{digits[3:8]}-{digits[8:]}"
+    if digits.startswith('91') and len(digits) == 12:
+        return f"+91-{digits[2:7]}-{digits[7:]}"
+    if len(digits) == 10:
+        return f"{digits[:5]}-{digits[5:]}"
+    return None
+
+def _format_us(match: str) -> Optional[str]:
+    digits = ''.join(c for c in match if c.isdigit())
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    if len(digits) != 10:
+        return None
+    return f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+
+def _format_international(match: str) -> Optional[str]:
+    digits = ''.join(c for c in match if c.isdigit())
+    if not 8 <= len(digits) <= 15:
+        return None
+    return f"+{digits}"
+
+# Phone patterns per country, most specific first. Each entry is (regex, formatter);
+# the formatter returns None to reject a match. Every pattern must start with a
+# digit, "+" or "(" so the scanner can skip ahead to candidate positions.
+PHONE_START_CHARS = r'\d+('
+PHONE_PATTERNS: Dict[str, List[Tuple[str, Callable[[str], Optional[str]]]]] = {
+    'IN': [
+        (r'\+91[-\s]*\d{5}[-\s]*\d{5}', _format_in),
+        (r'\b91[-\s]*\d{10}\b', _format_in),
+        (r'\b\d{5}[-\s]*\d{5}\b', _format_in),
+    ],
+    'US': [
+        (r'(?:\+1[-.\s]?)?\(?\b\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', _format_us),
+    ],
+    'INTL': [
+        (r'\+\d{1,3}[-\s]?\d[\d\s-]{6,14}\d', _format_international),
+    ],
+}
+
+def register_phone_patterns(country: str, patterns: List[Tuple[str, Callable[[str], Optional[str]]]]):
+    """Add or replace the phone patterns for a country code"""
+    PHONE_PATTERNS[country.upper()] = list(patterns)
+    get_contact_scanner.cache_clear()
+
+class ContactScanner:
+    """Finds emails, phone numbers and profile URLs in a single pass over the text.
+
+    All patterns are combined into one compiled alternation with a named group
+    per pattern, guarded by a lookahead on the characters they can start with. For each field the match from the highest-priority pattern
+    wins, and among equal priorities the earliest one in the text.
+    """
+
+    def __init__(self, countries: Tuple[str, ...] = ('IN',)):
+        self.countries = countries
+        self._formatters = {}
+        self._priorities = {}
+        self._fields = {}
+        self._field_count = 2 + len(PROFILE_PATTERNS)
+        self._email = re.compile(EMAIL_PATTERN, re.IGNORECASE)
+
+        # Emails are anchored on "@" and expanded around it, which is much
+        # cheaper than trying the local part at every word character
+        alternatives = ["(?P<email>@)"]
+        self._fields['email'] = 'email'
+        self._priorities['email'] = 0
+
+        start_chars = {'@'}
+        for field, pattern in PROFILE_PATTERNS.items():
+            start_chars.add(re.escape(pattern[0]))
+            alternatives.append(f"(?P<{field}>{pattern})")
+            self._fields[field] = field
+            self._priorities[field] = 0
+
+        priority = 0
+        for country in countries:
+            for pattern, formatter in PHONE_PATTERNS.get(country.upper(), []):
+                group = f"phone_{priority}"
+                alternatives.append(f"(?P<{group}>{pattern})")
+                self._fields[group] = 'phone'
+                self._priorities[group] = priority
+                self._formatters[group] = formatter
+                priority += 1
+
+        # The lookahead lets the regex engine skip positions no pattern can start at
+        guard = "[" + "".join(sorted(start_chars)) + PHONE_START_CHARS + "]"
+        self._regex = re.compile(f"(?={guard})(?:{'|'.join(alternatives)})", re.IGNORECASE)
+
+    def scan(self, text: str) -> dict:
+        """Return the best email, phone and profile URLs found, or None per field"""
+        best = {}
+        pos = 0
+        while True:
+            match = self._regex.search(text, pos)
+            if match is None:
+                break
+            pos = match.end()
+            group = match.lastgroup
+            field = self._fields[group]
+            priority = self._priorities[group]
+            if field in best and best[field][0] <= priority:
+                continue
+
+            if field == 'email':
+                email = self._match_email(text, match.start())
+                if email is None:
+                    continue
+                value = email.group(0)
+                pos = email.end()
+            elif field in PROFILE_PATTERNS:
+                value = "https://www." + match.group(group).lower()
+            else:
+                # Digits in the local part of an email are not a phone number
+                if text.startswith('@', match.end()):
+                    continue
+                value = self._formatters[group](match.group(group))
+                if value is None:
+                    continue
+
+            best[field] = (priority, value)
+            # Stop early once every field has its highest-priority match
+            if len(best) == self._field_count and all(p == 0 for p, _ in best.values()):
+                break
+
+        result = {field: None for field in ['email', 'phone', *PROFILE_PATTERNS]}
+        result.update({field: value for field, (_, value) in best.items()})
+        return result
+
+    def _match_email(self, text: str, at: int):
+        """Match a full email address around the "@" at the given index"""
+        start = at
+        while start > 0 and (text[start - 1].isalnum() or text[start - 1] in "._+-"):
+            start -= 1
+        match = self._email.match(text, start)
+        return match if match and match.end() > at else None
+
+@lru_cache(maxsize=None)
+def get_contact_scanner(countries: Tuple[str, ...] = None) -> ContactScanner:
+    """Shared scanner for the given countries (CONTACT_PHONE_COUNTRIES by default), compiled once"""
+    if countries is None:
+        configured = os.getenv("CONTACT_PHONE_COUNTRIES", "IN")
+        countries = tuple(code.strip().upper() for code in configured.split(",") if code.strip())
+    return ContactScanner(countries)
@@ -0,0 +1,90 @@
+import os
+import asyncio
+import logging
+import contextvars
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+# "process" runs document parsing in worker processes, "thread" in a thread pool
+PARSING_EXECUTOR = os.getenv("PARSING_EXECUTOR", "process").lower()
+PARSING_WORKERS = int(os.getenv("PARSING_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Embedding runs in threads so every worker shares the model loaded at startup. With
+# batching the threads mostly wait for the batcher, which runs the model alone.
+EMBEDDING_BATCHING = os.getenv("EMBEDDING_BATCHING", "true").lower() == "true"
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "8" if EMBEDDING_BATCHING else "2"))
+# OCR rasterizes and recognizes one page per task in worker processes
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_parsing_executor = None
+_embedding_executor = None
+_ocr_executor = None
+
+def get_parsing_executor() -> Executor:
+    """Return the shared executor for CPU-bound document parsing"""
+    global _parsing_executor
+    if _parsing_executor is None:
+        if PARSING_EXECUTOR == "process":
+            # Spawn avoids forking a parent that already holds torch/tokenizer threads
+            _parsing_executor = ProcessPoolExecutor(
+                max_workers=PARSING_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _parsing_executor = ThreadPoolExecutor(
+                max_workers=PARSING_WORKERS,
+                thread_name_prefix="parsing"
+            )
+        logger.info(f"Started {PARSING_EXECUTOR} parsing pool with {PARSING_WORKERS} workers")
+    return _parsing_executor
+
+def get_embedding_executor() -> Executor:
+    """Return the dedicated thread pool for embedding and vector store builds"""
+    global _embedding_executor
+    if _embedding_executor is None:
+        _embedding_executor = ThreadPoolExecutor(
+            max_workers=EMBEDDING_WORKERS,
+            thread_name_prefix="embedding"
+        )
+        logger.info(f"Started embedding pool with {EMBEDDING_WORKERS} workers")
+    return _embedding_executor
+
+def get_ocr_executor() -> Executor:
+    """Return the process pool for page OCR, created the first time a scanned page shows up"""
+    global _ocr_executor
+    if _ocr_executor is None:
+        _ocr_executor = ProcessPoolExecutor(
+            max_workers=OCR_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"Started OCR pool with {OCR_WORKERS} workers")
+    return _ocr_executor
+
+async def run_in_parsing_pool(func, *args, **kwargs):
+    """Run a picklable parsing function off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parsing_executor(), partial(func, *args, **kwargs))
+
+async def run_in_embedding_pool(func, *args, **kwargs):
+    """Run an embedding-heavy function off the event loop"""
+    loop = asyncio.get_running_loop()
+    # Carry the caller's context into the thread, e.g. the request's metric labels
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_embedding_executor(), partial(context.run, func, *args, **kwargs))
+
+def start_executors():
+    """Create the pools up front so the first request does not pay for it"""
+    get_parsing_executor()
+    get_embedding_executor()
+
+def shutdown_executors():
+    """Shut down the pools, waiting for running tasks to finish"""
+    global _parsing_executor, _embedding_executor, _ocr_executor
+    for executor in (_parsing_executor, _embedding_executor, _ocr_executor):
+        if executor is not None:
+            executor.shutdown(wait=True)
+    _parsing_executor = None
+    _embedding_executor = None
+    _ocr_executor = None
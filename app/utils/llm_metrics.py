@@ -0,0 +1,70 @@
+import os
+import time
+import logging
+
+from langchain.callbacks.base import BaseCallbackHandler
+
+from app.utils.metrics import LLM_CALL_SECONDS, LLM_CALLS, LLM_COST, LLM_TOKENS, current_labels
+
+logger = logging.getLogger(__name__)
+
+# USD per 1K prompt and completion tokens, overridable for other models or price changes
+LLM_PRICES_PER_1K = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+}
+LLM_PROMPT_PRICE_PER_1K = os.getenv("LLM_PROMPT_PRICE_PER_1K")
+LLM_COMPLETION_PRICE_PER_1K = os.getenv("LLM_COMPLETION_PRICE_PER_1K")
+
+def llm_prices(model: str):
+    """(prompt, completion) USD per 1K tokens for a model"""
+    prompt, completion = LLM_PRICES_PER_1K.get(model, (0.0, 0.0))
+    if LLM_PROMPT_PRICE_PER_1K:
+        prompt = float(LLM_PROMPT_PRICE_PER_1K)
+    if LLM_COMPLETION_PRICE_PER_1K:
+        completion = float(LLM_COMPLETION_PRICE_PER_1K)
+    return prompt, completion
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """LangChain callback recording latency, tokens and estimated cost of every LLM call"""
+
+    # Run in the caller's context so the request labels are visible
+    run_inline = True
+
+    def __init__(self, model: str):
+        self.model = model
+        self._started = {}
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._observe_latency(run_id)
+        LLM_CALLS.labels(self.model, "ok").inc()
+
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        if prompt_tokens:
+            LLM_TOKENS.labels(self.model, "prompt").inc(prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS.labels(self.model, "completion").inc(completion_tokens)
+
+        prompt_price, completion_price = llm_prices(self.model)
+        cost = (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+        if cost:
+            LLM_COST.labels(self.model).inc(cost)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._observe_latency(run_id)
+        LLM_CALLS.labels(self.model, "error").inc()
+
+    def _observe_latency(self, run_id):
+        start = self._started.pop(run_id, None)
+        if start is not None:
+            file_type, options = current_labels()
+            LLM_CALL_SECONDS.labels(self.model, file_type, options).observe(time.perf_counter() - start)
@@ -0,0 +1,108 @@
+import os
+import time
+import logging
+import contextvars
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+logger = logging.getLogger(__name__)
+
+# Option names allowed as label values; anything else is reported as "other"
+KNOWN_OPTIONS = ('contact_info', 'personal_info', 'education', 'experience', 'skills', 'summary')
+KNOWN_FILE_TYPES = ('pdf', 'docx', 'zip')
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+STAGE_SECONDS = Histogram(
+    "resume_stage_seconds", "Time spent in each pipeline stage",
+    ["stage", "file_type", "options"], buckets=STAGE_BUCKETS
+)
+LLM_CALL_SECONDS = Histogram(
+    "resume_llm_call_seconds", "Latency of each LLM call",
+    ["model", "file_type", "options"], buckets=LLM_BUCKETS
+)
+LLM_CALLS = Counter("resume_llm_calls_total", "LLM calls by outcome", ["model", "outcome"])
+LLM_TOKENS = Counter("resume_llm_tokens_total", "LLM tokens used", ["model", "type"])
+LLM_COST = Counter("resume_llm_cost_usd_total", "Estimated LLM cost in USD", ["model"])
+LLM_RETRIES = Counter("resume_llm_retries_total", "LLM API attempts that were retried", ["model", "reason"])
+LLM_THROTTLE_SECONDS = Counter(
+    "resume_llm_throttle_seconds_total", "Time LLM calls waited for the client-side rate limiter", ["model"]
+)
+EMBEDDING_BATCH_TEXTS = Histogram(
+    "resume_embedding_batch_texts", "Texts per batched embedding model call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+REQUESTS = Counter(
+    "resume_requests_total", "Resume requests by outcome",
+    ["endpoint", "file_type", "options", "outcome"]
+)
+REQUEST_SECONDS = Histogram(
+    "resume_request_seconds", "End-to-end request latency",
+    ["endpoint", "file_type", "options"], buckets=STAGE_BUCKETS
+)
+
+# Labels of the request being processed, inherited by the tasks it starts
+_request_labels = contextvars.ContextVar("request_labels", default=("unknown", "unknown"))
+
+def file_type_label(filename: str) -> str:
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    return extension if extension in KNOWN_FILE_TYPES else "other"
+
+def options_label(options: list) -> str:
+    """Sorted, comma separated option names, so the label has a bounded set of values"""
+    if not isinstance(options, list):
+        return "other"
+    names = sorted({option if option in KNOWN_OPTIONS else "other" for option in options})
+    return ",".join(names) or "none"
+
+def set_request_labels(filename: str, options: list):
+    """Label the metrics recorded by the current request; returns a token for reset_request_labels"""
+    return _request_labels.set((file_type_label(filename), options_label(options)))
+
+def reset_request_labels(token):
+    _request_labels.reset(token)
+
+def current_labels() -> tuple:
+    """(file_type, options) labels of the request being processed"""
+    return _request_labels.get()
+
+def observe_stage(stage: str, seconds: float):
+    file_type, options = current_labels()
+    STAGE_SECONDS.labels(stage, file_type, options).observe(seconds)
+
+@contextmanager
+def stage_timer(stage: str):
+    """Record how long the enclosed block takes as one pipeline stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+def record_request(endpoint: str, filename: str, options: list, outcome: str, seconds: float):
+    file_type, options = file_type_label(filename), options_label(options)
+    REQUESTS.labels(endpoint, file_type, options, outcome).inc()
+    REQUEST_SECONDS.labels(endpoint, file_type, options).observe(seconds)
+
+@contextmanager
+def track_request(endpoint: str, filename: str, options: list):
+    """Label the request's metrics and count its outcome: ok, rejected (4xx) or error"""
+    token = set_request_labels(filename, options)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except Exception as e:
+        if getattr(e, "status_code", 500) < 500:
+            outcome = "rejected"
+        raise
+    finally:
+        record_request(endpoint, filename, options, outcome, time.perf_counter() - start)
+        reset_request_labels(token)
+
+def render_metrics():
+    """Prometheus text exposition of every metric, with its content type"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,226 @@
+import os
+import time
+import uuid
+import shutil
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from app.utils.metrics import stage_timer
+
+logger = logging.getLogger(__name__)
+
+# Directory for temporary artifacts such as spilled uploads
+SCRATCH_DIR = os.getenv("SCRATCH_DIR", "temp")
+# Put scratch data on a memory-backed filesystem (/dev/shm) when available
+SCRATCH_TMPFS = os.getenv("SCRATCH_TMPFS", "false").lower() == "true"
+TMPFS_ROOT = "/dev/shm"
+# Bytes this process may keep in scratch files at once
+SCRATCH_QUOTA_MB = int(os.getenv("SCRATCH_QUOTA_MB", "512"))
+# Artifacts older than this are treated as leaked and removed by the sweeper
+SCRATCH_MAX_AGE_SECONDS = int(os.getenv("SCRATCH_MAX_AGE_SECONDS", "3600"))
+SCRATCH_SWEEP_INTERVAL_SECONDS = int(os.getenv("SCRATCH_SWEEP_INTERVAL_SECONDS", "300"))
+# Per-request Chroma databases written by earlier versions
+LEGACY_TEMP_DBS_DIR = "temp_dbs"
+LEGACY_TEMP_DBS_MAX_AGE_SECONDS = 24 * 3600
+
+class ScratchQuotaExceeded(OSError):
+    """Raised when writing a scratch file would exceed SCRATCH_QUOTA_MB"""
+
+class ScratchFile:
+    """Binary scratch file whose writes are counted against the quota"""
+
+    def __init__(self, space: "ScratchSpace", path: str):
+        self.space = space
+        self.path = path
+        self.size = 0
+        self._file = open(path, "wb")
+
+    def write(self, data: bytes):
+        self.space._charge(self.path, len(data))
+        self._file.write(data)
+        self.size += len(data)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        """Close and delete the file, returning its bytes to the quota"""
+        if not self._file.closed:
+            self._file.close()
+        self.space.release(self.path)
+
+class ScratchSpace:
+    """Hands out temporary files and directories and keeps track of every one of them.
+
+    Artifacts are released deterministically by their context managers (or
+    release()), and a single periodic sweep removes the ones that leaked,
+    leftovers from earlier processes and old legacy Chroma directories,
+    instead of scanning on every request.
+    """
+
+    def __init__(self, root: str = None, quota_bytes: int = None, max_age_seconds: int = None,
+                 use_tmpfs: bool = None):
+        use_tmpfs = SCRATCH_TMPFS if use_tmpfs is None else use_tmpfs
+        root = root or SCRATCH_DIR
+        if use_tmpfs:
+            if os.path.isdir(TMPFS_ROOT) and os.access(TMPFS_ROOT, os.W_OK):
+                root = os.path.join(TMPFS_ROOT, f"resume-parser-{os.path.basename(os.path.abspath(root))}")
+            else:
+                logger.warning(f"{TMPFS_ROOT} is not available, keeping scratch data in {root}")
+                use_tmpfs = False
+        self.root = root
+        self.tmpfs = use_tmpfs
+        self.quota_bytes = quota_bytes if quota_bytes is not None else SCRATCH_QUOTA_MB * 1024 * 1024
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else SCRATCH_MAX_AGE_SECONDS
+
+        # Tracked artifacts by path: (created_at, bytes charged)
+        self._artifacts: Dict[str, list] = {}
+        self._used_bytes = 0
+        self._lock = threading.Lock()
+        self.quota_rejections = 0
+        self.swept = 0
+
+    def create_file(self, suffix: str = "") -> ScratchFile:
+        """Create a tracked scratch file; the caller must close() it"""
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, f"{uuid.uuid4().hex}{suffix}")
+        self._track(path)
+        try:
+            return ScratchFile(self, path)
+        except Exception:
+            self.release(path)
+            raise
+
+    @contextmanager
+    def file(self, suffix: str = ""):
+        """Scratch file that is deleted when the block exits"""
+        scratch_file = self.create_file(suffix)
+        try:
+            yield scratch_file
+        finally:
+            scratch_file.close()
+
+    @contextmanager
+    def directory(self, prefix: str = ""):
+        """Scratch directory, with everything in it, deleted when the block exits"""
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, f"{prefix}{uuid.uuid4().hex}")
+        self._track(path)
+        os.makedirs(path)
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def release(self, path: str):
+        """Delete a tracked artifact and return its bytes to the quota; safe to call twice"""
+        with self._lock:
+            artifact = self._artifacts.pop(path, None)
+            if artifact is not None:
+                self._used_bytes -= artifact[1]
+        self._remove(path)
+
+    def sweep(self) -> int:
+        """Remove leaked and orphaned artifacts and old legacy Chroma directories; returns the count"""
+        with stage_timer("cleanup"):
+            now = time.time()
+            removed = 0
+            with self._lock:
+                leaked = [path for path, (created, _) in self._artifacts.items()
+                          if now - created > self.max_age_seconds]
+            for path in leaked:
+                logger.warning(f"Removing scratch artifact that was never released: {path}")
+                self.release(path)
+                removed += 1
+
+            # Leftovers from earlier processes are not tracked here
+            removed += self._sweep_untracked(self.root, self.max_age_seconds, now)
+            removed += self._sweep_untracked(LEGACY_TEMP_DBS_DIR, LEGACY_TEMP_DBS_MAX_AGE_SECONDS, now)
+
+            with self._lock:
+                self.swept += removed
+            if removed:
+                logger.info(f"Scratch sweep removed {removed} artifacts")
+            return removed
+
+    async def run_sweeper(self, interval_seconds: int = SCRATCH_SWEEP_INTERVAL_SECONDS):
+        """Sweep periodically until cancelled"""
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.error(f"Error during scratch sweep: {str(e)}")
+            await asyncio.sleep(interval_seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "root": self.root,
+                "tmpfs": self.tmpfs,
+                "artifacts": len(self._artifacts),
+                "used_bytes": self._used_bytes,
+                "quota_bytes": self.quota_bytes,
+                "quota_rejections": self.quota_rejections,
+                "swept": self.swept,
+            }
+
+    def _track(self, path: str):
+        with self._lock:
+            self._artifacts[path] = [time.time(), 0]
+
+    def _charge(self, path: str, nbytes: int):
+        with self._lock:
+            if self._used_bytes + nbytes > self.quota_bytes:
+                self.quota_rejections += 1
+                raise ScratchQuotaExceeded(
+                    f"Scratch space quota of {self.quota_bytes} bytes exceeded"
+                )
+            self._used_bytes += nbytes
+            artifact = self._artifacts.get(path)
+            if artifact is not None:
+                artifact[1] += nbytes
+
+    def _sweep_untracked(self, directory: str, max_age_seconds: int, now: float) -> int:
+        if not os.path.isdir(directory):
+            return 0
+        with self._lock:
+            tracked = set(self._artifacts)
+        removed = 0
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if path in tracked:
+                continue
+            try:
+                if now - os.path.getmtime(path) > max_age_seconds:
+                    self._remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def _remove(self, path: str):
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error removing scratch artifact {path}: {str(e)}")
+
+_scratch: Optional[ScratchSpace] = None
+_scratch_lock = threading.Lock()
+
+def get_scratch() -> ScratchSpace:
+    """Return the process-wide scratch space, configured from the environment"""
+    global _scratch
+    if _scratch is None:
+        with _scratch_lock:
+            if _scratch is None:
+                _scratch = ScratchSpace()
+                logger.info(f"Scratch space at {_scratch.root} (quota {_scratch.quota_bytes} bytes)")
+    return _scratch
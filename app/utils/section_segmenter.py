@@ -0,0 +1,259 @@
+import re
+import logging
+from typing import Dict, List, Tuple
+
+from app.utils.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+# Heading phrases for each section the segmenter can fill
+SECTION_HEADINGS = {
+    'summary': [
+        'summary', 'professional summary', 'career summary', 'executive summary', 'profile',
+        'professional profile', 'career profile', 'objective', 'career objective', 'about me',
+    ],
+    'education': [
+        'education', 'academic background', 'academic qualifications', 'educational qualifications',
+        'educational background', 'qualifications', 'academics',
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment history',
+        'work history', 'employment', 'career history', 'relevant experience',
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'core competencies',
+        'competencies', 'skill set', 'skillset', 'technologies', 'tools and technologies',
+    ],
+}
+
+# Headings that are not extracted but mark where the previous section ends
+OTHER_HEADINGS = [
+    'projects', 'personal projects', 'academic projects', 'certifications', 'certificates',
+    'awards', 'achievements', 'honors', 'publications', 'languages', 'interests', 'hobbies',
+    'references', 'volunteering', 'volunteer experience', 'personal details', 'personal information',
+    'contact', 'contact information', 'declaration', 'training', 'courses', 'activities',
+]
+
+MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+DATE_RANGE_PATTERN = re.compile(
+    rf'(?:{MONTH}\s*)?(?:\d{{1,2}}/)?(?:19|20)\d{{2}}\s*(?:-|–|—|to)\s*'
+    rf'(?:(?:{MONTH}\s*)?(?:\d{{1,2}}/)?(?:19|20)\d{{2}}|present|current|now|till date|date)',
+    re.IGNORECASE
+)
+DEGREE_PATTERN = re.compile(
+    r'\b(?:b\.?\s?tech|m\.?\s?tech|b\.?\s?e|m\.?\s?e|b\.?\s?sc|m\.?\s?sc|b\.?\s?com|m\.?\s?com|b\.?\s?a|m\.?\s?a|'
+    r'bachelor|master|mba|bba|bca|mca|ph\.?\s?d|diploma|degree|university|college|institute|school|'
+    r'cgpa|gpa|hsc|ssc)\b',
+    re.IGNORECASE
+)
+LOCATION_LABEL_PATTERN = re.compile(r'^(?:location|address|city|based in)\s*[:\-–]\s*(.+)$', re.IGNORECASE)
+NAME_LABEL_PATTERN = re.compile(r'^name\s*[:\-–]\s*(.+)$', re.IGNORECASE)
+# "City, State" or "City, Country" on its own, e.g. "Bengaluru, Karnataka"
+PLACE_PATTERN = re.compile(r"^[A-Z][A-Za-z .'-]+,\s*[A-Z][A-Za-z .'-]+(?:,\s*[A-Z][A-Za-z .'-]+)?$")
+NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?:\s+[A-Za-z][A-Za-z.'-]*){1,3}$")
+BULLET_PATTERN = re.compile(r'^[•●▪◦*\-–>]+\s*')
+# Words that mean a header line is a title, not the person's name
+NOT_A_NAME_PATTERN = re.compile(
+    r'\b(?:resume|curriculum|vitae|cv|engineer|developer|manager|analyst|consultant|designer|'
+    r'architect|intern|student|scientist|lead|director|specialist|administrator)\b',
+    re.IGNORECASE
+)
+
+class SectionSegmenter:
+    """Rule-based resume segmenter: finds section headings and extracts each section heuristically.
+
+    Every result carries a confidence between 0 and 1 so callers can send only
+    the sections the rules are unsure about to the LLM.
+    """
+
+    def __init__(self, text_processor: TextProcessor = None):
+        self.text_processor = text_processor or TextProcessor()
+
+        self._heading_sections = {}
+        for section, phrases in SECTION_HEADINGS.items():
+            for phrase in phrases:
+                self._heading_sections[phrase] = section
+        for phrase in OTHER_HEADINGS:
+            self._heading_sections[phrase] = None
+
+        # Longest phrases first so "work experience" wins over "experience"
+        phrases = sorted(self._heading_sections, key=len, reverse=True)
+        alternation = "|".join(re.escape(phrase).replace(r'\ ', r'\s+') for phrase in phrases)
+        self._heading_pattern = re.compile(
+            rf'^(?:[#•*\-]\s*)?(?P<heading>{alternation})(?:\s+(?:&|and)\s+[A-Za-z ]{{3,30}})?'
+            rf'\s*(?:[:\-–|]\s*(?P<rest>.*))?$',
+            re.IGNORECASE
+        )
+
+        self._extractors = {
+            'personal_info': self._extract_personal_info,
+            'education': self._extract_education,
+            'experience': self._extract_experience,
+            'skills': self._extract_skills,
+            'summary': self._extract_summary,
+        }
+
+    def segment(self, text: str, sections: List[str]) -> Dict[str, dict]:
+        """Return {"value", "confidence"} for each requested section; missing sections get confidence 0"""
+        try:
+            header, bodies = self.split_sections(self.text_processor.clean_text(text))
+            results = {}
+            for section in sections:
+                extractor = self._extractors.get(section)
+                if extractor is None:
+                    continue
+                lines = header if section == 'personal_info' else bodies.get(section)
+                if not lines:
+                    results[section] = {"value": None, "confidence": 0.0}
+                    continue
+                value, confidence = extractor(lines)
+                results[section] = {"value": value, "confidence": round(min(confidence, 1.0), 2)}
+
+            logger.debug(f"Segmenter confidences: { {s: r['confidence'] for s, r in results.items()} }")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error segmenting resume: {str(e)}")
+            raise
+
+    def split_sections(self, text: str) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Split cleaned text into the lines before the first heading and the lines under each known section"""
+        header = []
+        bodies = {}
+        current = None
+        seen_heading = False
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            heading = self._match_heading(line)
+            if heading is not None:
+                section, rest = heading
+                seen_heading = True
+                current = section
+                # A repeated heading continues the first block of that section
+                if section is not None:
+                    bodies.setdefault(section, [])
+                    if rest:
+                        bodies[section].append(rest)
+                continue
+
+            if not seen_heading:
+                header.append(line)
+            elif current is not None:
+                bodies[current].append(line)
+
+        return header, bodies
+
+    def _match_heading(self, line: str):
+        """Return (section, inline content) when the line is a heading; section is None for other headings"""
+        if len(line) > 60:
+            return None
+        match = self._heading_pattern.match(line)
+        if match is None:
+            return None
+        phrase = " ".join(match.group('heading').lower().split())
+        return self._heading_sections[phrase], (match.group('rest') or "").strip()
+
+    def _bullets(self, lines: List[str]) -> str:
+        """Render lines as a "- " list, dropping their original bullet characters"""
+        items = [BULLET_PATTERN.sub('', line).strip() for line in lines]
+        return "\n".join(f"- {item}" for item in items if item)
+
+    def _extract_education(self, lines: List[str]):
+        text = " ".join(lines)
+        confidence = 0.5
+        if DEGREE_PATTERN.search(text):
+            confidence += 0.3
+        if YEAR_PATTERN.search(text):
+            confidence += 0.2
+        return self._bullets(lines), confidence
+
+    def _extract_experience(self, lines: List[str]):
+        text = " ".join(lines)
+        confidence = 0.5
+        if DATE_RANGE_PATTERN.search(text):
+            confidence += 0.3
+        elif YEAR_PATTERN.search(text):
+            confidence += 0.1
+        if len(lines) >= 3:
+            confidence += 0.2
+        return self._bullets(lines), confidence
+
+    def _extract_skills(self, lines: List[str]):
+        grouped = []
+        loose = []
+        for line in lines:
+            line = BULLET_PATTERN.sub('', line).strip()
+            label, sep, items = line.partition(':')
+            if sep and items.strip() and len(label.split()) <= 4:
+                grouped.append(f"{label.strip()}: {', '.join(self._split_items(items))}")
+            else:
+                loose.extend(self._split_items(line))
+
+        items = [item for line in grouped for item in self._split_items(line.partition(':')[2])] + loose
+        confidence = 0.5
+        if len(items) >= 3:
+            confidence += 0.3
+        # Short items look like a skills list, long ones like prose
+        if items and sum(len(item.split()) for item in items) / len(items) <= 4:
+            confidence += 0.2
+
+        if loose:
+            grouped.append(f"Skills: {', '.join(loose)}")
+        return "\n".join(grouped), confidence
+
+    def _split_items(self, text: str) -> List[str]:
+        return [item.strip(" .") for item in re.split(r'[,;|•●▪]', text) if item.strip(" .")]
+
+    def _extract_summary(self, lines: List[str]):
+        text = " ".join(BULLET_PATTERN.sub('', line) for line in lines).strip()
+        words = len(text.split())
+        sentences = len([s for s in re.split(r'[.!?](?:\s|$)', text) if s.strip()])
+        confidence = 0.5
+        if 15 <= words <= 200:
+            confidence += 0.3
+        if sentences >= 2:
+            confidence += 0.2
+        return text, confidence
+
+    def _extract_personal_info(self, lines: List[str]):
+        # Only the top of the resume is searched
+        lines = lines[:10]
+        name = None
+        location = None
+        confidence = 0.0
+        for line in lines:
+            for part in (part.strip() for part in line.split('|')):
+                if not part:
+                    continue
+                label = NAME_LABEL_PATTERN.match(part)
+                if label and name is None:
+                    name = label.group(1).strip()
+                    confidence += 0.7
+                    continue
+                label = LOCATION_LABEL_PATTERN.match(part)
+                if label and location is None:
+                    location = label.group(1).strip()
+                    continue
+                if location is None and PLACE_PATTERN.match(part):
+                    location = part
+
+        if name is None:
+            # The first line that reads like a name and is not contact details
+            for line in lines:
+                candidate = line.split('|')[0].strip()
+                if not NAME_PATTERN.match(candidate) or NOT_A_NAME_PATTERN.search(candidate):
+                    continue
+                if not any(self.text_processor.contact_scanner.scan(candidate).values()):
+                    name = candidate.title() if candidate.isupper() else candidate
+                    confidence += 0.6 if line is lines[0] else 0.4
+                    break
+
+        if name is None:
+            return None, 0.0
+        if location is not None:
+            confidence += 0.3
+        return {"name": name, "location": location or "Not found"}, confidence
@@ -0,0 +1,97 @@
+"""Compare the single-pass contact scanner against the old per-field regex scans.
+
+Run from the project root:
+    python -m benchmarks.contact_scanner_benchmark --runs 200 --paragraphs 400
+"""
+import argparse
+import re
+import statistics
+import time
+
+from app.utils.contact_scanner import ContactScanner
+
+FILLER_PARAGRAPH = (
+    "Senior Software Engineer at Example Corp (2019 - Present). Designed and "
+    "operated Python and FastAPI services, led a team of five engineers, and "
+    "reduced API latency by 40% across 12 regions in 2021.\n"
+)
+
+CONTACT_BLOCK = (
+    "Jane Doe | jane_doe42@example.com | +91 98765 43210 | "
+    "linkedin.com/in/jane-doe | github.com/janedoe\n"
+)
+
+def legacy_contact_info(text: str) -> dict:
+    """Copy of the old TextProcessor lookups: one scan per pattern per field"""
+    email = None
+    for pattern in [
+        r'[A-Za-z]+_[A-Za-z0-9]+@outlook\.com',
+        r'[\w]+_[\w]+@[\w.-]+\.[A-Za-z]{2,}',
+        r'[\w._+-]+@[\w.-]+\.[A-Za-z]{2,}',
+    ]:
+        matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
+        if matches:
+            email = matches[0]
+            break
+
+    phone = None
+    for pattern in [
+        r'\+91\s*\d{5}\s*\d{5}',
+        r'\+91[-\s]*\d{10}',
+        r'91[-\s]*\d{10}',
+        r'\b\d{5}[-\s]*\d{5}\b',
+        r'\b\d{10}\b',
+    ]:
+        matches = re.findall(pattern, text)
+        if matches:
+            phone = matches[0]
+            break
+
+    linkedin = None
+    for pattern in [r'linkedin\.com/in/[\w-]+/?', r'linkedin\.com/profile/[\w-]+/?']:
+        match = re.search(pattern, text.lower())
+        if match:
+            linkedin = "https://www." + match.group(0)
+            break
+
+    return {"email": email, "phone": phone, "linkedin": linkedin}
+
+def build_text(paragraphs: int, contact_at_end: bool) -> str:
+    body = FILLER_PARAGRAPH * paragraphs
+    return body + CONTACT_BLOCK if contact_at_end else CONTACT_BLOCK + body
+
+def time_runs(func, text: str, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(text)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def report(name: str, timings):
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"{name:<12} mean={statistics.mean(timings):8.3f} ms  "
+          f"median={statistics.median(timings):8.3f} ms  p95={p95:8.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--paragraphs", type=int, default=200, help="Filler paragraphs around the contact block")
+    parser.add_argument("--countries", default="IN", help="Comma separated phone pattern sets for the scanner")
+    args = parser.parse_args()
+
+    scanner = ContactScanner(tuple(code.strip().upper() for code in args.countries.split(",")))
+
+    for contact_at_end in (False, True):
+        text = build_text(args.paragraphs, contact_at_end)
+        position = "end" if contact_at_end else "start"
+        print(f"{len(text)} characters, contact block at the {position}, {args.runs} runs")
+        legacy = time_runs(legacy_contact_info, text, args.runs)
+        scanned = time_runs(scanner.scan, text, args.runs)
+        report("legacy", legacy)
+        report("scanner", scanned)
+        print(f"speedup      {statistics.median(legacy) / statistics.median(scanned):8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Synthetic resume documents for the benchmarks (PDF and DOCX, no extra dependencies)"""
+import io
+import os
+import random
+from typing import List, Tuple
+
+import docx
+
+FIRST_NAMES = ["Jane", "Arjun", "Priya", "Daniel", "Meera", "Tom", "Aisha", "Ravi"]
+LAST_NAMES = ["Doe", "Sharma", "Iyer", "Smith", "Khan", "Nair", "Garcia", "Patel"]
+CITIES = ["Bengaluru, Karnataka", "Pune, Maharashtra", "Austin, Texas", "Chennai, Tamil Nadu"]
+COMPANIES = ["Example Corp", "Acme Systems", "Globex Labs", "Initech", "Umbrella Analytics"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Engineer", "Backend Developer"]
+SKILLS = ["Python", "FastAPI", "SQL", "Docker", "Kubernetes", "AWS", "Go", "Kafka", "React", "Terraform"]
+ACHIEVEMENTS = [
+    "Designed and operated services handling millions of requests per day",
+    "Reduced API latency by 40% by introducing caching and connection pooling",
+    "Led a team of five engineers through a migration to Kubernetes",
+    "Built data pipelines that feed reporting for the finance team",
+    "Introduced automated testing and cut release time from days to hours",
+]
+
+def resume_sections(seed: int, jobs: int = 3) -> List[Tuple[str, List[str]]]:
+    """Return (heading, lines) pairs for one deterministic synthetic resume"""
+    rng = random.Random(seed)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    header = [
+        name,
+        f"{name.split()[0].lower()}.{seed}@example.com | +91 98765 {10000 + seed % 90000:05d} | {rng.choice(CITIES)}",
+        f"linkedin.com/in/{name.replace(' ', '-').lower()}-{seed}",
+    ]
+    summary = [
+        f"{rng.choice(TITLES)} with {rng.randint(3, 12)} years of experience building backend services. "
+        f"{rng.choice(ACHIEVEMENTS)}. {rng.choice(ACHIEVEMENTS)}."
+    ]
+    experience = []
+    year = 2024
+    for _ in range(jobs):
+        start = year - rng.randint(1, 4)
+        experience.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)}")
+        experience.append(f"Jan {start} - {'Present' if year == 2024 else f'Dec {year}'}")
+        experience.extend(f"- {item}" for item in rng.sample(ACHIEVEMENTS, 3))
+        year = start
+    education = [f"B.Tech Computer Science, Example University, {year - 1}, CGPA 8.{rng.randint(0, 9)}"]
+    skills = [f"Technical Skills: {', '.join(rng.sample(SKILLS, 6))}"]
+    return [
+        ("", header),
+        ("PROFESSIONAL SUMMARY", summary),
+        ("EXPERIENCE", experience),
+        ("EDUCATION", education),
+        ("SKILLS", skills),
+    ]
+
+def resume_lines(seed: int, jobs: int = 3) -> List[str]:
+    lines = []
+    for heading, body in resume_sections(seed, jobs):
+        if heading:
+            lines.append(heading)
+        lines.extend(body)
+    return lines
+
+def make_docx(seed: int, jobs: int = 3, table: bool = True) -> bytes:
+    """Build a DOCX resume; the skills go in a table when table is True"""
+    document = docx.Document()
+    for heading, body in resume_sections(seed, jobs):
+        if heading:
+            document.add_paragraph(heading)
+        if table and heading == "SKILLS":
+            label, _, items = body[0].partition(": ")
+            row = document.add_table(rows=1, cols=2).rows[0]
+            row.cells[0].text = label
+            row.cells[1].text = items
+            continue
+        for line in body:
+            document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf(seed: int, jobs: int = 3, pages: int = 1) -> bytes:
+    """Build a text-layer PDF resume; the content is repeated to fill the requested pages"""
+    lines = resume_lines(seed, jobs)
+    contents = []
+    for _ in range(pages):
+        operations = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        operations.extend(f"({_pdf_escape(line)}) '" for line in lines)
+        operations.append("ET")
+        contents.append("\n".join(operations).encode("latin-1", "replace"))
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    page_ids = [4 + 2 * i for i in range(pages)]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>".encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, content in zip(page_ids, contents):
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        ).encode()
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = output.tell()
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, objects[number]))
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for number in sorted(objects):
+        output.write(b"%010d 00000 n \n" % offsets[number])
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return output.getvalue()
+
+def build_corpus(count: int, pages: int = 2) -> List[Tuple[str, bytes, str]]:
+    """Return (filename, content, expected text) for count PDFs and count DOCX files"""
+    corpus = []
+    for seed in range(count):
+        expected = "\n".join(resume_lines(seed))
+        corpus.append((f"resume_{seed}.pdf", make_pdf(seed, pages=pages), "\n".join([expected] * pages)))
+        corpus.append((f"resume_{seed}.docx", make_docx(seed), expected))
+    return corpus
+
+def load_corpus(directory: str) -> List[Tuple[str, bytes, str]]:
+    """Return (filename, content, None) for the PDF and DOCX files in a directory"""
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(('.pdf', '.docx')):
+            with open(os.path.join(directory, name), 'rb') as f:
+                corpus.append((name, f.read(), None))
+    return corpus
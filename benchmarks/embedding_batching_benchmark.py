@@ -0,0 +1,86 @@
+"""Chunk embedding throughput under concurrent analyses, with and without the embedding batcher.
+
+Each simulated analysis embeds its resume's chunks from its own thread, as
+analyses do in the embedding pool. By default the model is a stand-in with
+a fixed cost per call plus a cost per text (--call-overhead-ms,
+--per-text-ms); --real uses the MiniLM model when sentence-transformers is
+installed.
+
+Run from the project root:
+    python -m benchmarks.embedding_batching_benchmark --analyses 64 --concurrency 8
+    python -m benchmarks.embedding_batching_benchmark --real --batch-sizes 32 64 --waits 5 20
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.embedding_batcher import EmbeddingBatcher
+from benchmarks.corpus import resume_lines
+from benchmarks.fakes import SimulatedEncoder
+
+def load_model(args):
+    if not args.real:
+        return SimulatedEncoder(args.call_overhead_ms, args.per_text_ms)
+    from langchain.embeddings import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(
+        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        model_kwargs={'device': 'cpu'}
+    )
+
+def resume_chunks(seed: int, chunks: int) -> list:
+    """chunks texts of about 1000 characters, like the analyzer's splitter produces"""
+    text = " ".join(resume_lines(seed, jobs=4 * chunks))
+    return [text[i * 1000:(i + 1) * 1000] for i in range(chunks)]
+
+def run(embeddings, documents: list, concurrency: int) -> dict:
+    latencies = []
+
+    def analyze(chunks):
+        start = time.perf_counter()
+        vectors = embeddings.embed_documents(chunks)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert len(vectors) == len(chunks)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(analyze, documents))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "chunks_per_s": sum(len(chunks) for chunks in documents) / seconds,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analyses", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8, help="Analyses embedding at the same time")
+    parser.add_argument("--chunks", type=int, default=3, help="Chunks per resume")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64])
+    parser.add_argument("--waits", type=float, nargs="+", default=[2.0, 10.0], help="Maximum waits in ms")
+    parser.add_argument("--real", action="store_true", help="Use the MiniLM model")
+    parser.add_argument("--call-overhead-ms", type=float, default=15.0)
+    parser.add_argument("--per-text-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    model = load_model(args)
+    documents = [resume_chunks(seed, args.chunks) for seed in range(args.analyses)]
+    # Untimed pass so model loading is not measured
+    model.embed_documents(documents[0])
+
+    print(f"{args.analyses} analyses x {args.chunks} chunks, concurrency {args.concurrency}")
+    print(f"{'mode':<22} {'chunks/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'batch':>6}")
+    result = run(model, documents, args.concurrency)
+    print(f"{'unbatched':<22} {result['chunks_per_s']:9.1f} {result['p50_ms']:8.1f} {result['p95_ms']:8.1f} {args.chunks:6.1f}")
+    for size in args.batch_sizes:
+        for wait in args.waits:
+            batcher = EmbeddingBatcher(model, max_batch_size=size, max_wait_ms=wait)
+            result = run(batcher, documents, args.concurrency)
+            mean_batch = batcher.stats()["mean_batch_texts"]
+            print(f"{f'batch {size}, wait {wait:g} ms':<22} {result['chunks_per_s']:9.1f} "
+                  f"{result['p50_ms']:8.1f} {result['p95_ms']:8.1f} {mean_batch:6.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Encode throughput, resident memory and ranking agreement of the embedding model per precision.
+
+Each precision is measured in a fresh process, so resident memory reflects
+that model alone. Agreement is the mean top-k overlap with fp32 rankings on
+the built-in sample set plus synthetic resume chunks, the same check the
+analyzer runs before it keeps a reduced-precision model.
+
+Needs sentence-transformers (and torch). Run from the project root:
+    python -m benchmarks.embedding_precision_benchmark --texts 256 --runs 3
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.corpus import resume_lines
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+def rss_mb() -> float:
+    """Current resident memory of this process, or the peak where /proc is unavailable"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def sample_chunks(count: int) -> list:
+    text = " ".join(line for seed in range(count) for line in resume_lines(seed))
+    return [text[i * 1000:(i + 1) * 1000] for i in range(count)]
+
+def load(precision: str):
+    from langchain.embeddings import HuggingFaceEmbeddings
+    from app.services.embedding_precision import quantize_embeddings
+
+    embeddings = HuggingFaceEmbeddings(model_name=MODEL_NAME, model_kwargs={'device': 'cpu'})
+    return quantize_embeddings(embeddings, precision)
+
+def measure(precision: str, texts: list, runs: int) -> dict:
+    """Runs in a fresh worker process"""
+    import torch  # noqa: F401  (imported first so the baseline includes it)
+
+    baseline = rss_mb()
+    embeddings = load(precision)
+    embeddings.embed_documents(texts[:8])
+    loaded = rss_mb()
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        embeddings.embed_documents(texts)
+    seconds = time.perf_counter() - start
+    return {
+        "texts_per_s": len(texts) * runs / seconds,
+        "model_mb": loaded - baseline,
+        "rss_mb": rss_mb(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=256, help="Chunks encoded per run")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8"])
+    parser.add_argument("--k", type=int, default=3, help="Top-k used for ranking agreement")
+    args = parser.parse_args()
+
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        print("sentence-transformers is not installed")
+        return
+
+    from app.services.embedding_precision import SAMPLE_CHUNKS, SAMPLE_QUERIES, ranking_agreement
+
+    texts = sample_chunks(args.texts)
+    print(f"{MODEL_NAME}, {args.texts} chunks x {args.runs} runs")
+    print(f"{'precision':<10} {'texts/s':>9} {'model MB':>9} {'RSS MB':>8} {'agreement':>10}")
+
+    reference = load("fp32")
+    documents = SAMPLE_CHUNKS + texts[:32]
+    context = multiprocessing.get_context("spawn")
+    for precision in args.precisions:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(measure, precision, texts, args.runs).result()
+        agreement = ranking_agreement(reference, load(precision), SAMPLE_QUERIES, documents, args.k)
+        print(f"{precision:<10} {result['texts_per_s']:9.1f} {result['model_mb']:9.1f} "
+              f"{result['rss_mb']:8.1f} {agreement:10.1%}")
+
+if __name__ == "__main__":
+    main()
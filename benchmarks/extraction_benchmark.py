@@ -0,0 +1,77 @@
+"""Compare the text extraction backends on a sample corpus: throughput and text coverage.
+
+Coverage is the share of reference words a backend recovers. The reference is
+the known content for the synthetic corpus, or the union of the words every
+backend found for real files passed with --corpus.
+
+Run from the project root:
+    python -m benchmarks.extraction_benchmark --documents 20 --runs 3
+    python -m benchmarks.extraction_benchmark --corpus path/to/resumes
+"""
+import argparse
+import re
+import time
+from collections import defaultdict
+
+from app.extractors.engine import BACKENDS, ExtractionEngine
+from benchmarks.corpus import build_corpus, load_corpus
+
+def words(text: str) -> set:
+    return set(re.findall(r"\w+", text.lower()))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20, help="Synthetic documents per format")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per synthetic PDF")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--corpus", help="Directory of real PDF/DOCX files instead of the synthetic corpus")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_corpus(args.documents, args.pages)
+    engine = ExtractionEngine("auto")
+    print(f"{len(corpus)} documents, {args.runs} runs")
+
+    texts = defaultdict(dict)
+    stats = defaultdict(lambda: {"seconds": 0.0, "documents": 0, "pages": 0, "errors": 0})
+    for extension in ('.pdf', '.docx'):
+        documents = [item for item in corpus if item[0].lower().endswith(extension)]
+        for backend in BACKENDS.values():
+            if extension not in backend.extensions:
+                continue
+            if not backend.available():
+                print(f"{backend.name:<12} skipped (not installed)")
+                continue
+            for name, content, _ in documents:
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    try:
+                        result = backend.extract(content)
+                    except Exception:
+                        stats[backend.name]["errors"] += 1
+                        break
+                    stats[backend.name]["seconds"] += time.perf_counter() - start
+                    stats[backend.name]["documents"] += 1
+                    stats[backend.name]["pages"] += result.page_count or 0
+                texts[name][backend.name] = result.text
+
+    coverage = defaultdict(list)
+    for name, _, expected in corpus:
+        found = texts.get(name, {})
+        reference = words(expected) if expected else set().union(*(words(t) for t in found.values()))
+        if not reference:
+            continue
+        for backend_name, text in found.items():
+            coverage[backend_name].append(len(words(text) & reference) / len(reference))
+
+    print(f"{'backend':<12} {'docs/s':>9} {'pages/s':>9} {'coverage':>9} {'errors':>7}")
+    for name, row in stats.items():
+        seconds = row["seconds"] or float("nan")
+        pages = f"{row['pages'] / seconds:9.1f}" if row["pages"] else f"{'-':>9}"
+        mean_coverage = sum(coverage[name]) / len(coverage[name]) if coverage[name] else 0.0
+        print(f"{name:<12} {row['documents'] / seconds:9.1f} {pages} {mean_coverage:9.1%} {row['errors']:7d}")
+
+    auto = {extension: engine.backend_for(extension).name for extension in ('.pdf', '.docx')}
+    print(f"auto-selected: {auto} (override with EXTRACTION_BACKENDS)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Deterministic local stand-ins used by the benchmarks (no network, no models)"""
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, List, Optional
+
+import numpy as np
+from langchain.llms.base import LLM
+from langchain.schema.embeddings import Embeddings
+
+class HashingEmbeddings(Embeddings):
+    """Bag-of-words feature hashing, so similar texts get similar vectors"""
+
+    def __init__(self, size: int = 384):
+        self.size = size
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.size, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "little") % self.size
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+class SimulatedEncoder(HashingEmbeddings):
+    """Hashing embeddings that take as long as a CPU model: a fixed cost per call plus a cost per text.
+
+    Calls are serialized, like forward passes that each use every core.
+    """
+
+    def __init__(self, call_overhead_ms: float = 15.0, per_text_ms: float = 2.0, size: int = 384):
+        super().__init__(size)
+        self.call_overhead_ms = call_overhead_ms
+        self.per_text_ms = per_text_ms
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.calls += 1
+            time.sleep((self.call_overhead_ms + self.per_text_ms * len(texts)) / 1000)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+class DeterministicLLM(LLM):
+    """Offline stand-in for the chat model: answers from the prompt itself, with optional latency.
+
+    Combined extraction prompts get a JSON object with every requested key,
+    so the analyzer never falls back to per-section retries; other prompts get
+    the first line of the context.
+    """
+
+    latency_ms: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "deterministic-fake"
+
+    def _answer(self, prompt: str) -> str:
+        self.calls += 1
+        keys = re.findall(r'^- "(\w+)":', prompt, re.MULTILINE)
+        context_lines = [line.strip() for line in prompt.splitlines() if line.strip()]
+        first_line = context_lines[1] if len(context_lines) > 1 else "Not found"
+        if not keys:
+            return first_line
+        answer = {}
+        for key in keys:
+            if key == "personal_info":
+                answer[key] = {"name": first_line[:40], "location": "Not found"}
+            else:
+                answer[key] = f"{key} extracted from {len(prompt)} prompt characters"
+        return json.dumps(answer)
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> str:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._answer(prompt)
+
+    async def _acall(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> str:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._answer(prompt)
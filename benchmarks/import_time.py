@@ -0,0 +1,57 @@
+"""Check that importing the app stays within a startup time budget.
+
+Heavy libraries must not be imported by `app.main`; they load lazily or
+during warm-up. Exits with status 1 when the budget is exceeded or a heavy
+module is imported eagerly, so it can run in CI.
+
+Run from the project root:
+    python -m benchmarks.import_time --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["tensorflow", "torch", "sentence_transformers", "transformers", "langchain", "openai", "chromadb"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = (time.perf_counter() - start) * 1000
+heavy = sorted({name.split('.')[0] for name in sys.modules} & set(json.loads(sys.argv[1])))
+print(json.dumps({"elapsed_ms": elapsed, "heavy": heavy}))
+"""
+
+def measure_once() -> dict:
+    env = dict(os.environ, WARMUP_ON_STARTUP="false")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, json.dumps(HEAVY_MODULES)],
+        check=True, capture_output=True, text=True, env=env,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500")))
+    args = parser.parse_args()
+
+    results = [measure_once() for _ in range(args.runs)]
+    median = statistics.median(result["elapsed_ms"] for result in results)
+    heavy = sorted(set().union(*(result["heavy"] for result in results)))
+
+    print(f"import app.main: median {median:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if heavy:
+        print(f"Heavy modules imported eagerly: {', '.join(heavy)}")
+
+    if median > args.budget_ms or heavy:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
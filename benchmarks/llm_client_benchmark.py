@@ -0,0 +1,89 @@
+"""Drive the shared LLM client against the rate-limited mock server, with and without client-side limits.
+
+Without limits every caller fires at once and relies on 429 retries; with
+limits matching the server the token bucket spaces the calls out instead.
+The mock window is shortened so a run takes seconds, and the client's
+per-minute limits are scaled to match.
+
+Run from the project root:
+    python -m benchmarks.llm_client_benchmark --calls 60 --concurrency 20
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import argparse
+import asyncio
+import logging
+import time
+
+import requests
+
+from app.services.llm_client import LLMClient, LLMError
+from benchmarks.mock_llm_server import create_app, start_in_thread
+
+PROMPT = "Summarize this resume.\n" + "Senior Software Engineer with eight years of backend experience. " * 20
+
+async def drive(client: LLMClient, calls: int, concurrency: int) -> dict:
+    limit = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one(index: int):
+        nonlocal failures
+        payload = {"model": "gpt-3.5-turbo", "temperature": 0,
+                   "messages": [{"role": "user", "content": f"{PROMPT}\nCall {index}"}]}
+        async with limit:
+            try:
+                await client.acomplete(payload)
+            except LLMError:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(calls)))
+    seconds = time.perf_counter() - start
+    await client.aclose()
+    return {"seconds": seconds, "failures": failures}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--window-requests", type=int, default=10, help="Requests the mock allows per window")
+    parser.add_argument("--window-tokens", type=int, default=0, help="Tokens the mock allows per window (0: unlimited)")
+    parser.add_argument("--window-seconds", type=float, default=1.0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    args = parser.parse_args()
+    # Retries are counted in the table, not logged one by one
+    logging.getLogger("app.services.llm_client").setLevel(logging.ERROR)
+
+    app = create_app(args.window_requests, args.window_tokens, args.window_seconds,
+                     args.latency_ms, args.error_rate)
+    server = start_in_thread(app, args.port)
+    base = f"http://127.0.0.1:{args.port}"
+    per_minute = 60 / args.window_seconds
+
+    scenarios = {
+        "no limiter": {"requests_per_minute": 0, "tokens_per_minute": 0},
+        "limiter": {"requests_per_minute": args.window_requests * per_minute,
+                    "tokens_per_minute": args.window_tokens * per_minute},
+    }
+    print(f"{args.calls} calls, concurrency {args.concurrency}, mock allows "
+          f"{args.window_requests} requests per {args.window_seconds:g}s")
+    print(f"{'scenario':<11} {'seconds':>8} {'calls/s':>8} {'sent':>6} {'429s':>6} {'503s':>6} {'failed':>7}")
+    try:
+        for name, limits in scenarios.items():
+            requests.post(f"{base}/reset")
+            # Bursts of at most one mock window
+            client = LLMClient(api_base=f"{base}/v1", burst_seconds=args.window_seconds,
+                               backoff_base=0.1, backoff_max=10, **limits)
+            result = asyncio.run(drive(client, args.calls, args.concurrency))
+            stats = requests.get(f"{base}/stats").json()
+            print(f"{name:<11} {result['seconds']:8.2f} {args.calls / result['seconds']:8.1f} "
+                  f"{stats['requests']:6d} {stats['rate_limited']:6d} {stats['errors']:6d} {result['failures']:7d}")
+    finally:
+        server.should_exit = True
+
+if __name__ == "__main__":
+    main()
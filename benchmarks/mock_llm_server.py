@@ -0,0 +1,118 @@
+"""OpenAI-compatible chat completions server that enforces rate limits, for testing the LLM client offline.
+
+Requests and tokens are counted over a sliding window; calls over either
+limit get 429 with Retry-After and retry-after-ms, like the real API.
+Answers come from the same deterministic stand-in the pipeline benchmark uses.
+
+Run from the project root, then point the app at it:
+    python -m benchmarks.mock_llm_server --port 8090 --requests 60 --tokens 40000
+    LLM_API_BASE=http://127.0.0.1:8090/v1 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import math
+import random
+import threading
+import time
+import uuid
+from collections import deque
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from benchmarks.fakes import DeterministicLLM
+
+def create_app(max_requests: int = 60, max_tokens: int = 0, window_seconds: float = 60.0,
+               latency_ms: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> FastAPI:
+    """Mock API allowing max_requests calls and max_tokens tokens per window (0 means unlimited)"""
+    app = FastAPI()
+    llm = DeterministicLLM()
+    rng = random.Random(seed)
+    window = deque()
+    app.state.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0}
+
+    def rate_limited(tokens: int, now: float):
+        """Seconds until the call would fit the window, or None when it fits now"""
+        while window and window[0][0] <= now - window_seconds:
+            window.popleft()
+        over_requests = max_requests and len(window) >= max_requests
+        over_tokens = max_tokens and sum(used for _, used in window) + tokens > max_tokens
+        if not (over_requests or over_tokens):
+            return None
+        return max(0.001, window[0][0] + window_seconds - now) if window else window_seconds
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        stats = app.state.stats
+        stats["requests"] += 1
+
+        prompt = "\n".join(message.get("content") or "" for message in payload.get("messages", []))
+        prompt_tokens = len(prompt) // 4
+        retry_after = rate_limited(prompt_tokens + (payload.get("max_tokens") or 0), time.monotonic())
+        if retry_after is not None:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                headers={"Retry-After": str(math.ceil(retry_after)), "retry-after-ms": str(int(retry_after * 1000))},
+            )
+        if error_rate and rng.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse(status_code=503, content={"error": {"message": "Service unavailable"}})
+
+        answer = llm._answer(prompt)
+        completion_tokens = len(answer) // 4
+        window.append((time.monotonic(), prompt_tokens + completion_tokens))
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        stats["ok"] += 1
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return app.state.stats
+
+    @app.post("/reset")
+    async def reset():
+        window.clear()
+        app.state.stats = {key: 0 for key in app.state.stats}
+        return app.state.stats
+
+    return app
+
+def start_in_thread(app: FastAPI, port: int) -> uvicorn.Server:
+    """Serve app on 127.0.0.1 from a daemon thread; set server.should_exit to stop it"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--requests", type=int, default=60, help="Requests allowed per window (0: unlimited)")
+    parser.add_argument("--tokens", type=int, default=40000, help="Tokens allowed per window (0: unlimited)")
+    parser.add_argument("--window-seconds", type=float, default=60.0)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Simulated time per completion")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls answered with 503")
+    args = parser.parse_args()
+
+    app = create_app(args.requests, args.tokens, args.window_seconds, args.latency_ms, args.error_rate)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="info")
+
+if __name__ == "__main__":
+    main()
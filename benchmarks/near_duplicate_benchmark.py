@@ -0,0 +1,84 @@
+"""Lookup latency and accuracy of the near-duplicate index as it grows.
+
+The index is filled with random signatures, which behave like unrelated
+documents, plus real signatures of synthetic resumes. Lightly edited copies
+of those resumes (one changed line, as after reformatting or an agency's
+edits) should be found; other resumes should not.
+
+Run from the project root:
+    python -m benchmarks.near_duplicate_benchmark --documents 1000000 --queries 500
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.near_duplicate import NUM_PERM, NearDuplicateIndex, minhash
+from app.utils.text_processor import TextProcessor
+from benchmarks.corpus import resume_lines
+
+BULK_BATCH = 10000
+
+def resume_text(seed: int, edited: bool = False) -> str:
+    lines = resume_lines(seed, jobs=4)
+    if edited:
+        # Reword one achievement line
+        index = len(lines) // 2
+        lines[index] = lines[index].replace(" and ", " & ").replace("Led", "Managed")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200000, help="Unrelated documents in the index")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    args = parser.parse_args()
+
+    processor = TextProcessor()
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "near_duplicates.sqlite3")
+        index = NearDuplicateIndex(db_path, threshold=args.threshold)
+
+        start = time.perf_counter()
+        for offset in range(0, args.documents, BULK_BATCH):
+            count = min(BULK_BATCH, args.documents - offset)
+            signatures = rng.integers(0, 2 ** 32, size=(count, NUM_PERM), dtype=np.uint32)
+            index.add_many([(f"random-{offset + i}", signature) for i, signature in enumerate(signatures)])
+        fill_seconds = time.perf_counter() - start
+
+        originals = range(args.queries)
+        index.add_many([(f"resume-{seed}", minhash(processor.clean_text(resume_text(seed)))) for seed in originals])
+
+        copies = [minhash(processor.clean_text(resume_text(seed, edited=True))) for seed in originals]
+        others = [minhash(processor.clean_text(resume_text(seed))) for seed in range(10 ** 6, 10 ** 6 + args.queries)]
+
+        timings = []
+        found = 0
+        for seed, signature in zip(originals, copies):
+            start = time.perf_counter()
+            match = index.find(signature)
+            timings.append(time.perf_counter() - start)
+            found += match is not None and match["digest"] == f"resume-{seed}"
+        false_matches = 0
+        for signature in others:
+            start = time.perf_counter()
+            false_matches += index.find(signature) is not None
+            timings.append(time.perf_counter() - start)
+        index.close()
+
+        size_mb = sum(
+            os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+        ) / 1024 / 1024
+
+    timings_ms = sorted(t * 1000 for t in timings)
+    print(f"{args.documents + args.queries} documents indexed in {fill_seconds:.1f}s, {size_mb:.0f} MB on disk")
+    print(f"lookup ms: p50 {statistics.median(timings_ms):.3f}, "
+          f"p99 {timings_ms[int(len(timings_ms) * 0.99) - 1]:.3f}, max {timings_ms[-1]:.3f}")
+    print(f"edited copies found: {found}/{args.queries}, unrelated resumes matched: {false_matches}/{args.queries}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Time each stage of the resume pipeline offline on synthetic PDF and DOCX resumes.
+
+A deterministic local LLM replaces OpenAI and hashing embeddings replace
+MiniLM (unless --real-embeddings), so runs need no network and are
+repeatable. Results are written as JSON so two runs can be compared.
+
+Run from the project root:
+    python -m benchmarks.pipeline_benchmark --runs 5
+    python -m benchmarks.pipeline_benchmark --compare benchmarks/results/before.json benchmarks/results/after.json
+"""
+import os
+
+# Offline settings, applied before any app module reads its configuration
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("WARMUP_ON_STARTUP", "false")
+os.environ.setdefault("RESULT_CACHE_ENABLED", "false")
+os.environ.setdefault("EMBEDDING_CACHE_ENABLED", "false")
+os.environ.setdefault("INCREMENTAL_ANALYSIS_ENABLED", "false")
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+from benchmarks.corpus import make_docx, make_pdf
+from benchmarks.fakes import DeterministicLLM, HashingEmbeddings
+
+SIZES = {
+    "small": {"jobs": 1, "pages": 1},
+    "medium": {"jobs": 3, "pages": 2},
+    "large": {"jobs": 8, "pages": 6},
+}
+OPTIONS = ["contact_info", "personal_info", "education", "experience", "skills", "summary"]
+STAGES = ["extract", "clean", "contact", "split", "embed", "index", "retrieve", "end_to_end"]
+
+def build_documents(sizes):
+    documents = {}
+    for size in sizes:
+        spec = SIZES[size]
+        documents[f"pdf/{size}"] = (f"{size}.pdf", make_pdf(seed=1, jobs=spec["jobs"], pages=spec["pages"]))
+        documents[f"docx/{size}"] = (f"{size}.docx", make_docx(seed=1, jobs=spec["jobs"] * spec["pages"]))
+    return documents
+
+def configure_analyzer(analyzer, args):
+    """Swap the network-backed models for the local stand-ins"""
+    analyzer.llm = DeterministicLLM(latency_ms=args.llm_latency_ms)
+    if not args.real_embeddings:
+        analyzer._embeddings = HashingEmbeddings()
+
+def elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+async def time_stages(analyzer, extractor, filename: str, content: bytes) -> dict:
+    """Run the pipeline stages one after another, timing each"""
+    from app.extractors.text_extractor import SpooledUpload
+    from app.services.resume_analyzer import COMBINED_SECTION_INSTRUCTIONS
+    from app.services.vector_store import InMemoryVectorStore
+
+    timings = {}
+    upload = SpooledUpload.from_bytes(filename, content)
+    try:
+        start = time.perf_counter()
+        text = await extractor.extract_from_upload(upload)
+        timings["extract"] = elapsed_ms(start)
+    finally:
+        upload.close()
+
+    start = time.perf_counter()
+    cleaned = analyzer.text_processor.clean_text(text)
+    timings["clean"] = elapsed_ms(start)
+
+    start = time.perf_counter()
+    analyzer._extract_contact_info(cleaned)
+    timings["contact"] = elapsed_ms(start)
+
+    start = time.perf_counter()
+    chunks = analyzer.text_splitter.split_text(cleaned)
+    timings["split"] = elapsed_ms(start)
+
+    start = time.perf_counter()
+    vectors = analyzer.embeddings.embed_documents(chunks)
+    timings["embed"] = elapsed_ms(start)
+
+    start = time.perf_counter()
+    store = InMemoryVectorStore(analyzer.embeddings)
+    store.add_embeddings(chunks, vectors)
+    timings["index"] = elapsed_ms(start)
+
+    start = time.perf_counter()
+    for query in COMBINED_SECTION_INSTRUCTIONS.values():
+        store.similarity_search(query, k=3)
+    timings["retrieve"] = elapsed_ms(start)
+
+    return {"timings": timings, "chars": len(text), "chunks": len(chunks)}
+
+async def time_end_to_end(client, filename: str, content: bytes) -> float:
+    start = time.perf_counter()
+    response = await client.post(
+        "/parse-resume/",
+        files={"file": (filename, content)},
+        data={"options": json.dumps(OPTIONS)},
+    )
+    response.raise_for_status()
+    return elapsed_ms(start)
+
+def summarize(values) -> dict:
+    values = sorted(values)
+    return {
+        "runs": len(values),
+        "mean_ms": round(statistics.mean(values), 3),
+        "median_ms": round(statistics.median(values), 3),
+        "p95_ms": round(values[max(0, int(len(values) * 0.95) - 1)], 3),
+    }
+
+async def run(args) -> dict:
+    from app.main import app, resume_service
+
+    analyzer = resume_service.resume_analyzer
+    configure_analyzer(analyzer, args)
+    extractor = resume_service.text_extractor
+
+    try:
+        import httpx
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+    except ImportError:
+        client = None
+        print("end_to_end skipped (httpx is not installed)")
+
+    results = {}
+    try:
+        for key, (filename, content) in build_documents(args.sizes).items():
+            # One untimed pass so pool start-up and lazy imports are not measured
+            await time_stages(analyzer, extractor, filename, content)
+            if client is not None:
+                await time_end_to_end(client, filename, content)
+
+            samples = {stage: [] for stage in STAGES}
+            for _ in range(args.runs):
+                measured = await time_stages(analyzer, extractor, filename, content)
+                for stage, value in measured["timings"].items():
+                    samples[stage].append(value)
+                if client is not None:
+                    samples["end_to_end"].append(await time_end_to_end(client, filename, content))
+
+            results[key] = {
+                "bytes": len(content),
+                "chars": measured["chars"],
+                "chunks": measured["chunks"],
+                "stages": {stage: summarize(values) for stage, values in samples.items() if values},
+            }
+            print_result(key, results[key])
+    finally:
+        if client is not None:
+            await client.aclose()
+
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "runs": args.runs,
+            "llm_latency_ms": args.llm_latency_ms,
+            "embeddings": "real" if args.real_embeddings else "hashing",
+            "analyzer_settings": analyzer.cache_settings(),
+            "llm_calls": analyzer.llm.calls,
+        },
+        "results": results,
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def print_result(key: str, result: dict):
+    print(f"{key:<12} {result['chars']:>7} chars {result['chunks']:>3} chunks  " + "  ".join(
+        f"{stage}={stats['median_ms']:.2f}" for stage, stats in result["stages"].items()
+    ) + "  (median ms)")
+
+def compare(base: dict, new: dict):
+    """Print the median change per document and stage"""
+    print(f"base {base['meta']['commit']} ({base['meta']['created_at']}) -> "
+          f"new {new['meta']['commit']} ({new['meta']['created_at']})")
+    print(f"{'document':<12} {'stage':<11} {'base ms':>10} {'new ms':>10} {'change':>8}")
+    for key, result in new["results"].items():
+        base_result = base["results"].get(key)
+        if base_result is None:
+            continue
+        for stage, stats in result["stages"].items():
+            base_stats = base_result["stages"].get(stage)
+            if base_stats is None:
+                continue
+            before, after = base_stats["median_ms"], stats["median_ms"]
+            change = (after - before) / before if before else 0.0
+            print(f"{key:<12} {stage:<11} {before:10.3f} {after:10.3f} {change:+8.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated latency per LLM call")
+    parser.add_argument("--real-embeddings", action="store_true", help="Use the MiniLM model instead of hashing")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/pipeline-<timestamp>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT",
+                        help="Compare two result files, or one result file against a fresh run")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[0]) as base, open(args.compare[1]) as new:
+            compare(json.load(base), json.load(new))
+        return
+
+    from app.utils.executors import shutdown_executors
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        shutdown_executors()
+
+    output = args.output or os.path.join("benchmarks", "results", f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare[0]) as base:
+            compare(json.load(base), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Compare the in-memory vector index against the old persisted Chroma path.
+
+Run from the project root:
+    python -m benchmarks.vector_store_benchmark --runs 50
+    python -m benchmarks.vector_store_benchmark --real-embeddings
+"""
+import argparse
+import os
+import shutil
+import statistics
+import time
+import uuid
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from app.services.vector_store import InMemoryVectorStore
+from benchmarks.fakes import HashingEmbeddings
+
+QUERIES = [
+    "What is the person's full name from this resume?",
+    "Extract all education information",
+    "Extract all work experiences",
+    "Categorize the skills mentioned in the resume",
+    "Generate a concise professional summary",
+]
+
+SAMPLE_PARAGRAPH = (
+    "Senior Software Engineer at Example Corp (2019 - Present). Designed and "
+    "operated Python and FastAPI services, led a team of five engineers, and "
+    "reduced API latency by 40%. Skills: Python, SQL, Docker, Kubernetes, AWS. "
+    "B.Tech in Computer Science, Example University, 2015, GPA 8.6.\n"
+)
+
+def build_chunks(paragraphs: int):
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, length_function=len)
+    return splitter.split_text(SAMPLE_PARAGRAPH * paragraphs)
+
+def run_in_memory(chunks, embeddings):
+    store = InMemoryVectorStore(embeddings)
+    store.add_texts(chunks)
+    retriever = store.as_retriever(search_kwargs={"k": 3})
+    for query in QUERIES:
+        retriever.get_relevant_documents(query)
+
+def run_chroma(chunks, embeddings):
+    from langchain.vectorstores import Chroma
+
+    session_id = str(uuid.uuid4())
+    persist_directory = f"temp_dbs/{session_id}"
+    store = Chroma(
+        collection_name=f"resume_{session_id}",
+        embedding_function=embeddings,
+        persist_directory=persist_directory,
+    )
+    try:
+        store.add_texts(chunks)
+        retriever = store.as_retriever(search_kwargs={"k": 3})
+        for query in QUERIES:
+            retriever.get_relevant_documents(query)
+    finally:
+        store.delete_collection()
+        if os.path.exists(persist_directory):
+            shutil.rmtree(persist_directory)
+
+def time_runs(func, chunks, embeddings, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(chunks, embeddings)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def report(name: str, timings):
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"{name:<12} mean={statistics.mean(timings):8.2f} ms  "
+          f"median={statistics.median(timings):8.2f} ms  p95={p95:8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=12, help="Resume size in sample paragraphs")
+    parser.add_argument("--real-embeddings", action="store_true", help="Use the MiniLM model instead of hashing")
+    args = parser.parse_args()
+
+    if args.real_embeddings:
+        from langchain.embeddings import HuggingFaceEmbeddings
+        embeddings = HuggingFaceEmbeddings(
+            model_name="sentence-transformers/all-MiniLM-L6-v2",
+            model_kwargs={'device': 'cpu'}
+        )
+    else:
+        embeddings = HashingEmbeddings()
+
+    chunks = build_chunks(args.paragraphs)
+    print(f"{len(chunks)} chunks, {len(QUERIES)} queries, {args.runs} runs")
+
+    report("in-memory", time_runs(run_in_memory, chunks, embeddings, args.runs))
+    try:
+        report("chroma", time_runs(run_chroma, chunks, embeddings, args.runs))
+    except ImportError:
+        print("chroma       skipped (chromadb is not installed)")
+
+if __name__ == "__main__":
+    main()
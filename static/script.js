@@ -7,6 +7,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const fileInput = document.getElementById('resumeFile');
     const selectedFileDiv = document.getElementById('selectedFile');
     const downloadBtn = document.getElementById('downloadBtn');
+    let currentResults = {};
 
     // File Drop Zone functionality
     ['dragenter', 'dragover', 'dragleave', 'drop'].forEach(eventName => {
@@ -91,21 +92,39 @@ document.addEventListener('DOMContentLoaded', () => {
         formData.append('file', file);
         formData.append('options', JSON.stringify(selectedOptions));
         
+        currentResults = {};
+        resetResults(selectedOptions);
+        
         try {
-            const response = await fetch('/parse-resume/', {
+            // Sections arrive as Server-Sent Events as soon as each one is done
+            const response = await fetch('/parse-resume/stream', {
                 method: 'POST',
                 body: formData
             });
 
-            if (response.ok) {
-                const data = await response.json();
-                // Store the results in sessionStorage
-                sessionStorage.setItem('resumeResults', JSON.stringify(data));
-                displayResults(data);
-            } else {
+            if (!response.ok) {
                 const errorData = await response.json();
                 throw new Error(errorData.detail || 'Failed to parse resume');
             }
+
+            await readEventStream(response, (event, payload) => {
+                if (event === 'section') {
+                    currentResults[payload.section] = payload.data;
+                    displaySection(payload.section, payload.data);
+                    // Show results with the first finished section
+                    if (resultsDiv.classList.contains('hidden')) {
+                        loadingDiv.classList.add('hidden');
+                        resultsDiv.classList.remove('hidden');
+                        resultsDiv.scrollIntoView({ behavior: 'smooth' });
+                    }
+                } else if (event === 'error') {
+                    throw new Error(payload.detail || 'Failed to parse resume');
+                }
+            });
+
+            // Store the results in sessionStorage
+            sessionStorage.setItem('resumeResults', JSON.stringify(currentResults));
+            displayResults(currentResults);
         } catch (error) {
             console.error('Error:', error);
             showError(error.message);
@@ -115,6 +134,38 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    async function readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+
+            // Events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let event = 'message';
+                const dataLines = [];
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) {
+                        event = line.slice(6).trim();
+                    } else if (line.startsWith('data:')) {
+                        dataLines.push(line.slice(5).trim());
+                    }
+                });
+                onEvent(event, dataLines.length ? JSON.parse(dataLines.join('\n')) : {});
+            }
+        }
+    }
+
     function updateLoadingMessage(message) {
         const processingText = loadingDiv.querySelector('.processing-text');
         processingText.textContent = message;
@@ -124,27 +175,50 @@ document.addEventListener('DOMContentLoaded', () => {
         alert(`Error: ${message}`);
     }
 
-    function displayResults(data) {
-        try {
-            // Format personal info
-            const personalInfo = data.personal_info || {};
-            const formattedPersonalInfo = Object.entries(personalInfo)
-                .map(([key, value]) => `${key.charAt(0).toUpperCase() + key.slice(1)}: ${value}`)
-                .join('\n');
-            document.getElementById('personalInfo').textContent = formattedPersonalInfo || 'No personal information found';
+    const sectionElements = {
+        personal_info: 'personalInfo',
+        contact_info: 'contactInfo',
+        education: 'education',
+        experience: 'experience',
+        skills: 'skills',
+        summary: 'summary'
+    };
 
-            // Format contact info
-            const contactInfo = data.contact_info || {};
-            const formattedContactInfo = Object.entries(contactInfo)
-                .map(([key, value]) => `${key.charAt(0).toUpperCase() + key.slice(1)}: ${value || 'Not found'}`)
+    const emptyMessages = {
+        personal_info: 'No personal information found',
+        contact_info: 'No contact information found',
+        education: 'No education information found',
+        experience: 'No experience information found',
+        skills: 'No skills information found',
+        summary: 'No summary available'
+    };
+
+    function formatSection(section, value) {
+        if (section === 'personal_info' || section === 'contact_info') {
+            return Object.entries(value || {})
+                .map(([key, item]) => `${key.charAt(0).toUpperCase() + key.slice(1)}: ${item || 'Not found'}`)
                 .join('\n');
-            document.getElementById('contactInfo').textContent = formattedContactInfo || 'No contact information found';
+        }
+        return value;
+    }
+
+    function displaySection(section, value) {
+        const element = document.getElementById(sectionElements[section]);
+        if (element) {
+            element.textContent = formatSection(section, value) || emptyMessages[section];
+        }
+    }
 
-            // Display other sections
-            document.getElementById('education').textContent = data.education || 'No education information found';
-            document.getElementById('experience').textContent = data.experience || 'No experience information found';
-            document.getElementById('skills').textContent = data.skills || 'No skills information found';
-            document.getElementById('summary').textContent = data.summary || 'No summary available';
+    function resetResults(selectedOptions) {
+        Object.keys(sectionElements).forEach(section => {
+            const element = document.getElementById(sectionElements[section]);
+            element.textContent = selectedOptions.includes(section) ? 'Extracting...' : emptyMessages[section];
+        });
+    }
+
+    function displayResults(data) {
+        try {
+            Object.keys(sectionElements).forEach(section => displaySection(section, data[section]));
 
             // Show results and scroll
             loadingDiv.classList.add('hidden');
@@ -152,14 +226,7 @@ document.addEventListener('DOMContentLoaded', () => {
             resultsDiv.scrollIntoView({ behavior: 'smooth' });
 
             // Log the displayed data for debugging
-            console.log('Displayed data:', {
-                personalInfo: formattedPersonalInfo,
-                contactInfo: formattedContactInfo,
-                education: data.education,
-                experience: data.experience,
-                skills: data.skills,
-                summary: data.summary
-            });
+            console.log('Displayed data:', data);
         } catch (error) {
             console.error('Error displaying results:', error);
             showError('Error displaying results. Please check the console for details.');
@@ -168,15 +235,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // Download functionality
     downloadBtn.addEventListener('click', () => {
-        const results = {};
-        Object.keys(data).forEach(key => {
-            const element = document.getElementById(key);
-            if (element) {
-                results[key] = element.textContent;
-            }
-        });
-
-        const blob = new Blob([JSON.stringify(results, null, 2)], { type: 'application/json' });
+        const blob = new Blob([JSON.stringify(currentResults, null, 2)], { type: 'application/json' });
         const url = URL.createObjectURL(blob);
         const a = document.createElement('a');
         a.href = url;
@@ -191,8 +250,8 @@ document.addEventListener('DOMContentLoaded', () => {
     function loadStoredResults() {
         const storedResults = sessionStorage.getItem('resumeResults');
         if (storedResults) {
-            const data = JSON.parse(storedResults);
-            displayResults(data);
+            currentResults = JSON.parse(storedResults);
+            displayResults(currentResults);
         }
     }
 
@@ -0,0 +1,53 @@
+import io
+
+import docx
+from docx.oxml import parse_xml
+
+from app.extractors.engine import DocxXMLBackend, PythonDocxBackend
+
+TEXT_BOX_RUN = """
+<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+     xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+     xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+     xmlns:v="urn:schemas-microsoft-com:vml">
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps">
+      <w:drawing><wps:txbx><w:txbxContent>
+        <w:p><w:r><w:t>Sidebar skills</w:t></w:r></w:p>
+        <w:p><w:r><w:t>Python</w:t></w:r></w:p>
+      </w:txbxContent></wps:txbx></w:drawing>
+    </mc:Choice>
+    <mc:Fallback>
+      <w:pict><v:textbox><w:txbxContent>
+        <w:p><w:r><w:t>Sidebar skills</w:t></w:r></w:p>
+        <w:p><w:r><w:t>Python</w:t></w:r></w:p>
+      </w:txbxContent></v:textbox></w:pict>
+    </mc:Fallback>
+  </mc:AlternateContent>
+</w:r>
+"""
+
+def resume_docx() -> bytes:
+    document = docx.Document()
+    paragraph = document.add_paragraph("Name: Jane")
+    paragraph._p.append(parse_xml(TEXT_BOX_RUN))
+    run = document.add_paragraph("Skills:").add_run()
+    run.add_tab()
+    run.add_text("Python")
+    run.add_break()
+    run.add_text("SQL")
+    table = document.add_table(rows=2, cols=2)
+    for row, values in zip(table.rows, [("Company", "Dates"), ("Acme", "2019 - 2021")]):
+        for cell, value in zip(row.cells, values):
+            cell.text = value
+    document.add_paragraph("Main body line")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def test_docx_xml_matches_python_docx():
+    data = resume_docx()
+    expected = PythonDocxBackend().extract(data)
+    result = DocxXMLBackend().extract(data)
+    assert result.blocks == expected.blocks
+    assert result.text.startswith("Name: Jane\nSkills:\tPython\nSQL\n")
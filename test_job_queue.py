@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.services import job_queue
+from app.services.job_queue import InMemoryJobBackend, JobManager, QueueFullError, SQLiteJobBackend
+
+class FlakyService:
+    """Fails the first `failures` calls, then returns a fixed result"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    async def process_upload(self, upload, options):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("LLM unavailable")
+        return {"skills": ["Python"]}
+
+class LockedOnceBackend(InMemoryJobBackend):
+    """Raises like a locked SQLite database on the first claim and the first update"""
+
+    def __init__(self):
+        super().__init__()
+        self.claim_errors = 1
+        self.update_errors = 1
+
+    def claim(self):
+        if self.claim_errors:
+            self.claim_errors -= 1
+            raise RuntimeError("database is locked")
+        return super().claim()
+
+    def update(self, job_id, **fields):
+        if self.update_errors:
+            self.update_errors -= 1
+            raise RuntimeError("database is locked")
+        super().update(job_id, **fields)
+
+def run_job(service, backend, max_retries: int) -> dict:
+    async def run():
+        manager = JobManager(service, backend=backend, workers=1, max_retries=max_retries, retry_delay=0)
+        manager.poll_interval = 0.01
+        await manager.start()
+        try:
+            job = await manager.submit("resume.pdf", b"%PDF", ["skills"])
+            for _ in range(500):
+                job = await manager.get(job["id"])
+                if job["status"] in ("succeeded", "failed"):
+                    return job
+                await asyncio.sleep(0.01)
+            return job
+        finally:
+            await manager.stop()
+    return asyncio.run(run())
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(job_queue, "WORKER_ERROR_BACKOFF_SECONDS", 0.01)
+
+def test_job_succeeds_after_retries():
+    service = FlakyService(failures=2)
+    job = run_job(service, InMemoryJobBackend(), max_retries=2)
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 3
+    assert job["result"] == {"skills": ["Python"]}
+
+def test_job_fails_once_retries_are_used_up():
+    service = FlakyService(failures=10)
+    job = run_job(service, InMemoryJobBackend(), max_retries=1)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+    assert job["error"] == "LLM unavailable"
+    assert service.calls == 2
+
+def test_worker_survives_storage_errors():
+    job = run_job(FlakyService(failures=0), LockedOnceBackend(), max_retries=0)
+    assert job["status"] == "succeeded"
+
+@pytest.mark.parametrize("backend_name", ["memory", "sqlite"])
+def test_enqueue_checks_depth(backend_name, tmp_path):
+    backend = InMemoryJobBackend() if backend_name == "memory" else SQLiteJobBackend(str(tmp_path / "jobs.sqlite3"))
+    job = {"id": "1", "filename": "a.pdf", "options": [], "status": "queued", "attempts": 0,
+           "available_at": 0, "created_at": 0, "updated_at": 0}
+    backend.enqueue(job, b"", max_depth=1)
+    with pytest.raises(QueueFullError):
+        backend.enqueue({**job, "id": "2"}, b"", max_depth=1)
+    assert backend.depth() == 1
@@ -0,0 +1,24 @@
+from app.services.near_duplicate import NearDuplicateIndex, minhash
+from benchmarks.corpus import resume_lines
+
+def resume_text(seed: int) -> str:
+    return "\n".join(resume_lines(seed, jobs=4))
+
+def test_short_text_has_no_signature():
+    assert minhash("") is None
+    assert minhash("Scanned page 1") is None
+    assert minhash(resume_text(1)) is not None
+
+def test_finds_edited_copy_but_not_unrelated_resume(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite3"), threshold=0.8)
+    original = resume_text(1)
+    index.add("original", minhash(original))
+    index.add("original", minhash(original))
+    assert index.stats()["documents"] == 1
+
+    edited = original.replace("Led", "Managed", 1)
+    match = index.find(minhash(edited))
+    assert match is not None and match["digest"] == "original"
+    assert index.find(minhash(original), exclude_digest="original") is None
+    assert index.find(minhash(resume_text(2))) is None
+    index.close()
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import time
+
+from app.services.result_cache import ResultCache
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = ResultCache(ttl_seconds=60, cache_dir=str(tmp_path))
+    cache.set("a" * 64, {"skills": ["Python"]})
+    assert cache.get("a" * 64) == {"skills": ["Python"]}
+
+    # A new instance only has the disk tier
+    later = ResultCache(ttl_seconds=60, cache_dir=str(tmp_path))
+    assert later.get("a" * 64) == {"skills": ["Python"]}
+    assert later.stats()["disk_hits"] == 1
+
+    expired = ResultCache(ttl_seconds=0, cache_dir=str(tmp_path))
+    assert expired.ttl_seconds == 0
+    expired.set("b" * 64, {"skills": []})
+    assert expired.get("b" * 64) is None
+    assert not os.path.exists(expired._path("b" * 64))
+
+def test_async_wrappers_share_both_tiers(tmp_path):
+    cache = ResultCache(ttl_seconds=60, cache_dir=str(tmp_path))
+
+    async def run():
+        await cache.aset("c" * 64, {"education": []})
+        return await cache.aget("c" * 64), await ResultCache(cache_dir=str(tmp_path)).aget("c" * 64)
+
+    assert asyncio.run(run()) == ({"education": []}, {"education": []})
+
+def test_sweep_removes_expired_and_oldest_files(tmp_path):
+    cache = ResultCache(ttl_seconds=100, cache_dir=str(tmp_path), max_disk_entries=2)
+    now = time.time()
+    keys = [f"{i:02d}" * 32 for i in range(4)]
+    for age, key in zip((0, 10, 20, 500), keys):
+        cache.set(key, {"n": age})
+        os.utime(cache._path(key), (now - age, now - age))
+
+    assert cache.sweep_disk() == 2
+    assert [os.path.exists(cache._path(key)) for key in keys] == [True, True, False, False]
+    assert cache.stats()["disk_swept"] == 2
@@ -0,0 +1,24 @@
+from app.services.revision_store import RevisionStore
+
+SETTINGS = {"llm_model": "gpt-3.5-turbo"}
+
+def test_document_key_prefers_id_then_email_then_phone():
+    assert RevisionStore.document_key(" 42 ", {"email": "a@b.com"}) == "id:42"
+    assert RevisionStore.document_key(None, {"email": " Jane@Example.com "}) == "email:jane@example.com"
+    assert RevisionStore.document_key(None, {"phone": "+91 98765 43210"}) == \
+        RevisionStore.document_key(None, {"phone": "9876543210"})
+    assert RevisionStore.document_key(None, {"phone": "123"}) is None
+
+def test_only_unchanged_sections_are_reused():
+    store = RevisionStore(ttl_seconds=60)
+    store.record("id:1", SETTINGS, {"skills": "s1", "experience": "e1"},
+                 {"skills": ["Python"], "experience": ["Acme"]})
+
+    reused = store.reusable_sections("id:1", SETTINGS, {"skills": "s1", "experience": "e2"}, ["skills", "experience"])
+    assert reused == {"skills": ["Python"]}
+    assert store.reusable_sections("id:1", {"llm_model": "other"}, {"skills": "s1"}, ["skills"]) == {}
+
+def test_zero_ttl_keeps_nothing():
+    store = RevisionStore(ttl_seconds=0)
+    store.record("id:1", SETTINGS, {"skills": "s1"}, {"skills": ["Python"]})
+    assert store.reusable_sections("id:1", SETTINGS, {"skills": "s1"}, ["skills"]) == {}
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"skills": ["Python"]}
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(3)))
+
+    assert asyncio.run(run()) == [{"skills": ["Python"]}] * 3
+    assert len(calls) == 1
+    assert flight.stats()["coalesced"] == 2
+    assert flight.stats()["in_flight"] == 0
+
+def test_errors_are_shared_but_not_remembered():
+    flight = SingleFlight()
+    attempts = []
+
+    async def work():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("LLM unavailable")
+        return "ok"
+
+    async def run():
+        results = await asyncio.gather(flight.do("key", work), flight.do("key", work), return_exceptions=True)
+        return results, await flight.do("key", work)
+
+    results, retry = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retry == "ok"
+
+def test_follower_restarts_when_leader_is_cancelled():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == "done"
+    assert flight.stats()["restarted"] == 1